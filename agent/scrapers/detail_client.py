@@ -0,0 +1,100 @@
+"""
+映画.com 詳細ページ取得クライアント（ブラウザ不要・HTTP のみ）
+"""
+from typing import Dict, Optional
+
+from agent.scrapers.html_parser import parse_html
+from agent.scrapers.http_client import EigaHttpClient, get_default_http_client
+
+
+class EigaDetailClient:
+    """
+    映画詳細ページ（/movie/{id}/）を共有 HTTP クライアント経由で取得・解析する。
+
+    Selenium を起動しないため、映画登録や詳細再取得は HTTP 1回（キャッシュ有効時は0回）で済む。
+    """
+
+    def __init__(self, http_client: Optional[EigaHttpClient] = None):
+        self.http_client = http_client or get_default_http_client()
+
+    def get_movie_details(self, movie_url: str, revalidate: bool = False) -> Optional[Dict]:
+        """
+        映画詳細情報取得
+        
+        Args:
+            movie_url: 映画ページURL
+            revalidate: True の場合、キャッシュが TTL 内でも条件付き GET で再検証する
+        
+        Returns:
+            映画詳細情報（取得失敗時は None）
+        """
+        try:
+            response = self.http_client.get(movie_url, use_cache=True, revalidate=revalidate)
+            response.encoding = 'utf-8'
+            
+            if response.status_code != 200:
+                return None
+            
+            return self.parse_movie_details_page(response.content, movie_url)
+        
+        except Exception as e:
+            print(f"詳細取得エラー: {e}")
+            return None
+
+    @staticmethod
+    def parse_movie_details_page(markup, movie_url: str, backend: Optional[str] = None) -> Dict:
+        """映画詳細ページHTMLから詳細情報を抽出する（ドライバ不要）。backend は parse_html に渡す解析バックエンド。"""
+        soup = parse_html(markup, backend=backend)
+        
+        # タイトル
+        title_elem = soup.find('h1')
+        title = title_elem.get_text(strip=True) if title_elem else None
+        
+        # 公開年・ジャンル
+        year = None
+        genre = None
+        info_text = soup.find('p', class_='c-movie-info__text')
+        if info_text:
+            parts = info_text.get_text(strip=True).split('/')
+            if len(parts) >= 1:
+                try:
+                    year = int(parts[0].strip())
+                except:
+                    pass
+            if len(parts) >= 2:
+                genre = parts[1].strip()
+        
+        # あらすじ
+        synopsis = None
+        synopsis_elem = soup.find('p', class_='c-movie-synopsis')
+        if synopsis_elem:
+            synopsis = synopsis_elem.get_text(strip=True)
+        
+        # 監督
+        director = None
+        director_elems = soup.find_all('a', class_='c-staff-link')
+        if director_elems:
+            director = director_elems[0].get_text(strip=True)
+        
+        # キャスト取得
+        cast = []
+        cast_elems = soup.find_all('a', class_='c-cast-link')
+        for elem in cast_elems[:5]:  # 最初の5人
+            cast.append(elem.get_text(strip=True))
+        
+        # 画像
+        image_url = None
+        img_elem = soup.find('img', class_='c-movie-poster')
+        if img_elem:
+            image_url = img_elem.get('src')
+        
+        return {
+            'title': title,
+            'released_year': year,
+            'genre': genre,
+            'director': director,
+            'cast': cast,
+            'synopsis': synopsis,
+            'image_url': image_url,
+            'external_id': movie_url.split('/')[-2] if (movie_url and isinstance(movie_url, str) and '/' in movie_url) else None
+        }
@@ -0,0 +1,88 @@
+"""
+映画詳細ページの並列取得（上限付きスレッドプール + ホスト単位レート制限）
+"""
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from agent.scrapers.http_client import env_number
+
+
+class HostRateLimiter:
+    """同一ホストへのリクエスト開始間隔を min_interval 秒以上に保つ。"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = max(0.0, float(min_interval))
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        if self.min_interval <= 0:
+            return
+        host = urllib.parse.urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class DetailFetcher:
+    """
+    映画詳細ページを並列取得する。
+
+    fetch_details には `MovieComScraper.get_movie_details` 相当（URL -> 詳細dict）を渡す。
+    結果は完了順に返すため、呼び出し側は取得を待たずに順次DB書き込みできる。
+    """
+
+    DEFAULT_WORKERS = 4
+    DEFAULT_MIN_INTERVAL = 0.3  # 秒（同一ホストへの最小リクエスト間隔）
+
+    def __init__(
+        self,
+        fetch_details: Callable[[str], Optional[Dict]],
+        max_workers: Optional[int] = None,
+        min_interval: Optional[float] = None,
+    ):
+        if max_workers is None:
+            max_workers = env_number("EIGA_DETAIL_WORKERS", self.DEFAULT_WORKERS, int)
+        if min_interval is None:
+            min_interval = env_number("EIGA_DETAIL_MIN_INTERVAL", self.DEFAULT_MIN_INTERVAL, float)
+        self.fetch_details = fetch_details
+        self.max_workers = max(1, int(max_workers))
+        self.rate_limiter = HostRateLimiter(min_interval)
+
+    def _fetch_one(self, movie_url: str) -> Optional[Dict]:
+        self.rate_limiter.wait(movie_url)
+        return self.fetch_details(movie_url)
+
+    def iter_details(
+        self, movie_urls: Iterable[str]
+    ) -> Iterator[Tuple[str, Optional[Dict], Optional[Exception]]]:
+        """
+        URL群の詳細を並列取得し、完了順に (URL, 詳細, 例外) を返す。
+
+        同一URLは1回だけ取得する。途中で反復を打ち切った場合、未着手の取得はキャンセルする。
+        """
+        urls = list(dict.fromkeys(url for url in movie_urls if url))
+        if not urls:
+            return
+
+        pool = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(urls)),
+            thread_name_prefix="eiga-detail",
+        )
+        try:
+            futures = {pool.submit(self._fetch_one, url): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    yield url, future.result(), None
+                except Exception as e:
+                    yield url, None, e
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,265 @@
+"""
+WebDriver のウォームプール（貸出/返却・ヘルスチェック・使用回数/TTL での入れ替え）
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from agent.scrapers.http_client import env_number
+
+
+class PooledDriver:
+    """プールが管理する WebDriver と、その利用状況。"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+class WebDriverPool:
+    """
+    起動済みブラウザを使い回すプール。
+
+    - checkout(): 待機中のブラウザを貸し出す（無ければ上限まで新規起動、上限到達時は返却待ち）
+    - checkin(): 使用回数/TTL/ヘルスチェックを確認し、問題なければ Cookie 等を消して待機列へ戻す
+    - borrow(): checkout/checkin をまとめた with 文用ヘルパー
+    """
+
+    DEFAULT_SIZE = 2
+    DEFAULT_MAX_USES = 50
+    DEFAULT_TTL = 1800  # 秒
+    DEFAULT_CHECKOUT_TIMEOUT = 30  # 秒
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        size: Optional[int] = None,
+        max_uses: Optional[int] = None,
+        ttl: Optional[float] = None,
+        checkout_timeout: Optional[float] = None,
+        health_check: Optional[Callable[[object], bool]] = None,
+    ):
+        if size is None:
+            size = env_number("EIGA_DRIVER_POOL_SIZE", self.DEFAULT_SIZE, int)
+        if max_uses is None:
+            max_uses = env_number("EIGA_DRIVER_MAX_USES", self.DEFAULT_MAX_USES, int)
+        if ttl is None:
+            ttl = env_number("EIGA_DRIVER_TTL", self.DEFAULT_TTL, float)
+        if checkout_timeout is None:
+            checkout_timeout = env_number("EIGA_DRIVER_CHECKOUT_TIMEOUT", self.DEFAULT_CHECKOUT_TIMEOUT, float)
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.max_uses = max(1, int(max_uses))
+        self.ttl = max(0.0, float(ttl))
+        self.checkout_timeout = max(0.0, float(checkout_timeout))
+        self.health_check = health_check or self.is_driver_alive
+        self._cond = threading.Condition()
+        self._idle: List[PooledDriver] = []
+        self._total = 0  # 起動済み（待機中 + 貸出中 + 起動中）
+        self._closed = False
+        self._stats = {"checkouts": 0, "launches": 0, "retired": 0, "launch_failures": 0, "timeouts": 0}
+
+    # --- 状態判定 ---------------------------------------------------------
+
+    @staticmethod
+    def is_driver_alive(driver) -> bool:
+        try:
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    def _is_expired(self, item: PooledDriver) -> bool:
+        if item.uses >= self.max_uses:
+            return True
+        return bool(self.ttl) and (time.monotonic() - item.created_at) >= self.ttl
+
+    @staticmethod
+    def reset_session_state(driver) -> None:
+        """次の利用者へ状態を持ち越さないよう Cookie を消して空ページへ戻す。"""
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    # --- 貸出/返却 --------------------------------------------------------
+
+    def checkout(self, timeout: Optional[float] = None) -> Optional[PooledDriver]:
+        """ブラウザを借りる。起動失敗・返却待ちタイムアウト時は None。"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            item = None
+            launch = False
+            with self._cond:
+                while not self._closed and not self._idle and self._total >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        return None
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return None
+                if self._idle:
+                    item = self._idle.pop()
+                else:
+                    self._total += 1
+                    launch = True
+
+            if launch:
+                item = self._launch()
+                if item is None:
+                    return None
+            elif self._is_expired(item) or not self.health_check(item.driver):
+                self._retire(item)
+                continue
+
+            item.uses += 1
+            with self._cond:
+                self._stats["checkouts"] += 1
+            return item
+
+    def checkin(self, item: PooledDriver, discard: bool = False) -> None:
+        """借りたブラウザを返す（discard=True または状態不良なら終了して枠を空ける）。"""
+        if item is None:
+            return
+        if discard or self._closed or self._is_expired(item) or not self.health_check(item.driver):
+            self._retire(item)
+            return
+        try:
+            self.reset_session_state(item.driver)
+        except Exception as e:
+            print(f"[WARN] プール返却時の状態リセットに失敗したため破棄します: {e}")
+            self._retire(item)
+            return
+        with self._cond:
+            self._idle.append(item)
+            self._cond.notify()
+
+    @contextmanager
+    def borrow(self, timeout: Optional[float] = None):
+        """with 文でブラウザを借りる（借りられない場合は None を渡す）。"""
+        item = self.checkout(timeout)
+        try:
+            yield item
+        except Exception:
+            # 例外時はブラウザ状態が不明なため入れ替える
+            if item is not None:
+                self.checkin(item, discard=True)
+                item = None
+            raise
+        finally:
+            if item is not None:
+                self.checkin(item)
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """起動済みブラウザを count 台（既定: 上限まで）用意する。"""
+        target = self.size if count is None else min(self.size, max(0, int(count)))
+        items = []
+        while True:
+            with self._cond:
+                if self._closed or self._total >= target:
+                    break
+                self._total += 1
+            item = self._launch()
+            if item is None:
+                break
+            items.append(item)
+        for item in items:
+            with self._cond:
+                self._idle.append(item)
+                self._cond.notify()
+        return len(items)
+
+    def _launch(self) -> Optional[PooledDriver]:
+        # 呼び出し側で self._total を予約済みであること
+        try:
+            driver = self.factory()
+        except Exception as e:
+            print(f"[WARN] プール用ブラウザの起動に失敗: {e}")
+            driver = None
+        with self._cond:
+            if driver is None:
+                self._total -= 1
+                self._stats["launch_failures"] += 1
+                self._cond.notify()
+                return None
+            self._stats["launches"] += 1
+        return PooledDriver(driver)
+
+    def _retire(self, item: PooledDriver) -> None:
+        try:
+            item.driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._total -= 1
+            self._stats["retired"] += 1
+            self._cond.notify()
+
+    # --- 管理 -------------------------------------------------------------
+
+    def stats(self) -> Dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                "size": self.size,
+                "idle": len(self._idle),
+                "in_use": self._total - len(self._idle),
+                "max_uses": self.max_uses,
+                "ttl_seconds": self.ttl,
+            })
+        return stats
+
+    def shutdown(self) -> None:
+        """待機中のブラウザを終了し、以降の貸出を止める（貸出中は返却時に終了）。"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for item in idle:
+            self._retire(item)
+
+
+_default_pool: Optional[WebDriverPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def _launch_pooled_browser():
+    from agent.scrapers.eiga_scraper import MovieComScraper
+
+    headless = (os.getenv("EIGA_DRIVER_POOL_HEADLESS") or "1").strip().lower() not in {"0", "false", "no", "off"}
+    driver, init_error, environment_hint = MovieComScraper.create_driver(headless=headless)
+    if driver is None:
+        hint = f" / {environment_hint}" if environment_hint else ""
+        print(f"[WARN] プール用ブラウザを起動できませんでした: {init_error}{hint}")
+    return driver
+
+
+def get_default_driver_pool() -> WebDriverPool:
+    """プロセス共通のドライバプールを返す（初回呼び出し時に生成）。"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = WebDriverPool(_launch_pooled_browser)
+        return _default_pool
+
+
+def shutdown_default_driver_pool() -> None:
+    global _default_pool
+    with _default_pool_lock:
+        pool, _default_pool = _default_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def warm_driver_pool_in_background() -> None:
+    """EIGA_DRIVER_POOL_WARM 台（既定0）のブラウザを起動時に裏で用意する。"""
+    count = env_number("EIGA_DRIVER_POOL_WARM", 0, int)
+    if count <= 0:
+        return
+    threading.Thread(
+        target=lambda: get_default_driver_pool().warm(count),
+        name="eiga-driver-warmup",
+        daemon=True,
+    ).start()
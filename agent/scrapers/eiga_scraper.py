@@ -1,12 +1,9 @@
 """
 映画.com スクレイパー - 改良版（ログイン対応強化）
 """
-import requests
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import (
     NoSuchWindowException,
@@ -14,7 +11,7 @@ from selenium.common.exceptions import (
     NoAlertPresentException,
 )
 from webdriver_manager.chrome import ChromeDriverManager
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 import time
 import re
@@ -22,8 +19,16 @@ import urllib.parse
 import os
 import shutil
 from collections import Counter
+from contextlib import contextmanager
 import html
 
+from agent.scrapers.detail_client import EigaDetailClient
+from agent.scrapers.driver_pool import get_default_driver_pool
+from agent.scrapers.html_parser import parse_html
+from agent.scrapers.http_client import EigaHttpClient, get_default_http_client
+from agent.scrapers.search_client import EigaSearchClient
+from agent.scrapers.waits import BrowserWaits
+
 class MovieComScraper:
     """映画.com からの映画情報スクレイピング"""
     
@@ -46,21 +51,89 @@ class MovieComScraper:
         except Exception:
             return False
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, http_client: Optional[EigaHttpClient] = None, driver=None):
         """Seleniumドライバを初期化
         
         Args:
             headless: Trueの場合バックグラウンド実行、Falseの場合ブラウザウィンドウを表示
+            http_client: 詳細ページ取得に使う HTTP クライアント（未指定時はプロセス共通クライアント）
+            driver: 起動済みドライバ（指定時は新規起動せず、close() でも終了しない）
+        
+        ブラウザは `driver` へ最初にアクセスした時点で起動する（詳細取得のみなら起動しない）。
         """
-        self.driver = None
+        self.http_client = http_client or get_default_http_client()
+        self.detail_client = EigaDetailClient(self.http_client)
+        # 一覧ページの HTTP 直接取得（ログイン済み Cookie を移した専用クライアント）
+        self.list_via_http = (os.getenv("EIGA_LIST_VIA_HTTP") or "1").strip().lower() not in {"0", "false", "no", "off"}
+        self.list_http_client: Optional[EigaHttpClient] = None
         self.interactive = False
         self.user_id = None  # ログイン後に抽出されるユーザーID
         self.user_id_confirmed = False
         self.oauth_state = None
         self.cancelled = False
         self.cancel_reason = None
+        self.fetch_interrupted = False
         self.init_error = None
         self.environment_hint = None
+        self._headless = headless
+        if driver is not None:
+            # ドライバプール等から借りたブラウザを使う（close() では終了しない）
+            self.driver = driver
+            self.owns_driver = False
+        else:
+            self._driver = None
+            self._launch_pending = True
+            self.owns_driver = True
+
+    @property
+    def driver(self):
+        """ブラウザセッション（未起動なら初回アクセス時に起動する）。"""
+        if self.__dict__.get("_launch_pending"):
+            self._launch_pending = False
+            self._driver, self.init_error, self.environment_hint = self.create_driver(self._headless)
+        return self.__dict__.get("_driver")
+
+    @driver.setter
+    def driver(self, value):
+        self._driver = value
+        self._launch_pending = False
+
+    @property
+    def driver_started(self) -> bool:
+        """ブラウザを起動済み（または受け取り済み）か。"""
+        return self.__dict__.get("_driver") is not None
+
+    @classmethod
+    @contextmanager
+    def borrowed(cls, pool=None, http_client: Optional[EigaHttpClient] = None):
+        """
+        ドライバプールのブラウザを使うスクレイパーを with 文で貸し出す。
+
+        プールから借りられない場合（起動失敗・返却待ちタイムアウト）は従来通り単独で起動する。
+        """
+        pool = pool or get_default_driver_pool()
+        with pool.borrow() as item:
+            if item is not None:
+                scraper = cls(http_client=http_client, driver=item.driver)
+            else:
+                print("[WARN] ドライバプールから借りられないため単独でブラウザを起動します")
+                scraper = cls(headless=True, http_client=http_client)
+            try:
+                yield scraper
+            finally:
+                scraper.close()
+
+    @staticmethod
+    def create_driver(headless: bool = False):
+        """
+        Chrome（失敗時は Edge）の WebDriver を起動する。
+
+        Returns:
+            (driver, init_error, environment_hint)。起動できなかった場合 driver は None
+        """
+        driver = None
+        init_error = None
+        environment_hint = None
         try:
             print("[DEBUG] ChromeOptions を作成中...")
             options = webdriver.ChromeOptions()
@@ -102,96 +175,97 @@ class MovieComScraper:
 
             print("[DEBUG] Selenium Chrome ドライバを作成中...")
             try:
-                self.driver = webdriver.Chrome(options=options)
+                driver = webdriver.Chrome(options=options)
                 try:
-                    self.driver.execute_cdp_cmd(
+                    driver.execute_cdp_cmd(
                         "Page.addScriptToEvaluateOnNewDocument",
                         {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"}
                     )
                 except Exception:
                     pass
-                _finalize_window(self.driver)
+                _finalize_window(driver)
                 print("[DEBUG] Selenium Manager で Chrome ドライバを初期化しました")
             except Exception as e:
                 init_errors.append(f"chrome_selenium_manager={e}")
                 print(f"[WARN] Selenium Manager 経由の Chrome 起動に失敗: {e}")
 
-            if not self.driver:
+            if not driver:
                 chromedriver_path = os.getenv("CHROMEDRIVER_PATH")
                 if not chromedriver_path:
                     chromedriver_path = shutil.which("chromedriver")
                 if chromedriver_path:
                     print(f"[DEBUG] CHROMEDRIVER_PATH を使用して試行: {chromedriver_path}")
                     try:
-                        self.driver = webdriver.Chrome(
+                        driver = webdriver.Chrome(
                             service=Service(chromedriver_path),
                             options=options
                         )
                         try:
-                            self.driver.execute_cdp_cmd(
+                            driver.execute_cdp_cmd(
                                 "Page.addScriptToEvaluateOnNewDocument",
                                 {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"}
                             )
                         except Exception:
                             pass
-                        _finalize_window(self.driver)
+                        _finalize_window(driver)
                         print("[DEBUG] CHROMEDRIVER_PATH で Chrome ドライバを初期化しました")
                     except Exception as e:
                         init_errors.append(f"chrome_env_driver={e}")
                         print(f"[WARN] CHROMEDRIVER_PATH での起動に失敗: {e}")
 
-            if not self.driver:
+            if not driver:
                 print("[DEBUG] webdriver_manager を使用して試行...")
                 try:
                     driver_path = ChromeDriverManager().install()
                     print(f"[DEBUG] ChromeDriver パス: {driver_path}")
-                    self.driver = webdriver.Chrome(
+                    driver = webdriver.Chrome(
                         service=Service(driver_path),
                         options=options
                     )
                     try:
-                        self.driver.execute_cdp_cmd(
+                        driver.execute_cdp_cmd(
                             "Page.addScriptToEvaluateOnNewDocument",
                             {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"}
                         )
                     except Exception:
                         pass
-                    _finalize_window(self.driver)
+                    _finalize_window(driver)
                     print("[DEBUG] webdriver_manager で Chrome ドライバを初期化しました")
                 except Exception as e:
                     init_errors.append(f"chrome_webdriver_manager={e}")
                     print(f"[WARN] webdriver_manager 経由の Chrome 起動に失敗: {e}")
 
-            if not self.driver:
+            if not driver:
                 print("[DEBUG] Edge ドライバをフォールバック試行...")
                 try:
                     edge_options = webdriver.EdgeOptions()
                     if headless:
                         edge_options.add_argument("--headless")
                     edge_options.add_argument("--start-maximized")
-                    self.driver = webdriver.Edge(options=edge_options)
-                    _finalize_window(self.driver)
+                    driver = webdriver.Edge(options=edge_options)
+                    _finalize_window(driver)
                     print("[DEBUG] Selenium Manager で Edge ドライバを初期化しました")
                 except Exception as e:
                     init_errors.append(f"edge_selenium_manager={e}")
                     print(f"[WARN] Edge フォールバック起動に失敗: {e}")
 
-            if not self.driver:
-                self.init_error = " | ".join(init_errors)
-                if self._is_wsl():
-                    self.environment_hint = (
+            if not driver:
+                init_error = " | ".join(init_errors)
+                if MovieComScraper._is_wsl():
+                    environment_hint = (
                         "WSL 上で実行中です。`google-chrome/chromium` と `chromedriver` が必要です。"
                         "例: sudo apt update && sudo apt install -y chromium chromium-driver。"
                         "または Windows 側でバックエンドを起動してください。"
                     )
-                print(f"[ERROR] ドライバ初期化に失敗: {self.init_error}")
+                print(f"[ERROR] ドライバ初期化に失敗: {init_error}")
         
         except Exception as e:
             print(f"[ERROR] 予期しないドライバ初期化エラー: {e}")
             import traceback
             traceback.print_exc()
-            self.init_error = str(e)
-            self.driver = None
+            init_error = str(e)
+            driver = None
+        return driver, init_error, environment_hint
 
     def _is_browser_closed_error(self, error: Exception) -> bool:
         if isinstance(error, (NoSuchWindowException, InvalidSessionIdException)):
@@ -225,6 +299,10 @@ class MovieComScraper:
             self.cancel_reason = reason
             print(f"[INFO] 同期をキャンセル状態に設定: {reason}")
 
+    def request_cancel(self, reason: str) -> None:
+        """外部（同期ジョブの中止要求など）からキャンセル状態にする。ページ・行の区切りで停止する。"""
+        self._mark_cancelled(reason)
+
     def _accept_alert_if_present(self) -> bool:
         try:
             alert = self.driver.switch_to.alert
@@ -273,44 +351,65 @@ class MovieComScraper:
                 return False
             return False
 
+    @property
+    def waits(self) -> BrowserWaits:
+        """現在のドライバに対する条件待機（ドライバ差し替え時は作り直す）。"""
+        waits = self.__dict__.get("_waits")
+        if waits is None or waits.driver is not self.driver:
+            waits = BrowserWaits(self.driver)
+            self._waits = waits
+        return waits
+
+    def _load_page(self, url: str, step: str, timeout: float = 10) -> None:
+        """URL へ遷移し、固定 sleep ではなく document.readyState で読み込み完了を待つ。"""
+        self.driver.get(url)
+        self.waits.document_ready(step, timeout=timeout)
+
+    def _find_element_in_frames_once(self, selectors):
+        """トップ文書 + iframe を1回だけ走査して最初の一致要素を返す（見つからなければ None）。"""
+        # 1) トップ文書
+        try:
+            self.driver.switch_to.default_content()
+            for by, value in selectors:
+                elems = self.driver.find_elements(by, value)
+                if elems:
+                    return elems[0]
+        except Exception:
+            pass
+
+        # 2) iframe 内
+        try:
+            self.driver.switch_to.default_content()
+            frames = self.driver.find_elements(By.TAG_NAME, "iframe")
+            for idx in range(len(frames)):
+                try:
+                    self.driver.switch_to.default_content()
+                    frames = self.driver.find_elements(By.TAG_NAME, "iframe")
+                    if idx >= len(frames):
+                        break
+                    self.driver.switch_to.frame(frames[idx])
+                    for by, value in selectors:
+                        elems = self.driver.find_elements(by, value)
+                        if elems:
+                            return elems[0]
+                except Exception:
+                    continue
+        except Exception:
+            pass
+        return None
+
     def _find_element_across_frames(self, selectors, timeout: int = 10):
         """複数セレクタをトップ文書 + iframe 横断で探索して最初の要素を返す。"""
         if not self.driver:
             return None
 
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            # 1) トップ文書
-            try:
-                self.driver.switch_to.default_content()
-                for by, value in selectors:
-                    elems = self.driver.find_elements(by, value)
-                    if elems:
-                        return elems[0]
-            except Exception:
-                pass
-
-            # 2) iframe 内
-            try:
-                self.driver.switch_to.default_content()
-                frames = self.driver.find_elements(By.TAG_NAME, "iframe")
-                for idx in range(len(frames)):
-                    try:
-                        self.driver.switch_to.default_content()
-                        frames = self.driver.find_elements(By.TAG_NAME, "iframe")
-                        if idx >= len(frames):
-                            break
-                        self.driver.switch_to.frame(frames[idx])
-                        for by, value in selectors:
-                            elems = self.driver.find_elements(by, value)
-                            if elems:
-                                return elems[0]
-                    except Exception:
-                        continue
-            except Exception:
-                pass
-
-            time.sleep(0.5)
+        elem = self.waits.until(
+            "element.frames",
+            lambda d: self._find_element_in_frames_once(selectors),
+            timeout,
+        )
+        if elem:
+            return elem
 
         try:
             self.driver.switch_to.default_content()
@@ -322,32 +421,33 @@ class MovieComScraper:
         """全ウィンドウ + iframe を横断して最初の一致要素を返す。"""
         if not self.driver:
             return None
-        deadline = time.time() + timeout
-        while time.time() < deadline:
+
+        def _scan_windows(driver):
             try:
-                handles = self.driver.window_handles
+                handles = driver.window_handles
             except Exception:
                 handles = []
             if not handles:
-                handles = [self.driver.current_window_handle]
+                handles = [driver.current_window_handle]
 
             for handle in handles:
                 try:
-                    self.driver.switch_to.window(handle)
-                    elem = self._find_element_across_frames(selectors, timeout=1)
+                    driver.switch_to.window(handle)
+                    elem = self._find_element_in_frames_once(selectors)
                     if elem:
                         return elem
                 except Exception:
                     continue
-            time.sleep(0.5)
-        return None
+            return None
+
+        return self.waits.until("element.windows_frames", _scan_windows, timeout)
 
     def _collect_oauth_callback_urls(self) -> List[str]:
         """DOM構造に依存せず、OAuth コールバックURL候補を収集する。"""
         candidates: List[str] = []
         try:
             page = self.driver.page_source or ""
-            soup = BeautifulSoup(page, "html.parser")
+            soup = parse_html(page)
 
             # 1) href/action/src 属性から収集
             for tag in soup.find_all(href=True):
@@ -479,7 +579,7 @@ class MovieComScraper:
             except Exception:
                 pass
 
-            soup = BeautifulSoup(self.driver.page_source, "html.parser")
+            soup = parse_html(self.driver.page_source)
             # hidden input
             inp = soup.find("input", attrs={"name": "state"})
             if inp and inp.get("value"):
@@ -527,9 +627,8 @@ class MovieComScraper:
     def _open_authorize_via_login_page(self) -> bool:
         """映画.comログインページ上の正規導線から認可画面へ遷移する。"""
         try:
-            deadline = time.time() + 8.0
-            while time.time() < deadline:
-                links = self.driver.find_elements(
+            def _find_authorize_target(driver):
+                links = driver.find_elements(
                     By.XPATH,
                     "//a[contains(@href, '/login/oauth/gid')]"
                     "|//a[contains(@href, 'id.eiga.com/authorize')]"
@@ -560,54 +659,53 @@ class MovieComScraper:
                     priority.sort(key=lambda x: x[0], reverse=True)
                     score, target, href = priority[0]
                     if score > 0:
-                        print(f"[DEBUG] ログインページ導線から認可画面へ遷移: {href}")
-                        try:
-                            parsed = urllib.parse.urlparse(href)
-                            qs = urllib.parse.parse_qs(parsed.query)
-                            state_val = qs.get("state", [None])[0]
-                            if state_val:
-                                self.oauth_state = state_val
-                                print(f"[DEBUG] 認可リンクからstateを取得: {self.oauth_state}")
-                        except Exception:
-                            pass
-                        try:
-                            target.click()
-                        except Exception:
-                            self.driver.execute_script("arguments[0].click();", target)
-                        time.sleep(1.5)
-                        try:
-                            cur = self.driver.current_url
-                            print(f"[DEBUG] 導線クリック後URL: {cur}")
-                        except Exception:
-                            pass
-                        self._capture_state_from_dom()
-                        return True
+                        return ("link", target, href)
 
-                text_buttons = self.driver.find_elements(
+                text_buttons = driver.find_elements(
                     By.XPATH,
                     "//a[contains(normalize-space(.), '映画.com ID')]"
                     "|//button[contains(normalize-space(.), '映画.com ID')]"
                 )
                 if text_buttons:
-                    target = text_buttons[0]
-                    print("[DEBUG] テキスト導線（映画.com ID）をクリックします")
-                    try:
-                        target.click()
-                    except Exception:
-                        self.driver.execute_script("arguments[0].click();", target)
-                    time.sleep(1.5)
-                    try:
-                        cur = self.driver.current_url
-                        print(f"[DEBUG] テキスト導線クリック後URL: {cur}")
-                    except Exception:
-                        pass
-                    self._capture_state_from_dom()
-                    return True
+                    return ("text", text_buttons[0], None)
+                return None
+
+            found = self.waits.until("oauth.login_page_link", _find_authorize_target, 8.0)
+            if not found:
+                self._debug_dump_login_oauth_candidates()
+                return False
 
-                time.sleep(0.5)
+            kind, target, href = found
+            if kind == "link":
+                print(f"[DEBUG] ログインページ導線から認可画面へ遷移: {href}")
+                try:
+                    parsed = urllib.parse.urlparse(href)
+                    qs = urllib.parse.parse_qs(parsed.query)
+                    state_val = qs.get("state", [None])[0]
+                    if state_val:
+                        self.oauth_state = state_val
+                        print(f"[DEBUG] 認可リンクからstateを取得: {self.oauth_state}")
+                except Exception:
+                    pass
+            else:
+                print("[DEBUG] テキスト導線（映画.com ID）をクリックします")
 
-            self._debug_dump_login_oauth_candidates()
-            return False
+            before_url = self.driver.current_url
+            try:
+                target.click()
+            except Exception:
+                self.driver.execute_script("arguments[0].click();", target)
+            # 遷移（URL変化）→ 読み込み完了を待つ。別ウィンドウ等で URL が変わらない場合は上限まで待って続行
+            self.waits.url_changed("oauth.login_page_click", before_url, timeout=3)
+            self.waits.document_ready("oauth.login_page_ready", timeout=5)
+            try:
+                cur = self.driver.current_url
+                label = "導線クリック後URL" if kind == "link" else "テキスト導線クリック後URL"
+                print(f"[DEBUG] {label}: {cur}")
+            except Exception:
+                pass
+            self._capture_state_from_dom()
+            return True
         except Exception as e:
             print(f"[WARN] ログインページ導線での認可遷移に失敗: {e}")
             return False
@@ -617,8 +715,7 @@ class MovieComScraper:
         try:
             print(f"[DEBUG] OAuthエントリURLへ遷移: {self.OAUTH_ENTRY_URL}")
             self.driver.switch_to.default_content()
-            self.driver.get(self.OAUTH_ENTRY_URL)
-            time.sleep(1.5)
+            self._load_page(self.OAUTH_ENTRY_URL, "oauth.entry")
             try:
                 cur = self.driver.current_url
             except Exception:
@@ -689,8 +786,7 @@ class MovieComScraper:
         
         try:
             print(f"[DEBUG] ログインページを取得: {self.LOGIN_URL}")
-            self.driver.get(self.LOGIN_URL)
-            time.sleep(1 if (email and password) else 3)
+            self._load_page(self.LOGIN_URL, "login.page")
             
             # 対話型ログイン（メール・パスワードなし）
             if email is None or password is None:
@@ -703,22 +799,25 @@ class MovieComScraper:
                 initial_url = self.driver.current_url
                 print(f"[DEBUG] 初期 URL: {initial_url}")
 
-                # 最大 600 秒待機（2秒刻みで is_logged_in() を確認）
+                # 最大 600 秒待機（URL 変化で即時、変化がなければ2秒ごとに is_logged_in() を確認）
                 max_wait = 600
                 interval = 2
+                started = time.monotonic()
                 waited = 0
                 url_changed = False
+                last_seen_url = initial_url
                 
                 while waited < max_wait:
                     if not self.is_driver_alive():
                         print("[WARN] ログイン待機中にブラウザクローズを検出しました")
                         return False
-                    time.sleep(interval)
-                    waited += interval
+                    self.waits.url_changed("login.interactive", last_seen_url, timeout=interval)
+                    waited = int(time.monotonic() - started)
                     try:
                         current_url = self.driver.current_url
                     except Exception:
                         current_url = '<unknown>'
+                    last_seen_url = current_url
                     
                     # URL が初期URL から変わったか確認
                     if current_url != initial_url:
@@ -730,8 +829,8 @@ class MovieComScraper:
                     # URL が変わった後でのみ is_logged_in() を確認
                     if url_changed:
                         if self.is_logged_in():
-                            # 念のため短時間待って状態が安定するか確認
-                            time.sleep(1)
+                            # 念のため短時間待って状態が安定するか確認（DOM から判定できないため固定待機）
+                            self.waits.settle("login.interactive_stabilize", 1)
                             if self.is_logged_in():
                                 print(f"[DEBUG] ログイン完了を検知（安定確認済）: {current_url}")
                                 # ユーザーIDを現在のURLから抽出
@@ -784,8 +883,7 @@ class MovieComScraper:
                     try:
                         print(f"[DEBUG] 抽出した認可URLへ遷移: {extracted_auth_url}")
                         self.driver.switch_to.default_content()
-                        self.driver.get(extracted_auth_url)
-                        time.sleep(1.5)
+                        self._load_page(extracted_auth_url, "oauth.extracted_authorize")
                     except Exception as nav_error:
                         print(f"[WARN] 抽出認可URLへの遷移に失敗: {nav_error}")
                     email_input = self._find_element_across_windows_and_frames(email_selectors, timeout=8)
@@ -798,7 +896,8 @@ class MovieComScraper:
             print("[DEBUG] メール入力フィールドが見つかりました")
             email_input.clear()
             email_input.send_keys(email)
-            time.sleep(1)
+            # 入力値が反映された時点で次へ進む（固定待機しない）
+            self.waits.until("login.email_input", lambda d: email_input.get_attribute("value") == email, 2)
 
             password_input = self._find_element_across_windows_and_frames([
                 (By.NAME, "password"),
@@ -814,7 +913,7 @@ class MovieComScraper:
             print("[DEBUG] パスワード入力フィールドが見つかりました")
             password_input.clear()
             password_input.send_keys(password)
-            time.sleep(1)
+            self.waits.until("login.password_input", lambda d: bool(password_input.get_attribute("value")), 2)
 
             login_button = self._find_element_across_windows_and_frames([
                 (By.XPATH, "//button[@type='submit']"),
@@ -835,22 +934,27 @@ class MovieComScraper:
             except Exception:
                 pass
             
-            # ログイン完了をポーリングで検証（最大 60 秒）
+            # ログイン完了をポーリングで検証（最大 60 秒）。URL が変わった時点で即座に再判定する
             max_wait = 60
             interval = 2
-            waited = 0
-            while waited < max_wait:
+            started = time.monotonic()
+            last_url = ""
+            try:
+                last_url = self.driver.current_url
+            except Exception:
+                pass
+            while time.monotonic() - started < max_wait:
                 if not self.is_driver_alive():
                     print("[WARN] 自動ログイン待機中にブラウザクローズを検出しました")
                     return False
                 self._ensure_active_window()
-                time.sleep(interval)
-                waited += interval
-                print(f"[DEBUG] 自動ログイン後待機 {waited}s")
+                self.waits.url_changed("login.auto_redirect", last_url, timeout=interval)
+                print(f"[DEBUG] 自動ログイン後待機 {time.monotonic() - started:.1f}s")
                 try:
                     current_url = self.driver.current_url
                 except Exception:
                     current_url = ""
+                last_url = current_url
 
                 if "/authorize/" in current_url.lower() and "/authorize/done" not in current_url.lower():
                     self._capture_state_from_dom()
@@ -895,8 +999,7 @@ class MovieComScraper:
                     if _retry < 1:
                         print("[DEBUG] OAuthフローを再試行します")
                         try:
-                            self.driver.get(self.AUTH_LOGIN_URL)
-                            time.sleep(1)
+                            self._load_page(self.AUTH_LOGIN_URL, "oauth.retry")
                         except Exception:
                             pass
                         return self.login(email, password, _retry=_retry + 1)
@@ -919,14 +1022,34 @@ class MovieComScraper:
         視聴済み映画の一覧を取得
         
         Returns:
-            映画情報リスト
+            映画情報リスト（途中で中断した場合は空リスト）
+        """
+        movies: List[Dict] = []
+        for page_movies in self.iter_watched_movie_pages():
+            movies.extend(page_movies)
+        if self.fetch_interrupted or self.cancelled:
+            return []
+        return movies
+
+    def iter_watched_movie_pages(self) -> Iterator[List[Dict]]:
+        """
+        視聴済み映画の一覧をページ単位で返すジェネレータ
+        
+        取得できたページから順に返すため、呼び出し側は全ページを待たずに保存できる。
+        途中で中断した場合は fetch_interrupted を True にして終了する。
+        
+        Yields:
+            1ページ分の映画情報リスト
         """
+        self.fetch_interrupted = False
         if not self.driver:
             print("[ERROR] ドライバが初期化されていません")
-            return []
+            self.fetch_interrupted = True
+            return
         if not self.is_driver_alive():
             print("[WARN] 視聴履歴取得前にブラウザクローズを検出しました")
-            return []
+            self.fetch_interrupted = True
+            return
         
         try:
             print(f"[DEBUG] 視聴済みページを取得: {self.WATCHED_PAGE_URL}")
@@ -939,11 +1062,13 @@ class MovieComScraper:
                     # 長めに待つ（判定ベース）、ユーザがログイン操作を完了するまで待つ
                     max_wait = 600
                     interval = 2
+                    started = time.monotonic()
                     waited = 0
                     while waited < max_wait:
-                        time.sleep(interval)
-                        waited += interval
-                        print("[DEBUG] ログイン待機中: {waited}s")
+                        # ユーザー操作待ちのため、URL 変化で即時・変化がなければ interval ごとに再判定する
+                        self.waits.url_changed("login.wait_user", self.driver.current_url, timeout=interval)
+                        waited = int(time.monotonic() - started)
+                        print(f"[DEBUG] ログイン待機中: {waited}s")
                         if self.is_logged_in():
                             print("[DEBUG] ログインが確認されました。")
                             # ユーザーIDを抽出
@@ -951,7 +1076,8 @@ class MovieComScraper:
                             break
                     else:
                         print("[ERROR] ログインが確認できませんでした（タイムアウト）")
-                        return []
+                        self.fetch_interrupted = True
+                        return
                 else:
                     # 既にログイン済みならユーザーID抽出
                     self._extract_user_id(self.driver.current_url)
@@ -966,13 +1092,15 @@ class MovieComScraper:
                 else:
                     if not self._resolve_user_id_via_mypage():
                         print("[ERROR] /mypage/ から user_id を確定できませんでした")
-                        return []
+                        self.fetch_interrupted = True
+                        return
 
             self._navigate_to_user_movie_page()
 
             if not self.user_id:
                 print("[ERROR] ユーザーIDを取得できなかったため視聴履歴ページへ遷移できません")
-                return []
+                self.fetch_interrupted = True
+                return
 
             watched_url = f"{self.BASE_URL}/user/{self.user_id}/movie/"
             print(f"[DEBUG] 視聴済みページを取得: {watched_url}")
@@ -981,35 +1109,41 @@ class MovieComScraper:
             first_page_url = f"{watched_url}?sort=new&filter=watched&per=all&page=1"
             print(f"[DEBUG] 初回一覧URLへ遷移: {first_page_url}")
             self.driver.get(first_page_url)
-            time.sleep(2)
             self._wait_for_movie_list_dom(timeout=15)
             
-            movies = []
+            total = 0
             page_num = 1
             max_pages = 1000  # 無限ループ防止
             
             while page_num <= max_pages:
                 if not self.is_driver_alive():
                     print("[WARN] 視聴履歴取得中にブラウザクローズを検出しました")
-                    return []
+                    self.fetch_interrupted = True
+                    return
                 page_url = f"{watched_url}?sort=new&filter=watched&per=all&page={page_num}"
                 print(f"[DEBUG] ページ {page_num} を取得中: {page_url}")
-                # フィルター設定後のURLを使用
+                # 2ページ目以降はログイン Cookie を移した HTTP クライアントで直接取得し、
+                # 一覧DOMが得られない場合のみブラウザで遷移する
+                captured = None
                 if page_num > 1:
-                    self.driver.get(page_url)
-                    self._wait_for_movie_list_dom(timeout=10)
+                    captured = self._fetch_movie_list_page_via_http(page_url)
+                    if captured is None:
+                        self.driver.get(page_url)
+                        self._wait_for_movie_list_dom(timeout=10)
                 
-                current_url = self.driver.current_url
-                print(f"[DEBUG] 現在の URL: {current_url}")
-                if not self.user_id:
-                    self._extract_user_id(current_url)
+                movies: List[Dict] = []
+                if captured is not None:
+                    soup, movie_divs = captured
+                else:
+                    current_url = self.driver.current_url
+                    print(f"[DEBUG] 現在の URL: {current_url}")
                     if not self.user_id:
-                        self._extract_user_id_from_page()
-                
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                
-                # list-my-data div を探す（標準構造）
-                movie_divs = soup.find_all('div', class_='list-my-data')
+                        self._extract_user_id(current_url)
+                        if not self.user_id:
+                            self._extract_user_id_from_page()
+                    
+                    # list-my-data div を探す（標準構造）
+                    soup, movie_divs = self._capture_movie_list_page()
                 print(f"[DEBUG] ページ {page_num}: list-my-data = {len(movie_divs)} 件")
 
                 if not movie_divs:
@@ -1022,8 +1156,7 @@ class MovieComScraper:
                         print(f"[DEBUG] list-my-data 再取得を試行: {retry_url}")
                         self.driver.get(retry_url)
                         self._wait_for_movie_list_dom(timeout=10)
-                        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                        movie_divs = soup.find_all('div', class_='list-my-data')
+                        soup, movie_divs = self._capture_movie_list_page()
                         print(f"[DEBUG] 再取得結果 list-my-data = {len(movie_divs)} 件")
                         if movie_divs:
                             break
@@ -1036,8 +1169,7 @@ class MovieComScraper:
                         # 1回だけ一覧復旧導線を試して再評価
                         recovered = self._recover_movie_list_page()
                         if recovered:
-                            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                            movie_divs = soup.find_all('div', class_='list-my-data')
+                            soup, movie_divs = self._capture_movie_list_page()
                             if movie_divs:
                                 print(f"[DEBUG] 復旧後 list-my-data = {len(movie_divs)} 件")
                                 for idx, div in enumerate(movie_divs):
@@ -1073,6 +1205,10 @@ class MovieComScraper:
                             print(f"[WARN] 映画パースエラー (div {idx}): {e}")
                             continue
                 
+                total += len(movies)
+                print(f"[DEBUG] ページ {page_num}: {len(movies)} 件を返却（累計 {total} 件）")
+                yield movies
+
                 # 次ページへのリンクを確認
                 next_link = soup.find('a', class_='next') or soup.find('a', attrs={'rel': 'next'})
                 if next_link:
@@ -1082,17 +1218,16 @@ class MovieComScraper:
                     print("[DEBUG] 次ページリンクが見つかりません。最後のページです")
                     break
             
-            print(f"[DEBUG] 合計 {len(movies)} 件の映画を取得")
-            return movies
+            print(f"[DEBUG] 合計 {total} 件の映画を取得")
         
         except Exception as e:
+            self.fetch_interrupted = True
             if self._is_browser_closed_error(e):
                 self._mark_cancelled("視聴履歴取得中にブラウザが閉じられました")
-                return []
+                return
             print(f"[ERROR] 視聴済み映画取得エラー: {e}")
             import traceback
             traceback.print_exc()
-            return []
 
     def _parse_movie_links_fallback(self, soup) -> List[Dict]:
         """DOM差分時のフォールバック抽出。/movie/{id}/ リンクを基準に映画を抽出する。"""
@@ -1141,7 +1276,8 @@ class MovieComScraper:
             })
         return movies
 
-    def _extract_director_from_text(self, text: Optional[str]) -> Optional[str]:
+    @staticmethod
+    def _extract_director_from_text(text: Optional[str]) -> Optional[str]:
         """
         監督名抽出（前置き/後置き両対応）
         例:
@@ -1186,35 +1322,91 @@ class MovieComScraper:
                         sep = "&" if "?" in retry_url else "?"
                         retry_url = f"{retry_url}{sep}sort=new&filter=watched&per=all"
                     print(f"[DEBUG] 一覧復旧遷移を試行: {retry_url}")
-                    self.driver.get(retry_url)
-                    time.sleep(2)
+                    self._load_page(retry_url, "list.recover")
                     return True
 
             # 直接URLの最終フォールバック
             if self.user_id:
                 retry_url = f"{self.BASE_URL}/user/{self.user_id}/movie/?sort=new&filter=watched&per=all"
                 print(f"[DEBUG] 一覧復旧URLを直接試行: {retry_url}")
-                self.driver.get(retry_url)
-                time.sleep(2)
+                self._load_page(retry_url, "list.recover")
                 return True
         except Exception as e:
             print(f"[WARN] 一覧復旧遷移に失敗: {e}")
         return False
 
+    # 一覧DOMの描画判定（ブラウザ側で要素の有無を調べ、page_source の転送・再解析を避ける）
+    MOVIE_LIST_READY_SCRIPT = """
+        if (document.querySelector('div.list-my-data')) { return true; }
+        return Array.from(document.querySelectorAll("a[href*='/movie/']")).some(
+            function (a) { return /\\/movie\\/\\d+\\/?/.test(a.getAttribute('href') || ''); }
+        );
+    """
+
     def _wait_for_movie_list_dom(self, timeout: int = 12) -> bool:
         """映画一覧DOM（list-my-data または /movie/{id}/ リンク）の描画を待機する。"""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: (
-                    len(BeautifulSoup(d.page_source, "html.parser").find_all("div", class_="list-my-data")) > 0
-                    or bool(re.search(r"/movie/\d+/?", d.page_source))
-                )
-            )
-            return True
+            return bool(self.waits.until(
+                "list.dom",
+                lambda d: bool(d.execute_script(self.MOVIE_LIST_READY_SCRIPT)),
+                timeout,
+            ))
         except Exception:
             return False
+
+    def _get_list_http_client(self) -> Optional[EigaHttpClient]:
+        """ブラウザのログイン Cookie と User-Agent を移した一覧取得用クライアントを返す。"""
+        if self.list_http_client is None:
+            client = EigaHttpClient(base_url=self.http_client.base_url)
+            try:
+                user_agent = self.driver.execute_script("return navigator.userAgent")
+                if user_agent:
+                    client.session.headers["User-Agent"] = user_agent
+            except Exception:
+                pass
+            imported = client.import_cookies(self.driver.get_cookies())
+            if not imported:
+                print("[DEBUG] ブラウザ Cookie が取得できないため一覧の HTTP 取得を無効化します")
+                client.close()
+                self.list_via_http = False
+                return None
+            print(f"[DEBUG] 一覧の HTTP 取得用に Cookie {imported} 件を移しました")
+            self.list_http_client = client
+        return self.list_http_client
+
+    def _fetch_movie_list_page_via_http(self, page_url: str):
+        """
+        一覧ページをブラウザを使わず取得・解析する。
+
+        Returns:
+            (soup, list-my-data 要素)。一覧DOMが得られない場合は None（以降はブラウザ取得に戻す）
+        """
+        if not self.list_via_http:
+            return None
+        try:
+            client = self._get_list_http_client()
+            if client is None:
+                return None
+            response = client.get(page_url)
+            if response.status_code == 200:
+                soup = parse_html(response.content)
+                movie_divs = soup.find_all('div', class_='list-my-data')
+                if movie_divs:
+                    print(f"[DEBUG] HTTP 取得: {page_url} (list-my-data = {len(movie_divs)} 件)")
+                    return soup, movie_divs
+            print(f"[DEBUG] HTTP 取得で一覧DOMを確認できないためブラウザ取得へ切り替えます (status={response.status_code})")
+        except Exception as e:
+            print(f"[WARN] 一覧の HTTP 取得に失敗したためブラウザ取得へ切り替えます: {e}")
+        self.list_via_http = False
+        return None
+
+    def _capture_movie_list_page(self):
+        """現在ページの page_source を1回だけ取得・解析し、(soup, list-my-data 要素) を返す。"""
+        soup = parse_html(self.driver.page_source)
+        return soup, soup.find_all('div', class_='list-my-data')
     
-    def _parse_movie_div(self, div) -> Optional[Dict]:
+    @classmethod
+    def _parse_movie_div(cls, div) -> Optional[Dict]:
         """
         list-my-data div から映画情報をパース
         
@@ -1255,7 +1447,7 @@ class MovieComScraper:
             
             movie_url = movie_link.get('href', '')
             if movie_url and not movie_url.startswith('http'):
-                movie_url = self.BASE_URL + movie_url
+                movie_url = cls.BASE_URL + movie_url
             
             print(f"[DEBUG] div id={div_id} -> external_id={external_id}, title='{title}', url={movie_url}")
             
@@ -1288,7 +1480,7 @@ class MovieComScraper:
             if sub_elem:
                 sub_text = sub_elem.get_text(" ", strip=True)
                 if sub_text:
-                    director = self._extract_director_from_text(sub_text)
+                    director = cls._extract_director_from_text(sub_text)
 
                     if released_year is None:
                         year_match = re.search(r'(\d{4})年', sub_text)
@@ -1361,7 +1553,7 @@ class MovieComScraper:
                 return True
 
             # ログインフォームが存在しないならログイン済みの可能性
-            soup = BeautifulSoup(page, 'html.parser')
+            soup = parse_html(page)
             if not soup.find('input', attrs={'name': 'email'}) and not soup.find('input', attrs={'name': 'password'}):
                 print("[DEBUG] ログインフォームが見当たらないためログイン済みと推定")
                 return True
@@ -1393,8 +1585,7 @@ class MovieComScraper:
         """`/mypage/` から自分の user_id を確定する。"""
         try:
             self._accept_alert_if_present()
-            self.driver.get(self.BASE_URL + "/mypage/")
-            time.sleep(2)
+            self._load_page(self.BASE_URL + "/mypage/", "mypage.resolve_user")
             self._accept_alert_if_present()
             if self._is_logged_out_ui():
                 print("[WARN] /mypage/ が未ログイン画面へ遷移しました")
@@ -1426,7 +1617,7 @@ class MovieComScraper:
                 print("[DEBUG] 未ログイン状態のため user_id 抽出をスキップ")
                 return False
             page = self.driver.page_source
-            soup = BeautifulSoup(page, 'html.parser')
+            soup = parse_html(page)
 
             # 1) hidden return_to に含まれる user を最優先（自分のマイページ文脈）
             keys = []
@@ -1471,35 +1662,25 @@ class MovieComScraper:
                 self._capture_state_from_dom()
 
                 def _wait_callback_settle(timeout_sec: float = 12.0):
-                    waited = 0.0
-                    while waited < timeout_sec:
+                    def _settled(driver):
                         self._ensure_active_window()
                         self._accept_alert_if_present()
-                        try:
-                            cur = self.driver.current_url
-                        except Exception:
-                            cur = ""
+                        cur = driver.current_url
                         # id.eiga.com から抜けて、OAuthコールバックURLでもなくなれば確定
-                        if cur and ("id.eiga.com" not in cur) and ("/login/oauth/gid/" not in cur):
-                            return True
-                        time.sleep(0.5)
-                        waited += 0.5
-                    return False
+                        return bool(cur) and ("id.eiga.com" not in cur) and ("/login/oauth/gid/" not in cur)
+
+                    return bool(self.waits.until("oauth.callback_settle", _settled, timeout_sec))
 
                 # 戻るリンククリックを優先し、URL直叩きは行わない
                 try:
-                    callback_url = ""
-                    wait_deadline = time.time() + 10
-                    while time.time() < wait_deadline:
+                    def _callback_with_code(driver):
                         self._capture_state_from_dom()
-                        callback_url = self._get_authorize_done_callback_url()
-                        if (
-                            callback_url
-                            and re.search(r"[?&]code=[^&]+", callback_url)
-                        ):
-                            break
-                        callback_url = ""
-                        time.sleep(0.5)
+                        url = self._get_authorize_done_callback_url()
+                        if url and re.search(r"[?&]code=[^&]+", url):
+                            return url
+                        return None
+
+                    callback_url = self.waits.until("oauth.done_callback_url", _callback_with_code, 10) or ""
 
                     if not callback_url:
                         print("[WARN] 戻るリンクの code を取得できませんでした")
@@ -1554,8 +1735,7 @@ class MovieComScraper:
                             if self.user_id:
                                 movie_page_url = f"{self.BASE_URL}/user/{self.user_id}/movie/"
                                 print(f"[DEBUG] 戻るリンク経由でマイページへ遷移: {movie_page_url}")
-                                self.driver.get(movie_page_url)
-                                time.sleep(2)
+                                self._load_page(movie_page_url, "mypage.movie_list")
                                 return
                 except Exception as e:
                     print(f"[WARN] 戻るリンク優先試行に失敗: {e}")
@@ -1564,23 +1744,20 @@ class MovieComScraper:
             if self.user_id:
                 movie_page_url = f"{self.BASE_URL}/user/{self.user_id}/movie/"
                 print(f"[DEBUG] ユーザマイページへ直接遷移: {movie_page_url}")
-                self.driver.get(movie_page_url)
-                time.sleep(2)
+                self._load_page(movie_page_url, "mypage.movie_list")
                 return
 
             # /mypage/ 直遷移で user_id 補完を試す（最優先）
             try:
                 print("[DEBUG] user_id 未取得のため /mypage/ 直遷移を試行します")
-                self.driver.get(self.BASE_URL + "/mypage/")
-                time.sleep(2)
+                self._load_page(self.BASE_URL + "/mypage/", "mypage.resolve_user")
                 self._extract_user_id(self.driver.current_url)
                 if not self.user_id:
                     self._extract_user_id_from_page()
                 if self.user_id:
                     movie_page_url = f"{self.BASE_URL}/user/{self.user_id}/movie/"
                     print(f"[DEBUG] /mypage/ 経由でマイページへ遷移: {movie_page_url}")
-                    self.driver.get(movie_page_url)
-                    time.sleep(2)
+                    self._load_page(movie_page_url, "mypage.movie_list")
                     return
             except Exception as e:
                 print(f"[WARN] /mypage/ 経由の user_id 補完に失敗: {e}")
@@ -1616,8 +1793,8 @@ class MovieComScraper:
             print("[DEBUG] フィルター値を 'watched' に設定しました")
             
             # オプションをクリック
+            before_url = self.driver.current_url
             option_elem.click()
-            time.sleep(1)
             
             # フォーム送信（チェンジイベントをトリガー）
             self.driver.execute_script("""
@@ -1630,7 +1807,9 @@ class MovieComScraper:
                 }
             """)
             print("[DEBUG] フィルター設定完了（change イベント発火）")
-            time.sleep(2)  # ページ再読み込み待機
+            # ページ再読み込み（URL 変化 → 読み込み完了）を待機
+            self.waits.url_changed("list.filter_reload", before_url, timeout=3)
+            self.waits.document_ready("list.filter_ready", timeout=5)
         
         except Exception as e:
             if self._is_browser_closed_error(e):
@@ -1640,92 +1819,32 @@ class MovieComScraper:
             # フィルター設定失敗時は処理を続行（全データで取得）
             pass
     
-    def get_movie_details(self, movie_url: str) -> Optional[Dict]:
+    def get_movie_details(self, movie_url: str, revalidate: bool = False) -> Optional[Dict]:
         """
-        映画詳細情報取得
+        映画詳細情報取得（ブラウザ不要。EigaDetailClient へ委譲）
         
         Args:
             movie_url: 映画ページURL
+            revalidate: True の場合、キャッシュが TTL 内でも条件付き GET で再検証する
         
         Returns:
             映画詳細情報
         """
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(movie_url, headers=headers, timeout=10)
-            response.encoding = 'utf-8'
-            
-            if response.status_code != 200:
-                return None
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # タイトル
-            title_elem = soup.find('h1')
-            title = title_elem.get_text(strip=True) if title_elem else None
-            
-            # 公開年・ジャンル
-            year = None
-            genre = None
-            info_text = soup.find('p', class_='c-movie-info__text')
-            if info_text:
-                parts = info_text.get_text(strip=True).split('/')
-                if len(parts) >= 1:
-                    try:
-                        year = int(parts[0].strip())
-                    except:
-                        pass
-                if len(parts) >= 2:
-                    genre = parts[1].strip()
-            
-            # あらすじ
-            synopsis = None
-            synopsis_elem = soup.find('p', class_='c-movie-synopsis')
-            if synopsis_elem:
-                synopsis = synopsis_elem.get_text(strip=True)
-            
-            # 監督
-            director = None
-            director_elems = soup.find_all('a', class_='c-staff-link')
-            if director_elems:
-                director = director_elems[0].get_text(strip=True)
-            
-            # キャスト取得
-            cast = []
-            cast_elems = soup.find_all('a', class_='c-cast-link')
-            for elem in cast_elems[:5]:  # 最初の5人
-                cast.append(elem.get_text(strip=True))
-            
-            # 画像
-            image_url = None
-            img_elem = soup.find('img', class_='c-movie-poster')
-            if img_elem:
-                image_url = img_elem.get('src')
-            
-            return {
-                'title': title,
-                'released_year': year,
-                'genre': genre,
-                'director': director,
-                'cast': cast,
-                'synopsis': synopsis,
-                'image_url': image_url,
-                'external_id': movie_url.split('/')[-2] if (movie_url and isinstance(movie_url, str) and '/' in movie_url) else None
-            }
-        
-        except Exception as e:
-            print(f"詳細取得エラー: {e}")
-            return None
-    
-    
+        return self.detail_client.get_movie_details(movie_url, revalidate=revalidate)
+
     def close(self):
         """ドライバをクローズ"""
-        if self.driver:
+        if self.__dict__.get("_waits") is not None:
+            lines = self._waits.metrics.summary_lines(limit=5)
+            if lines:
+                print("[DEBUG] 待機時間（上位）: " + " / ".join(lines))
+        if getattr(self, "list_http_client", None):
+            self.list_http_client.close()
+            self.list_http_client = None
+        driver = self.__dict__.get("_driver")
+        if driver and getattr(self, "owns_driver", True):
             try:
-                self.driver.quit()
+                driver.quit()
                 print("[DEBUG] ドライバを閉じました")
             except:
                 pass
@@ -1749,65 +1868,13 @@ class MovieComScraper:
         if not self.driver:
             return []
         
-        results: List[Dict] = []
         try:
             q = urllib.parse.quote_plus(query)
             search_url = f"{self.BASE_URL}/search/?q={q}"
             print(f"[DEBUG] 検索 URL: {search_url}")
-            self.driver.get(search_url)
-            time.sleep(2)
-            
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # 映画へのリンクを抽出
-            anchors = soup.find_all('a', href=re.compile(r'/movie/\d+'))
-            print(f"[DEBUG] 検索結果: {len(anchors)} 件")
-            
-            seen = set()
-            for a in anchors:
-                if len(results) >= max_results:
-                    break
-                
-                href = a.get('href')
-                if not href:
-                    continue
-                
-                movie_url = urllib.parse.urljoin(self.BASE_URL, href)
-                if movie_url in seen:
-                    continue
-                seen.add(movie_url)
-                
-                title = a.get_text(strip=True)
-                if not title:
-                    title = a.get('title', '')
-                
-                if not title:
-                    continue
-                
-                # 画像
-                img = None
-                img_tag = a.find('img')
-                if img_tag:
-                    img = img_tag.get('src') or img_tag.get('data-src')
-                
-                # external_id を安全に抽出
-                external_id = None
-                if '/' in href:
-                    parts = href.split('/')
-                    for i, part in enumerate(parts):
-                        if part == 'movie' and i + 1 < len(parts):
-                            external_id = parts[i + 1]
-                            break
-                
-                results.append({
-                    'title': title,
-                    'released_year': None,
-                    'genre': None,
-                    'image_url': img,
-                    'movie_url': movie_url,
-                    'external_id': external_id
-                })
+            self._load_page(search_url, "search.page")
             
+            results = EigaSearchClient.parse_search_results(self.driver.page_source, max_results)
             print(f"[DEBUG] {len(results)} 件の検索結果を返却")
             return results
         
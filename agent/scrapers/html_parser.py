@@ -0,0 +1,52 @@
+"""
+HTML パーサーバックエンドの選択（lxml 高速パス + html.parser フォールバック）
+"""
+import os
+from functools import lru_cache
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# 優先順位（先頭から利用可能なものを採用）
+PARSER_BACKENDS = ("lxml", "html.parser")
+
+
+def is_backend_available(backend: str) -> bool:
+    if backend == "lxml":
+        return LXML_AVAILABLE
+    return backend == "html.parser"
+
+
+def resolve_parser_backend(backend: Optional[str] = None) -> str:
+    """
+    使用する BeautifulSoup ツリービルダー名を返す。
+
+    明示指定 → 環境変数 EIGA_HTML_PARSER（lxml / html.parser / auto）→ 自動選択の順。
+    指定されたバックエンドが未導入の場合は html.parser へフォールバックする。
+    """
+    requested = (backend or os.getenv("EIGA_HTML_PARSER") or "auto").strip().lower()
+    return _resolve_requested_backend(requested)
+
+
+@lru_cache(maxsize=None)
+def _resolve_requested_backend(requested: str) -> str:
+    if requested != "auto":
+        if is_backend_available(requested):
+            return requested
+        print(f"[WARN] HTMLパーサー '{requested}' は利用できないため html.parser を使用します")
+        return "html.parser"
+    for candidate in PARSER_BACKENDS:
+        if is_backend_available(candidate):
+            return candidate
+    return "html.parser"
+
+
+def parse_html(markup, backend: Optional[str] = None, parse_only=None) -> BeautifulSoup:
+    """HTML を BeautifulSoup ツリーへ変換する（抽出側は従来通り soup API を使う）。"""
+    return BeautifulSoup(markup or "", resolve_parser_backend(backend), parse_only=parse_only)
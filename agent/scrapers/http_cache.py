@@ -0,0 +1,200 @@
+"""
+HTTP レスポンスのディスクキャッシュ（TTL / LRU 容量上限 / ETag・Last-Modified 再検証）
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class HttpResponseCache:
+    """
+    URL の SHA-256 をキーに、本文（.body）とメタ情報（.json）をディスクへ保存する。
+
+    - TTL 内のエントリはネットワークなしで返す
+    - TTL 切れは ETag / Last-Modified を付けた条件付き GET で再検証し、304 なら本文を再利用
+    - 合計サイズが max_bytes を超えたら最終アクセスが古い順に削除（LRU）
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = 86400, max_bytes: int = 200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = max(0.0, float(ttl))
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "revalidated": 0, "misses": 0, "stores": 0, "evictions": 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._total_bytes = self._scan_total_bytes()
+
+    # --- パス/キー -------------------------------------------------------
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def _scan_total_bytes(self) -> int:
+        total = 0
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".body"):
+                    try:
+                        total += os.path.getsize(os.path.join(root, name))
+                    except OSError:
+                        continue
+        return total
+
+    # --- 参照 -------------------------------------------------------------
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """保存済みエントリ（meta + body）を返す。壊れている場合は None。"""
+        meta_path, body_path = self._paths(self.key_for(url))
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        meta["body"] = body
+        return meta
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return (time.time() - float(entry.get("stored_at", 0))) < self.ttl
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if not entry:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def to_response(self, entry: Dict) -> requests.Response:
+        """キャッシュエントリを requests.Response として復元する。"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response._content = entry["body"]
+        response.headers = CaseInsensitiveDict(entry.get("headers") or {})
+        response.encoding = entry.get("encoding")
+        response.from_cache = True
+        return response
+
+    # --- 更新 -------------------------------------------------------------
+
+    def record_hit(self, entry: Dict) -> None:
+        self._touch(entry["url"])
+        with self._lock:
+            self._stats["hits"] += 1
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self._stats["misses"] += 1
+
+    def mark_revalidated(self, entry: Dict, response: requests.Response) -> None:
+        """304 応答を受けてエントリの鮮度（と新しい検証子）を更新する。"""
+        meta = {k: v for k, v in entry.items() if k != "body"}
+        meta["stored_at"] = time.time()
+        if response.headers.get("ETag"):
+            meta["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            meta["last_modified"] = response.headers["Last-Modified"]
+        meta_path, _ = self._paths(self.key_for(entry["url"]))
+        self._write_meta(meta_path, meta)
+        self._touch(entry["url"])
+        with self._lock:
+            self._stats["revalidated"] += 1
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """200 応答を保存する（Cache-Control: no-store は保存しない）。"""
+        if "no-store" in (response.headers.get("Cache-Control") or "").lower():
+            return
+        body = response.content or b""
+        if self.max_bytes and len(body) > self.max_bytes:
+            return
+        key = self.key_for(url)
+        meta_path, body_path = self._paths(key)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        meta = {
+            "url": url,
+            "stored_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "encoding": response.encoding,
+            "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+        }
+        with self._lock:
+            try:
+                previous = os.path.getsize(body_path)
+            except OSError:
+                previous = 0
+            tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, body_path)
+            self._write_meta(meta_path, meta)
+            self._total_bytes += len(body) - previous
+            self._stats["stores"] += 1
+            self._evict_if_needed()
+
+    def _write_meta(self, meta_path: str, meta: Dict) -> None:
+        tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    def _touch(self, url: str) -> None:
+        """LRU 用に最終アクセス時刻（body の mtime）を更新する。"""
+        _, body_path = self._paths(self.key_for(url))
+        try:
+            os.utime(body_path, None)
+        except OSError:
+            pass
+
+    def _evict_if_needed(self) -> None:
+        # 呼び出し側で self._lock を保持していること
+        if not self.max_bytes or self._total_bytes <= self.max_bytes:
+            return
+        bodies = []
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".body"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                bodies.append((stat.st_mtime, stat.st_size, path))
+        bodies.sort()
+        for _mtime, size, body_path in bodies:
+            if self._total_bytes <= self.max_bytes:
+                break
+            meta_path = body_path[:-len(".body")] + ".json"
+            for path in (body_path, meta_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes -= size
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["bytes"] = self._total_bytes
+        stats["ttl_seconds"] = self.ttl
+        stats["max_bytes"] = self.max_bytes
+        return stats
@@ -0,0 +1,216 @@
+"""
+映画.com 向け HTTP クライアント（keep-alive / コネクションプール / リトライ）
+"""
+import os
+import threading
+from typing import Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from agent.scrapers.http_cache import HttpResponseCache
+
+try:
+    # urllib3 は brotli / brotlicffi が入っていれば br を自動展開する
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        _ACCEPT_ENCODING = "gzip, deflate"
+
+
+def env_number(name: str, default, cast):
+    """環境変数を数値として読み取る（未設定・不正値は既定値）。"""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        print(f"[WARN] {name} の値が不正なため既定値を使用します: {value}")
+        return default
+
+
+class EigaHttpClient:
+    """
+    requests.Session を共有する HTTP クライアント。
+
+    - 同一ホストへの接続を keep-alive で再利用（プールサイズは設定可能）
+    - 429/5xx は指数バックオフで再試行（Retry-After を尊重）
+    - gzip/deflate（brotli 導入時は br も）を要求して転送量を削減
+    - base_url を指定すると https://eiga.com 宛てURLをその宛先へ差し替える（テスト用スタブ向け）
+    - cache を指定すると get(..., use_cache=True) でディスクキャッシュ + 条件付き GET を使う
+    """
+
+    ORIGIN = "https://eiga.com"
+    DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    DEFAULT_TIMEOUT = 10
+    DEFAULT_POOL_SIZE = 8
+    DEFAULT_MAX_RETRIES = 3
+    DEFAULT_BACKOFF_FACTOR = 0.5
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        timeout: Optional[float] = None,
+        base_url: Optional[str] = None,
+        cache: Optional[HttpResponseCache] = None,
+    ):
+        if pool_size is None:
+            pool_size = env_number("EIGA_HTTP_POOL_SIZE", self.DEFAULT_POOL_SIZE, int)
+        if max_retries is None:
+            max_retries = env_number("EIGA_HTTP_MAX_RETRIES", self.DEFAULT_MAX_RETRIES, int)
+        if backoff_factor is None:
+            backoff_factor = env_number("EIGA_HTTP_BACKOFF", self.DEFAULT_BACKOFF_FACTOR, float)
+
+        self.timeout = timeout if timeout is not None else self.DEFAULT_TIMEOUT
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.cache = cache
+
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=max(1, pool_size),
+            pool_maxsize=max(1, pool_size),
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": self.DEFAULT_USER_AGENT,
+            "Accept-Encoding": _ACCEPT_ENCODING,
+            "Accept-Language": "ja,en;q=0.8",
+        })
+
+    def resolve_url(self, url: str) -> str:
+        if self.base_url and url.startswith(self.ORIGIN):
+            return self.base_url + url[len(self.ORIGIN):]
+        return url
+
+    def get(self, url: str, use_cache: bool = False, revalidate: bool = False, **kwargs) -> requests.Response:
+        """
+        GET リクエストを送る。
+
+        use_cache=True の場合、TTL 内のキャッシュはネットワークなしで返し、
+        TTL 切れ（または revalidate=True）は条件付き GET で再検証する。
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if not (use_cache and self.cache):
+            return self.session.get(self.resolve_url(url), **kwargs)
+
+        entry = self.cache.lookup(url)
+        if entry and not revalidate and self.cache.is_fresh(entry):
+            self.cache.record_hit(entry)
+            return self.cache.to_response(entry)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(self.cache.conditional_headers(entry))
+        response = self.session.get(self.resolve_url(url), headers=headers, **kwargs)
+        if response.status_code == 304 and entry:
+            self.cache.mark_revalidated(entry, response)
+            return self.cache.to_response(entry)
+
+        self.cache.record_miss()
+        if response.status_code == 200:
+            self.cache.store(url, response)
+        return response
+
+    def import_cookies(self, cookies: Iterable[Dict]) -> int:
+        """
+        WebDriver の get_cookies() 形式（name/value/domain/path）の Cookie をセッションへ取り込む。
+
+        Returns:
+            取り込んだ件数
+        """
+        imported = 0
+        for cookie in cookies or []:
+            name = cookie.get("name")
+            if not name:
+                continue
+            self.session.cookies.set(
+                name,
+                cookie.get("value", ""),
+                domain=cookie.get("domain") or "",
+                path=cookie.get("path") or "/",
+                secure=bool(cookie.get("secure")),
+            )
+            imported += 1
+        return imported
+
+    def cache_stats(self) -> Dict:
+        if not self.cache:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
+
+    def close(self) -> None:
+        try:
+            self.session.close()
+        except Exception:
+            pass
+
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "backend", "instance", "http_cache",
+)
+
+
+_default_client: Optional[EigaHttpClient] = None
+_default_client_lock = threading.Lock()
+
+
+def build_default_cache() -> Optional[HttpResponseCache]:
+    """
+    環境変数から詳細ページ用ディスクキャッシュを構築する。
+
+    - EIGA_HTTP_CACHE: 0/false/off で無効化
+    - EIGA_HTTP_CACHE_DIR: 保存先（既定: backend/instance/http_cache）
+    - EIGA_HTTP_CACHE_TTL: 秒（既定: 86400）
+    - EIGA_HTTP_CACHE_MAX_MB: 容量上限 MB（既定: 200）
+    """
+    if (os.getenv("EIGA_HTTP_CACHE") or "").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    cache_dir = os.getenv("EIGA_HTTP_CACHE_DIR") or DEFAULT_CACHE_DIR
+    ttl = env_number("EIGA_HTTP_CACHE_TTL", 86400, float)
+    max_mb = env_number("EIGA_HTTP_CACHE_MAX_MB", 200, float)
+    try:
+        return HttpResponseCache(cache_dir, ttl=ttl, max_bytes=int(max_mb * 1024 * 1024))
+    except OSError as e:
+        print(f"[WARN] HTTPキャッシュを初期化できないため無効化します: {e}")
+        return None
+
+
+def get_default_http_client() -> EigaHttpClient:
+    """プロセス共通の HTTP クライアントを返す（初回呼び出し時に生成）。"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = EigaHttpClient(cache=build_default_cache())
+        return _default_client
+
+
+def set_default_http_client(client: Optional[EigaHttpClient]) -> None:
+    """プロセス共通の HTTP クライアントを差し替える（None で次回再生成）。"""
+    global _default_client
+    with _default_client_lock:
+        previous = _default_client
+        _default_client = client
+    if previous is not None and previous is not client:
+        previous.close()
@@ -0,0 +1,255 @@
+"""
+映画.com 検索クライアント（HTTP 優先・ブラウザフォールバック・結果の LRU+TTL キャッシュ）
+"""
+import os
+import re
+import threading
+import time
+import unicodedata
+import urllib.parse
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from agent.scrapers.html_parser import parse_html
+from agent.scrapers.http_client import EigaHttpClient, env_number, get_default_http_client
+
+
+def normalize_search_query(query: str) -> str:
+    """全角/半角（NFKC）と連続空白を揃えた、映画.com へ送る検索語を返す。"""
+    text = unicodedata.normalize("NFKC", query or "")
+    return " ".join(text.split())
+
+
+def search_cache_key(query: str) -> str:
+    """キャッシュキー（正規化した検索語を大文字小文字無視で比較する）。"""
+    return normalize_search_query(query).casefold()
+
+
+class SearchResultCache:
+    """
+    検索結果のメモリキャッシュ。
+
+    - キーは正規化済み検索語
+    - TTL を過ぎたエントリは参照時に破棄
+    - 件数が max_entries を超えたら最終参照が古い順に削除（LRU）
+    """
+
+    DEFAULT_TTL = 600  # 秒
+    DEFAULT_MAX_ENTRIES = 256
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        if ttl is None:
+            ttl = env_number("EIGA_SEARCH_CACHE_TTL", self.DEFAULT_TTL, float)
+        if max_entries is None:
+            max_entries = env_number("EIGA_SEARCH_CACHE_SIZE", self.DEFAULT_MAX_ENTRIES, int)
+        self.ttl = max(0.0, float(ttl))
+        self.max_entries = max(0, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            stored_at, results = entry
+            if (time.monotonic() - stored_at) >= self.ttl:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return [dict(item) for item in results]
+
+    def put(self, key: str, results: List[Dict]) -> None:
+        if not self.max_entries or not self.ttl:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), [dict(item) for item in results])
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        stats["ttl_seconds"] = self.ttl
+        stats["max_entries"] = self.max_entries
+        return stats
+
+
+def _search_with_browser(query: str, max_results: int) -> Optional[List[Dict]]:
+    from agent.scrapers.eiga_scraper import MovieComScraper
+
+    with MovieComScraper.borrowed() as scraper:
+        if not scraper.driver:
+            return None
+        return scraper.search(query, max_results=max_results)
+
+
+class EigaSearchClient:
+    """
+    映画.com の検索ページ（/search/?q=）を共有 HTTP クライアントで取得・解析する。
+
+    HTTP 取得に失敗した場合や検索結果の領域（RESULTS_CONTAINER_ID）がないページの場合のみ
+    ブラウザ（ドライバプール）で再検索する（`EIGA_SEARCH_BROWSER_FALLBACK=0` で無効化）。
+    正常なページで0件だった場合はそのまま空の結果とする。結果は正規化済み検索語ごとにキャッシュする。
+    """
+
+    BASE_URL = "https://eiga.com"
+    DEFAULT_MAX_RESULTS = 30
+    RESULTS_CONTAINER_ID = "contents"  # 検索結果ページ本体（0件でも存在する）
+
+    def __init__(
+        self,
+        http_client: Optional[EigaHttpClient] = None,
+        cache: Optional[SearchResultCache] = None,
+        browser_search: Optional[Callable[[str, int], Optional[List[Dict]]]] = None,
+        browser_fallback: Optional[bool] = None,
+    ):
+        if browser_fallback is None:
+            browser_fallback = (os.getenv("EIGA_SEARCH_BROWSER_FALLBACK") or "1").strip().lower() not in {"0", "false", "no", "off"}
+        self.http_client = http_client or get_default_http_client()
+        self.cache = cache if cache is not None else SearchResultCache()
+        self.browser_search = browser_search or _search_with_browser
+        self.browser_fallback = browser_fallback
+
+    def search(self, query: str, max_results: int = DEFAULT_MAX_RESULTS) -> List[Dict]:
+        """
+        映画を検索
+
+        Args:
+            query: 検索キーワード
+            max_results: 最大結果数（キャッシュは DEFAULT_MAX_RESULTS 件単位で保持）
+
+        Returns:
+            検索結果リスト
+        """
+        normalized = normalize_search_query(query)
+        if not normalized:
+            return []
+        key = search_cache_key(normalized)
+        limit = max(max_results, self.DEFAULT_MAX_RESULTS)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached[:max_results]
+
+        results = self._search_via_http(normalized, limit)
+        if results is None and self.browser_fallback:
+            print(f"[DEBUG] HTTP検索で結果ページを取得できないためブラウザで再検索します: {normalized}")
+            try:
+                browser_results = self.browser_search(normalized, limit)
+            except Exception as e:
+                print(f"[WARN] ブラウザ検索に失敗: {e}")
+                browser_results = None
+            if browser_results is not None:
+                results = browser_results
+
+        if results is None:
+            return []
+        self.cache.put(key, results)
+        return results[:max_results]
+
+    def _search_via_http(self, query: str, max_results: int) -> Optional[List[Dict]]:
+        """HTTP で検索ページを取得して解析する（通信失敗・200以外・結果領域のないページは None）。"""
+        search_url = f"{self.BASE_URL}/search/?q={urllib.parse.quote_plus(query)}"
+        try:
+            response = self.http_client.get(search_url)
+        except Exception as e:
+            print(f"[WARN] HTTP検索エラー: {e}")
+            return None
+        if response.status_code != 200:
+            print(f"[WARN] HTTP検索が失敗しました: status={response.status_code}")
+            return None
+        response.encoding = 'utf-8'
+        soup = parse_html(response.content)
+        if soup.find(id=self.RESULTS_CONTAINER_ID) is None:
+            # ログイン・アクセス制限ページや DOM 変更など、検索結果ページとして解析できない
+            print(f"[WARN] HTTP検索の応答に検索結果の領域がありません: {query}")
+            return None
+        return self._extract_results(soup, max_results)
+
+    @classmethod
+    def parse_search_results(
+        cls, markup, max_results: int = DEFAULT_MAX_RESULTS, backend: Optional[str] = None
+    ) -> List[Dict]:
+        """検索結果ページHTMLから映画リンクを抽出する（ドライバ不要）。backend は parse_html に渡す解析バックエンド。"""
+        return cls._extract_results(parse_html(markup, backend=backend), max_results)
+
+    @classmethod
+    def _extract_results(cls, soup, max_results: int) -> List[Dict]:
+        results: List[Dict] = []
+
+        # 映画へのリンクを抽出
+        anchors = soup.find_all('a', href=re.compile(r'/movie/\d+'))
+        print(f"[DEBUG] 検索結果: {len(anchors)} 件")
+
+        seen = set()
+        for a in anchors:
+            if len(results) >= max_results:
+                break
+
+            href = a.get('href')
+            if not href:
+                continue
+
+            movie_url = urllib.parse.urljoin(cls.BASE_URL, href)
+            if movie_url in seen:
+                continue
+            seen.add(movie_url)
+
+            title = a.get_text(strip=True)
+            if not title:
+                title = a.get('title', '')
+
+            if not title:
+                continue
+
+            # 画像
+            img = None
+            img_tag = a.find('img')
+            if img_tag:
+                img = img_tag.get('src') or img_tag.get('data-src')
+
+            # external_id を安全に抽出
+            external_id = None
+            if '/' in href:
+                parts = href.split('/')
+                for i, part in enumerate(parts):
+                    if part == 'movie' and i + 1 < len(parts):
+                        external_id = parts[i + 1]
+                        break
+
+            results.append({
+                'title': title,
+                'released_year': None,
+                'genre': None,
+                'image_url': img,
+                'movie_url': movie_url,
+                'external_id': external_id
+            })
+        return results
+
+
+_default_search_client: Optional[EigaSearchClient] = None
+_default_search_client_lock = threading.Lock()
+
+
+def get_default_search_client() -> EigaSearchClient:
+    """プロセス共通の検索クライアントを返す（初回呼び出し時に生成）。"""
+    global _default_search_client
+    with _default_search_client_lock:
+        if _default_search_client is None:
+            _default_search_client = EigaSearchClient()
+        return _default_search_client
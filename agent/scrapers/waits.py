@@ -0,0 +1,134 @@
+"""
+ブラウザ待機ユーティリティ（条件待機 + 手順別の待機時間計測）
+
+固定 sleep の代わりに document.readyState / URL 変化 / 任意条件を
+WebDriverWait で短い間隔ポーリングし、条件成立と同時に次の処理へ進む。
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from agent.scrapers.http_client import env_number
+
+
+class WaitMetrics:
+    """待機手順（step）ごとの回数・合計/最大時間・タイムアウト数を集計する。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._steps: Dict[str, Dict] = {}
+
+    def record(self, step: str, elapsed: float, satisfied: bool = True) -> None:
+        with self._lock:
+            stats = self._steps.setdefault(
+                step, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "timeouts": 0}
+            )
+            stats["count"] += 1
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            if not satisfied:
+                stats["timeouts"] += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            result = {}
+            for step, stats in self._steps.items():
+                item = dict(stats)
+                item["total_seconds"] = round(item["total_seconds"], 3)
+                item["max_seconds"] = round(item["max_seconds"], 3)
+                item["avg_seconds"] = round(stats["total_seconds"] / stats["count"], 3) if stats["count"] else 0.0
+                result[step] = item
+            return result
+
+    def summary_lines(self, limit: int = 10) -> List[str]:
+        """合計待機時間の長い順に整形した行を返す（ログ出力用）。"""
+        items = sorted(self.snapshot().items(), key=lambda kv: kv[1]["total_seconds"], reverse=True)
+        return [
+            f"{step}: {s['count']}回 合計{s['total_seconds']:.2f}s 最大{s['max_seconds']:.2f}s タイムアウト{s['timeouts']}回"
+            for step, s in items[:limit]
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._steps.clear()
+
+
+_default_metrics = WaitMetrics()
+
+
+def get_wait_metrics() -> WaitMetrics:
+    """プロセス共通の待機計測を返す。"""
+    return _default_metrics
+
+
+class BrowserWaits:
+    """
+    WebDriver に対する条件待機。
+
+    - until(): 任意条件が truthy を返すまで待ち、その値を返す（タイムアウト時は None）
+    - document_ready() / url_changed() / url_matches(): よく使う条件のショートカット
+    - settle(): 条件で表せない場合の最終手段としての固定待機（計測対象）
+    """
+
+    DEFAULT_POLL_SECONDS = 0.1
+
+    def __init__(self, driver, metrics: Optional[WaitMetrics] = None, poll_frequency: Optional[float] = None):
+        if poll_frequency is None:
+            poll_frequency = env_number("EIGA_WAIT_POLL_SECONDS", self.DEFAULT_POLL_SECONDS, float)
+        self.driver = driver
+        self.metrics = metrics or get_wait_metrics()
+        self.poll_frequency = max(0.01, float(poll_frequency))
+
+    def until(self, step: str, condition: Callable, timeout: float):
+        started = time.monotonic()
+        try:
+            result = WebDriverWait(
+                self.driver,
+                timeout,
+                poll_frequency=self.poll_frequency,
+                ignored_exceptions=(WebDriverException,),
+            ).until(condition)
+        except TimeoutException:
+            result = None
+        self.metrics.record(step, time.monotonic() - started, satisfied=bool(result))
+        return result
+
+    def document_ready(self, step: str, timeout: float = 10):
+        return self.until(
+            step,
+            lambda d: d.execute_script("return document.readyState") == "complete",
+            timeout,
+        )
+
+    def url_changed(self, step: str, previous_url: str, timeout: float = 10):
+        """現在URLが previous_url から変わるまで待ち、新しいURLを返す。"""
+        return self.until(
+            step,
+            lambda d: d.current_url if d.current_url != previous_url else None,
+            timeout,
+        )
+
+    def url_matches(self, step: str, predicate: Callable[[str], bool], timeout: float = 10):
+        """現在URLが predicate を満たすまで待ち、そのURLを返す。"""
+        return self.until(
+            step,
+            lambda d: d.current_url if predicate(d.current_url or "") else None,
+            timeout,
+        )
+
+    def settle(self, step: str, seconds: float) -> None:
+        """条件で判定できない箇所のみで使う固定待機。"""
+        with self.timed(step):
+            time.sleep(seconds)
+
+    @contextmanager
+    def timed(self, step: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.metrics.record(step, time.monotonic() - started)
@@ -0,0 +1,227 @@
+"""
+映画詳細の後追い取得（enrichment ワーカー）
+
+同期は一覧ページの情報（タイトル・external_id・画像など）だけで映画を登録し、詳細ページの取得は
+このワーカーが API プロセスの裏で行う。詳細取得の失敗で genre/cast/synopsis が空のまま残った映画も対象になる。
+
+- 対象: external_id があり、ENRICH_FIELDS のいずれかが空で、未完了の映画（登録が古い順）
+- EIGA_ENRICH_BATCH 件（既定20）ずつ DetailFetcher で取得し、バッチ間は EIGA_ENRICH_INTERVAL 秒（既定30）待つ
+- 反映は空値のみ（詳細再取得の force_update=False と同じ規則）。試行回数は movie_enrichment に記録する
+- 失敗時は EIGA_ENRICH_RETRY_BASE 秒（既定300）から倍々に再試行を延ばし、
+  EIGA_ENRICH_MAX_ATTEMPTS 回（既定5）で打ち切る
+"""
+try:
+    # backend/ 配下から起動する通常実行系
+    from app.models.models import Movie, MovieEnrichment
+    from app.utils.movie_details import apply_movie_details, build_movie_url, missing_field_condition
+except ModuleNotFoundError:
+    # ルート実行（テスト等）向けフォールバック
+    from backend.app.models.models import Movie, MovieEnrichment
+    from backend.app.utils.movie_details import apply_movie_details, build_movie_url, missing_field_condition
+from agent.scrapers.detail_fetcher import DetailFetcher
+from agent.scrapers.http_client import env_number
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+import os
+import threading
+
+from sqlalchemy import and_, or_
+
+# この項目のいずれかが空なら詳細未取得とみなす
+ENRICH_FIELDS = ("genre", "cast", "synopsis")
+
+
+def enrichment_enabled() -> bool:
+    """EIGA_ENRICH_ENABLED（既定: 有効）。0/false/no/off で無効。"""
+    value = os.getenv("EIGA_ENRICH_ENABLED")
+    return not (value and value.strip().lower() in {"0", "false", "no", "off"})
+
+
+class MovieEnrichmentWorker:
+    """
+    詳細が欠けた映画を一定間隔で少しずつ補完するバックグラウンドワーカー。
+
+    fetch_details には `EigaDetailClient.get_movie_details` 相当（URL -> 詳細dict）を渡す。
+    DB への反映はワーカースレッドの Session で行い、バッチごとに commit する。
+    """
+
+    DEFAULT_BATCH_SIZE = 20
+    DEFAULT_INTERVAL = 30.0  # 秒（バッチ間の待ち）
+    DEFAULT_MAX_ATTEMPTS = 5
+    DEFAULT_RETRY_BASE = 300.0  # 秒（1回目の失敗後の再試行待ち。以後は倍）
+    MAX_RETRY_DELAY = 86400.0
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        fetch_details: Optional[Callable[[str], Optional[Dict]]] = None,
+        batch_size: Optional[int] = None,
+        interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        fetcher: Optional[DetailFetcher] = None,
+    ):
+        if session_factory is None:
+            try:
+                from app.db.database import SessionLocal
+            except ModuleNotFoundError:
+                from backend.app.db.database import SessionLocal
+            session_factory = SessionLocal
+        if fetcher is None and fetch_details is None:
+            from agent.scrapers.detail_client import EigaDetailClient
+            fetch_details = EigaDetailClient().get_movie_details
+        if batch_size is None:
+            batch_size = env_number("EIGA_ENRICH_BATCH", self.DEFAULT_BATCH_SIZE, int)
+        if interval is None:
+            interval = env_number("EIGA_ENRICH_INTERVAL", self.DEFAULT_INTERVAL, float)
+        if max_attempts is None:
+            max_attempts = env_number("EIGA_ENRICH_MAX_ATTEMPTS", self.DEFAULT_MAX_ATTEMPTS, int)
+        if retry_base is None:
+            retry_base = env_number("EIGA_ENRICH_RETRY_BASE", self.DEFAULT_RETRY_BASE, float)
+        self.session_factory = session_factory
+        self.batch_size = max(1, int(batch_size))
+        self.interval = max(0.0, float(interval))
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_base = max(0.0, float(retry_base))
+        # 同時数・ホスト単位の間隔は DetailFetcher（EIGA_DETAIL_WORKERS / EIGA_DETAIL_MIN_INTERVAL）に従う
+        self.fetcher = fetcher or DetailFetcher(fetch_details)
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- 1バッチ分の処理 ----
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        seconds = min(self.MAX_RETRY_DELAY, self.retry_base * (2 ** max(0, attempts - 1)))
+        return timedelta(seconds=seconds)
+
+    def select_candidates(self, db, now: datetime) -> List[Tuple[Movie, Optional[MovieEnrichment]]]:
+        """補完対象の映画（登録が古い順）と試行状況を返す。"""
+        return (
+            db.query(Movie, MovieEnrichment)
+            .outerjoin(MovieEnrichment, MovieEnrichment.movie_id == Movie.id)
+            .filter(
+                Movie.external_id.isnot(None),
+                or_(*(missing_field_condition(name) for name in ENRICH_FIELDS)),
+                or_(
+                    MovieEnrichment.movie_id.is_(None),
+                    and_(
+                        MovieEnrichment.completed_at.is_(None),
+                        MovieEnrichment.attempts < self.max_attempts,
+                        or_(MovieEnrichment.next_attempt_at.is_(None), MovieEnrichment.next_attempt_at <= now),
+                    ),
+                ),
+            )
+            .order_by(Movie.created_at, Movie.id)
+            .limit(self.batch_size)
+            .all()
+        )
+
+    def run_once(self) -> Dict[str, int]:
+        """
+        1バッチ分を補完する。
+
+        Returns:
+            {"picked": 対象件数, "enriched": 反映件数, "failed": 取得失敗件数}
+        """
+        counts = {"picked": 0, "enriched": 0, "failed": 0}
+        db = self.session_factory()
+        try:
+            now = datetime.utcnow()
+            targets: Dict[str, List[Tuple[Movie, MovieEnrichment]]] = {}
+            for movie, state in self.select_candidates(db, now):
+                if state is None:
+                    state = MovieEnrichment(movie_id=movie.id, attempts=0)
+                    db.add(state)
+                targets.setdefault(build_movie_url(movie), []).append((movie, state))
+                counts["picked"] += 1
+            if not targets:
+                return counts
+
+            # 取得は並列、DB への反映はこのスレッドで完了順に行う
+            for movie_url, details, fetch_error in self.fetcher.iter_details(targets.keys()):
+                for movie, state in targets[movie_url]:
+                    state.attempts = (state.attempts or 0) + 1
+                    state.last_attempt_at = datetime.utcnow()
+                    if details:
+                        updated_fields = apply_movie_details(movie, details, force=False)
+                        state.completed_at = state.last_attempt_at
+                        state.next_attempt_at = None
+                        state.last_error = None
+                        counts["enriched"] += 1
+                        if updated_fields:
+                            print(f"[ENRICH] ✓ {movie.title}: {', '.join(updated_fields)}")
+                    else:
+                        state.next_attempt_at = state.last_attempt_at + self.retry_delay(state.attempts)
+                        state.last_error = str(fetch_error) if fetch_error else "詳細情報の取得に失敗しました"
+                        counts["failed"] += 1
+                        print(f"[ENRICH] ⚠ 詳細取得に失敗しました（{state.attempts}回目）: {movie.title}")
+            db.commit()
+            return counts
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # ---- バックグラウンド実行 ----
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="movie-enrichment", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self) -> None:
+        """待機中なら次のバッチをすぐに始める（同期の完了直後など）。"""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                counts = self.run_once()
+                if counts["picked"]:
+                    print(f"[ENRICH] 詳細補完: 対象 {counts['picked']} / 反映 {counts['enriched']} / 失敗 {counts['failed']}")
+            except Exception as e:
+                # 同期の書き込みと重なって busy_timeout を超えた場合なども次の周期で再試行する
+                print(f"[WARN] 詳細補完に失敗しました: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+_default_worker: Optional[MovieEnrichmentWorker] = None
+_default_worker_lock = threading.Lock()
+
+
+def start_default_enrichment_worker() -> Optional[MovieEnrichmentWorker]:
+    """EIGA_ENRICH_ENABLED が有効なら共有ワーカーを起動する。"""
+    global _default_worker
+    if not enrichment_enabled():
+        return None
+    with _default_worker_lock:
+        if _default_worker is None:
+            _default_worker = MovieEnrichmentWorker()
+        _default_worker.start()
+        return _default_worker
+
+
+def wake_default_enrichment_worker() -> None:
+    worker = _default_worker
+    if worker:
+        worker.wake()
+
+
+def stop_default_enrichment_worker() -> None:
+    global _default_worker
+    with _default_worker_lock:
+        worker, _default_worker = _default_worker, None
+    if worker:
+        worker.stop()
@@ -4,22 +4,84 @@
 try:
     # backend/ 配下から起動する通常実行系
     from app.db.database import SessionLocal
-    from app.models.models import Movie, Record, EigaComCredentials
+    from app.models.models import Movie, Record, EigaComCredentials, EigaSyncState
     from app.db.encryption import EncryptionManager
     from app.utils.cast_utils import dump_cast_text
 except ModuleNotFoundError:
     # ルート実行（テスト等）向けフォールバック
     from backend.app.db.database import SessionLocal
-    from backend.app.models.models import Movie, Record, EigaComCredentials
+    from backend.app.models.models import Movie, Record, EigaComCredentials, EigaSyncState
     from backend.app.db.encryption import EncryptionManager
     from backend.app.utils.cast_utils import dump_cast_text
 from agent.scrapers.eiga_scraper import MovieComScraper
-from typing import Dict, Optional
+from agent.scrapers.detail_fetcher import DetailFetcher
+from agent.scrapers.detail_client import EigaDetailClient
+from agent.scrapers.http_client import env_number
+from agent.scrapers.search_client import get_default_search_client
+from agent.tasks.enrichment import enrichment_enabled
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
 import os
+
+
+class SyncCommitBatch:
+    """
+    同期書き込みを一定行数ごとに commit する。
+
+    committed には最後に確定した時点の件数を保持し、
+    中断時に「どこまで保存されたか」を返せるようにする。
+    """
+
+    DEFAULT_SIZE = 200  # EIGA_SYNC_COMMIT_BATCH で上書き可
+
+    def __init__(
+        self,
+        db,
+        counts: Dict[str, int],
+        size: Optional[int] = None,
+        on_row: Optional[Callable[["SyncCommitBatch"], None]] = None,
+    ):
+        if size is None:
+            size = env_number("EIGA_SYNC_COMMIT_BATCH", self.DEFAULT_SIZE, int)
+        self.db = db
+        self.counts = counts
+        self.size = max(1, int(size))
+        self.on_row = on_row
+        self.pending = 0
+        self.rows = 0
+        self.committed = dict(counts)
+
+    def row_done(self) -> None:
+        self.pending += 1
+        self.rows += 1
+        if self.pending >= self.size:
+            self.commit()
+        if self.on_row:
+            self.on_row(self)
+
+    def commit_pending(self) -> None:
+        """未確定の行があれば確定する（ページの区切り・詳細取得の前に呼び、通信中に書き込みロックを持たない）。"""
+        if self.pending:
+            self.commit()
+
+    def commit(self) -> None:
+        self.db.commit()
+        if self.pending:
+            print(f"[SYNC] {self.pending} 行を確定しました（追加 {self.counts['added']} / 既存 {self.counts['existing']}）")
+        self.pending = 0
+        self.committed = dict(self.counts)
+
+
+# 同期ジョブの中止要求によるキャンセル理由（ブラウザを閉じた場合と結果メッセージを分ける）
+JOB_CANCEL_REASON = "同期ジョブの中止が要求されました"
+
+
 class MovieAgent:
     """映画情報取得エージェント"""
 
+    # SQLite のバインド変数上限（旧版は999）を超えないよう IN 句を分割する
+    LOOKUP_CHUNK_SIZE = 500
+
     @staticmethod
     def _parse_env_bool(value: Optional[str]) -> Optional[bool]:
         if value is None:
@@ -115,11 +177,8 @@ class MovieAgent:
             if existing:
                 return existing
 
-            scraper = MovieComScraper()
-            try:
-                details = scraper.get_movie_details(movie_url) if movie_url else None
-            finally:
-                scraper.close()
+            # 詳細は HTTP のみで取得する（ブラウザは起動しない）
+            details = EigaDetailClient().get_movie_details(movie_url) if movie_url else None
 
             if not details:
                 details = movie_data
@@ -214,16 +273,361 @@ class MovieAgent:
             "source": "interactive"
         }
 
+    @staticmethod
+    def _chunked(values, size: int) -> List[list]:
+        items = list(values)
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    @staticmethod
+    def _resolve_existing_entries(db, movies_data: List[Dict]) -> Dict:
+        """
+        同期対象の既存映画・視聴記録を IN 句でまとめて解決する。
+
+        行ごとの SELECT（外部ID → タイトル → 記録）を避け、
+        判定はメモリ上の辞書で行う。
+        """
+        chunk_size = MovieAgent.LOOKUP_CHUNK_SIZE
+        external_ids = {str(m['external_id']) for m in movies_data if m.get('external_id')}
+        titles = {m['title'] for m in movies_data if m.get('title')}
+
+        by_external_id: Dict[str, Movie] = {}
+        for chunk in MovieAgent._chunked(external_ids, chunk_size):
+            for movie in db.query(Movie).filter(Movie.external_id.in_(chunk)).all():
+                by_external_id[movie.external_id] = movie
+
+        by_title: Dict[str, Movie] = {}
+        for chunk in MovieAgent._chunked(titles, chunk_size):
+            movies = db.query(Movie).filter(Movie.title.in_(chunk)).order_by(Movie.id).all()
+            for movie in movies:
+                # 同名が複数ある場合は従来の .first() と同じく最小IDを採用
+                by_title.setdefault(movie.title, movie)
+
+        movie_ids = {m.id for m in by_external_id.values()} | {m.id for m in by_title.values()}
+        record_keys: Set[Tuple[int, datetime]] = set()
+        for chunk in MovieAgent._chunked(movie_ids, chunk_size):
+            rows = db.query(Record.movie_id, Record.viewed_date).filter(Record.movie_id.in_(chunk)).all()
+            record_keys.update((movie_id, viewed_date) for movie_id, viewed_date in rows)
+
+        return {
+            "by_external_id": by_external_id,
+            "by_title": by_title,
+            "record_keys": record_keys,
+        }
+
+    @staticmethod
+    def _begin_row_savepoint(db):
+        """
+        同期1行分の SAVEPOINT を作る。
+
+        pysqlite は SELECT だけでは BEGIN を発行しないため、バッチのトランザクションが未開始なら先に開始する
+        （SAVEPOINT が最外のトランザクションになると RELEASE の時点で確定してしまい、バッチ単位の commit にならない）。
+        BEGIN は DEFERRED のままにし、書き込みロックは最初の書き込みの時点で取る。
+        """
+        dbapi_connection = db.connection().connection.dbapi_connection
+        if db.get_bind().dialect.name == "sqlite" and not dbapi_connection.in_transaction:
+            dbapi_connection.execute("BEGIN")
+        return db.begin_nested()
+
+    @staticmethod
+    def _forget_movie(lookup: Dict, movie: Movie) -> None:
+        """SAVEPOINT の rollback で取り消した映画を解決結果から外す。"""
+        for key, value in (("by_external_id", str(movie.external_id)), ("by_title", movie.title)):
+            if lookup[key].get(value) is movie:
+                del lookup[key][value]
+
+    @staticmethod
+    def _lookup_existing_movie(lookup: Dict, movie_data: Dict) -> Optional[Movie]:
+        external_id = movie_data.get('external_id')
+        movie = None
+        if external_id:
+            movie = lookup["by_external_id"].get(str(external_id))
+        if not movie:
+            movie = lookup["by_title"].get(movie_data.get('title'))
+        return movie
+
+    @staticmethod
+    def _is_known_row(lookup: Dict, movie_data: Dict) -> bool:
+        """映画が登録済みで、その視聴日の記録もある行か（初回の鑑賞・再鑑賞は False）。"""
+        movie = MovieAgent._lookup_existing_movie(lookup, movie_data)
+        return movie is not None and (movie.id, movie_data.get('viewed_date')) in lookup["record_keys"]
+
+    @staticmethod
+    def _remember_movie(lookup: Dict, movie: Movie) -> None:
+        if movie.external_id:
+            lookup["by_external_id"][str(movie.external_id)] = movie
+        if movie.title:
+            lookup["by_title"].setdefault(movie.title, movie)
+
+    @staticmethod
+    def _sync_movie_row(
+        db,
+        movie_data: Dict,
+        lookup: Dict,
+        details: Dict,
+        counts: Dict[str, int],
+        fetch_error: Optional[Exception] = None
+    ) -> None:
+        """
+        同期1行分（映画 + 視聴記録）を書き込む。
+
+        details は新規映画の場合に使う取得済み詳細（取得できなければ空dict）。
+        行ごとに SAVEPOINT を張り、例外時はこの行の書き込み・件数・解決結果だけを取り消して errors を加算する
+        （同じバッチで flush 済みの他の行は残る）。
+        """
+        counts_before = dict(counts)
+        added_movie = None
+        added_record_key = None
+        row_savepoint = MovieAgent._begin_row_savepoint(db)
+        try:
+            if fetch_error:
+                raise fetch_error
+
+            # 外部IDまたはタイトルで既存チェック
+            external_id = movie_data.get('external_id')
+            movie = MovieAgent._lookup_existing_movie(lookup, movie_data)
+
+            if not movie:
+                fallback_released_year = (
+                    movie_data.get('released_year')
+                    or (movie_data.get('release_date').year if movie_data.get('release_date') else None)
+                )
+                fallback_release_date = MovieAgent._extract_release_date(movie_data)
+                fallback_director = movie_data.get('director')
+
+                if details:
+                    movie = Movie(
+                        title=details.get('title', movie_data['title']),
+                        genre=details.get('genre'),
+                        release_date=MovieAgent._extract_release_date(details) or fallback_release_date,
+                        released_year=details.get('released_year') or fallback_released_year,
+                        director=details.get('director') or fallback_director,
+                        cast=dump_cast_text(details.get('cast', [])),
+                        synopsis=details.get('synopsis'),
+                        image_url=details.get('image_url'),
+                        external_id=details.get('external_id') or external_id
+                    )
+                else:
+                    movie = Movie(
+                        title=movie_data['title'],
+                        external_id=external_id,
+                        release_date=fallback_release_date,
+                        released_year=fallback_released_year,
+                        director=fallback_director,
+                        image_url=movie_data.get('image_url')
+                    )
+
+                insert_savepoint = db.begin_nested()
+                try:
+                    db.add(movie)
+                    db.flush()
+                    insert_savepoint.commit()
+                    MovieAgent._remember_movie(lookup, movie)
+                    added_movie = movie
+                    counts["added"] += 1
+                    print(f"[SYNC] ✓ 映画を追加しました: {movie_data['title']} (ID: {external_id})")
+                except Exception as e:
+                    # UNIQUE 制約エラーなど、既に存在する場合（この映画の INSERT だけを取り消す）
+                    insert_savepoint.rollback()
+                    if 'UNIQUE' in str(e) or 'unique' in str(e).lower():
+                        print(f"[SYNC] ⚠ 映画は既に存在します（制約エラー）: {movie_data['title']} (ID: {external_id})")
+                        counts["existing"] += 1
+                        found = MovieAgent._resolve_existing_entries(db, [movie_data])
+                        movie = MovieAgent._lookup_existing_movie(found, movie_data)
+                        if movie:
+                            MovieAgent._remember_movie(lookup, movie)
+                            lookup["record_keys"].update(found["record_keys"])
+                    else:
+                        raise
+            else:
+                if MovieAgent._update_movie_metadata(movie, movie_data):
+                    print(f"[SYNC] ↻ 映画メタ情報を更新しました: {movie_data['title']}")
+                counts["existing"] += 1
+                print(f"[SYNC] ⚠ 映画は既に存在します: {movie_data['title']} (ID: {external_id})")
+
+            # 既に取得済みか確認
+            if movie:
+                record_key = (movie.id, movie_data['viewed_date'])
+                if record_key not in lookup["record_keys"]:
+                    record = Record(
+                        movie_id=movie.id,
+                        viewed_date=movie_data['viewed_date'],
+                        viewing_method=movie_data.get('viewing_method', 'other'),
+                        rating=movie_data.get('rating'),
+                        mood=None,
+                        comment='自動同期'
+                    )
+                    db.add(record)
+                    db.flush()
+                    lookup["record_keys"].add(record_key)
+                    added_record_key = record_key
+                    print(f"[SYNC] ✓ 視聴記録を追加しました: {movie_data['title']}")
+
+            row_savepoint.commit()
+        except Exception as e:
+            print(f"[SYNC] ✗ 映画処理エラー: {e}")
+            row_savepoint.rollback()
+            counts.clear()
+            counts.update(counts_before)
+            counts["errors"] += 1
+            if added_movie is not None:
+                MovieAgent._forget_movie(lookup, added_movie)
+            if added_record_key is not None:
+                lookup["record_keys"].discard(added_record_key)
+
+    @staticmethod
+    def _iter_movie_pages(scraper) -> Iterator[List[Dict]]:
+        """スクレイパーから一覧をページ単位で受け取る（ページ分割非対応なら全件を1ページ扱い）。"""
+        iter_pages = getattr(scraper, "iter_watched_movie_pages", None)
+        if iter_pages is None:
+            yield scraper.fetch_watched_movies()
+            return
+        yield from iter_pages()
+
+    @staticmethod
+    def _with_committed_note(message: str, committed: Dict[str, int]) -> str:
+        if committed["added"] or committed["existing"]:
+            return f"{message}（確定済み: 追加 {committed['added']} 件 / 既存 {committed['existing']} 件）"
+        return message
+
+    @staticmethod
+    def _sync_movie_page(
+        db,
+        scraper,
+        movies_data: List[Dict],
+        counts: Dict[str, int],
+        batch,
+        defer_details: bool = False,
+        check_cancel: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """
+        1ページ分の同期（既存解決 → 既存行の書き込み → 新規映画の詳細並列取得 → 新規行の書き込み）。
+
+        defer_details=True の場合、新規映画も一覧の情報だけで登録し、詳細は enrichment ワーカーに任せる。
+        詳細の取得中は書き込みロックを持たないよう、取得前に未確定の行を確定し、取得し終えてからまとめて書き込む。
+
+        Returns:
+            ページ内の行（映画 + 視聴日）がすべて同期前から記録済みだったか（差分同期の停止判定に使う）
+        """
+        # 既存映画・記録を一括解決（行ごとの SELECT を発行しない）
+        lookup = MovieAgent._resolve_existing_entries(db, movies_data)
+        all_known = all(MovieAgent._is_known_row(lookup, m) for m in movies_data)
+
+        # 既存映画の行は通信不要なので先に処理し、新規映画は詳細URL単位でまとめる
+        pending_by_url: Dict[str, List[Dict]] = {}
+        for movie_data in movies_data:
+            movie_url = movie_data.get('movie_url')
+            if scraper.cancelled:
+                return all_known
+            if movie_url and not defer_details and not MovieAgent._lookup_existing_movie(lookup, movie_data):
+                pending_by_url.setdefault(movie_url, []).append(movie_data)
+            else:
+                MovieAgent._sync_movie_row(db, movie_data, lookup, {}, counts)
+                batch.row_done()
+
+        # 新規映画の詳細ページを並列取得し（完了順に保持）、取得後にDBへ書き込む
+        if pending_by_url:
+            batch.commit_pending()
+            print(f"[SYNC] 新規映画 {len(pending_by_url)} 件の詳細を並列取得します")
+            fetcher = DetailFetcher(scraper.get_movie_details)
+            fetched_details = []
+            for result in fetcher.iter_details(pending_by_url.keys()):
+                if check_cancel:
+                    check_cancel()
+                if scraper.cancelled:
+                    # 未着手の詳細取得は iter_details の終了時に取り消される
+                    return all_known
+                fetched_details.append(result)
+            for movie_url, details, fetch_error in fetched_details:
+                if scraper.cancelled:
+                    break
+                for movie_data in pending_by_url[movie_url]:
+                    MovieAgent._sync_movie_row(db, movie_data, lookup, details or {}, counts, fetch_error)
+                    batch.row_done()
+
+        return all_known
+
+    @staticmethod
+    def _sync_account_key(scraper, login_email: Optional[str]) -> Optional[str]:
+        """差分同期の状態を保存するアカウントキー（映画.com ユーザーID優先）。"""
+        user_id = getattr(scraper, "user_id", None)
+        if user_id:
+            return f"user:{user_id}"
+        if login_email:
+            return f"email:{login_email}"
+        return None
+
+    @staticmethod
+    def _sync_mark(movie_data: Dict) -> Tuple[str, Optional[datetime]]:
+        return str(movie_data['external_id']), movie_data.get('viewed_date')
+
+    @staticmethod
+    def _should_stop_incremental(
+        movies_data: List[Dict], high_water_mark: Optional[Tuple[str, datetime]], all_known: bool
+    ) -> bool:
+        """
+        sort=new の一覧で、前回の最新行（作品ID + 視聴日）に到達したか、記録済みの行のみのページなら True。
+        作品IDだけでは判定しない（基準点の作品の再鑑賞で止まらないようにする）。
+        """
+        if not movies_data:
+            return False
+        if high_water_mark and any(
+            m.get('external_id') and MovieAgent._sync_mark(m) == high_water_mark for m in movies_data
+        ):
+            return True
+        return all_known
+
+    @staticmethod
+    def _save_sync_state(db, account_key: str, newest_mark: Tuple[str, Optional[datetime]], full: bool) -> None:
+        """今回の最新行（作品ID + 視聴日）を次回の差分同期の基準点として保存する。"""
+        state = db.query(EigaSyncState).filter(EigaSyncState.account_key == account_key).first()
+        if not state:
+            state = EigaSyncState(account_key=account_key)
+            db.add(state)
+        now = datetime.utcnow()
+        state.last_seen_external_id, state.last_seen_viewed_date = newest_mark
+        state.last_sync = now
+        if full:
+            state.last_full_sync = now
+
     @staticmethod
     def sync_from_eiga_com_with_options(
         email: Optional[str] = None,
         password: Optional[str] = None,
         save_credentials: bool = False,
-        use_saved_credentials: bool = True
+        use_saved_credentials: bool = True,
+        commit_batch_size: Optional[int] = None,
+        incremental: bool = False,
+        progress: Optional[Callable[[Dict], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        defer_details: Optional[bool] = None
     ) -> Dict:
-        db = SessionLocal()
+        """
+        映画.com から視聴履歴を同期する。
+
+        defer_details: 新規映画の詳細ページを同期中に取得せず、enrichment ワーカーで後から補完する
+            （None の場合は EIGA_SYNC_DEFER_DETAILS。未設定ならワーカーが有効なとき True）
+        progress: ページ受信・行処理ごとに進捗（page/fetched/processed/added/existing/errors）を受け取る
+        should_cancel: True を返すとページ・行の区切りで中止する（確定済みバッチは保持）
+        """
+        # 同期中はバッチ確定後も解決済みオブジェクトを使い回すため、commit 時に失効させない
+        db = SessionLocal(expire_on_commit=False)
         scraper = None
-        cancelled_message = "ログインブラウザが閉じられたため、同期をキャンセルしました"
+        batch = None
+        closed_message = "ログインブラウザが閉じられたため、同期をキャンセルしました"
+
+        def cancelled_message() -> str:
+            if scraper and scraper.cancel_reason == JOB_CANCEL_REASON:
+                return "同期を中止しました"
+            return closed_message
+
+        def check_cancel() -> None:
+            if should_cancel and scraper and not scraper.cancelled and should_cancel():
+                scraper.request_cancel(JOB_CANCEL_REASON)
+
+        if defer_details is None:
+            defer_details = MovieAgent._parse_env_bool(os.getenv("EIGA_SYNC_DEFER_DETAILS"))
+            if defer_details is None:
+                defer_details = enrichment_enabled()
 
         try:
             resolved = MovieAgent._resolve_login_credentials(db, email, password, use_saved_credentials)
@@ -242,6 +646,8 @@ class MovieAgent:
             login_password = resolved.get("password")
             auth_source = resolved.get("source")
             print(f"[SYNC] 同期を開始します。認証ソース: {auth_source}")
+            if defer_details:
+                print("[SYNC] 新規映画の詳細は enrichment ワーカーで後から取得します")
             
             # Windows 実行時は explicit/saved でも表示ブラウザを優先して、headless描画差分を回避
             forced_headless = MovieAgent._parse_env_bool(os.getenv("EIGA_SYNC_HEADLESS"))
@@ -280,7 +686,7 @@ class MovieAgent:
                     return {
                         'success': False,
                         'cancelled': True,
-                        'message': cancelled_message,
+                        'message': cancelled_message(),
                         'added': 0,
                         'existing': 0,
                         'errors': 0,
@@ -299,112 +705,73 @@ class MovieAgent:
                 }
 
             print("[SYNC] ログイン成功。映画データを取得中...")
-            movies_data = scraper.fetch_watched_movies()
+            counts = {"added": 0, "existing": 0, "errors": 0}
+            fetched = 0
+            current_page = 0
+
+            def report(_batch=None) -> None:
+                if progress:
+                    progress({"page": current_page, "fetched": fetched, "processed": batch.rows, **counts})
+                check_cancel()
+
+            batch = SyncCommitBatch(db, counts, commit_batch_size, on_row=report)
+            account_key = None
+            high_water_mark = None
+            newest_mark = None
+            stopped_at_page = None
+
+            # 一覧はページ単位で受け取り、取得済みページから順に書き込む
+            pages = MovieAgent._iter_movie_pages(scraper)
+            try:
+                for page_num, movies_data in enumerate(pages, start=1):
+                    check_cancel()
+                    if scraper.cancelled:
+                        break
+                    if page_num == 1:
+                        # ユーザーIDは一覧取得の過程で確定するため、最初のページ受信後に状態を読む
+                        account_key = MovieAgent._sync_account_key(scraper, login_email)
+                        newest_mark = next(
+                            (MovieAgent._sync_mark(m) for m in movies_data if m.get('external_id')), None
+                        )
+                        if incremental and account_key:
+                            state = db.query(EigaSyncState).filter(EigaSyncState.account_key == account_key).first()
+                            # 視聴日を持たない旧形式の基準点は使わない（記録済みの行のみのページで止まる）
+                            if state and state.last_seen_external_id and state.last_seen_viewed_date:
+                                high_water_mark = (state.last_seen_external_id, state.last_seen_viewed_date)
+                            label = f"{high_water_mark[0]} / {high_water_mark[1]}" if high_water_mark else "(なし)"
+                            print(f"[SYNC] 差分同期モード: 基準={label}")
+                    fetched += len(movies_data)
+                    current_page = page_num
+                    print(f"[SYNC] ページ {page_num}: {len(movies_data)} 件を取得（累計 {fetched} 件）")
+                    report()
+                    all_known = MovieAgent._sync_movie_page(
+                        db, scraper, movies_data, counts, batch, defer_details, check_cancel
+                    )
+                    if scraper.cancelled:
+                        break
+                    # 次のページの取得前に確定する（一覧の読み込み中に書き込みロックを持たない）
+                    batch.commit_pending()
+                    if incremental and MovieAgent._should_stop_incremental(movies_data, high_water_mark, all_known):
+                        stopped_at_page = page_num
+                        print(f"[SYNC] 記録済みの視聴履歴に到達したため {page_num} ページ目で巡回を終了します")
+                        break
+            finally:
+                # 途中終了時は未取得ページへの遷移を行わない
+                pages.close()
+
             if scraper.cancelled:
                 print(f"[SYNC] [CANCELLED] {scraper.cancel_reason}")
                 db.rollback()
                 return {
                     'success': False,
                     'cancelled': True,
-                    'message': cancelled_message,
-                    'added': 0,
-                    'existing': 0,
-                    'errors': 0,
+                    'message': MovieAgent._with_committed_note(cancelled_message(), batch.committed),
+                    'added': batch.committed["added"],
+                    'existing': batch.committed["existing"],
+                    'errors': batch.committed["errors"],
                     'can_fallback_to_interactive': False
                 }
-            print(f"[SYNC] {len(movies_data)} 件の映画を取得しました")
-
-            added_count = 0
-            existing_count = 0
-            error_count = 0
-
-            for movie_data in movies_data:
-                try:
-                    # 外部IDまたはタイトルで既存チェック
-                    external_id = movie_data.get('external_id')
-                    movie = None
-                    
-                    if external_id:
-                        movie = db.query(Movie).filter(Movie.external_id == external_id).first()
-                    
-                    if not movie:
-                        movie = db.query(Movie).filter(Movie.title == movie_data['title']).first()
-
-                    if not movie:
-                        movie_url = movie_data.get('movie_url', '')
-                        details = scraper.get_movie_details(movie_url) if movie_url else {}
-                        fallback_released_year = (
-                            movie_data.get('released_year')
-                            or (movie_data.get('release_date').year if movie_data.get('release_date') else None)
-                        )
-                        fallback_release_date = MovieAgent._extract_release_date(movie_data)
-                        fallback_director = movie_data.get('director')
-
-                        if details:
-                            movie = Movie(
-                                title=details.get('title', movie_data['title']),
-                                genre=details.get('genre'),
-                                release_date=MovieAgent._extract_release_date(details) or fallback_release_date,
-                                released_year=details.get('released_year') or fallback_released_year,
-                                director=details.get('director') or fallback_director,
-                                cast=dump_cast_text(details.get('cast', [])),
-                                synopsis=details.get('synopsis'),
-                                image_url=details.get('image_url'),
-                                external_id=details.get('external_id') or external_id
-                            )
-                        else:
-                            movie = Movie(
-                                title=movie_data['title'],
-                                external_id=external_id,
-                                release_date=fallback_release_date,
-                                released_year=fallback_released_year,
-                                director=fallback_director,
-                                image_url=movie_data.get('image_url')
-                            )
-
-                        try:
-                            db.add(movie)
-                            db.flush()
-                            added_count += 1
-                            print(f"[SYNC] ✓ 映画を追加しました: {movie_data['title']} (ID: {external_id})")
-                        except Exception as e:
-                            # UNIQUE 制約エラーなど、既に存在する場合
-                            if 'UNIQUE' in str(e) or 'unique' in str(e).lower():
-                                print(f"[SYNC] ⚠ 映画は既に存在します（制約エラー）: {movie_data['title']} (ID: {external_id})")
-                                existing_count += 1
-                                db.rollback()
-                            else:
-                                raise
-                    else:
-                        if MovieAgent._update_movie_metadata(movie, movie_data):
-                            print(f"[SYNC] ↻ 映画メタ情報を更新しました: {movie_data['title']}")
-                        existing_count += 1
-                        print(f"[SYNC] ⚠ 映画は既に存在します: {movie_data['title']} (ID: {external_id})")
-
-                    # 既に取得済みか確認
-                    if movie:
-                        existing_record = db.query(Record).filter(
-                            Record.movie_id == movie.id,
-                            Record.viewed_date == movie_data['viewed_date']
-                        ).first()
-
-                        if not existing_record:
-                            record = Record(
-                                movie_id=movie.id,
-                                viewed_date=movie_data['viewed_date'],
-                                viewing_method=movie_data.get('viewing_method', 'other'),
-                                rating=movie_data.get('rating'),
-                                mood=None,
-                                comment='自動同期'
-                            )
-                            db.add(record)
-                            db.flush()
-                            print(f"[SYNC] ✓ 視聴記録を追加しました: {movie_data['title']}")
-
-                except Exception as e:
-                    print(f"[SYNC] ✗ 映画処理エラー: {e}")
-                    error_count += 1
-                    db.rollback()
+            print(f"[SYNC] {fetched} 件の映画を取得しました")
 
             # 明示入力 + 保存ON の場合のみ保存
             if save_credentials and email and password:
@@ -426,29 +793,40 @@ class MovieAgent:
                 if cred:
                     cred.last_sync = datetime.utcnow()
 
-            db.commit()
+            fetch_interrupted = getattr(scraper, "fetch_interrupted", False)
+            if account_key and newest_mark and not fetch_interrupted:
+                MovieAgent._save_sync_state(db, account_key, newest_mark, full=stopped_at_page is None)
 
+            batch.commit()
+
+            message = '同期完了'
+            if fetch_interrupted:
+                message = '同期完了（視聴履歴の取得が途中で中断されました）'
+            elif stopped_at_page is not None:
+                message = f'同期完了（差分同期: {stopped_at_page} ページで終了）'
             return {
                 'success': True,
                 'cancelled': False,
-                'message': '同期完了',
-                'added': added_count,
-                'existing': existing_count,
-                'errors': error_count,
+                'message': message,
+                'added': counts["added"],
+                'existing': counts["existing"],
+                'errors': counts["errors"],
                 'can_fallback_to_interactive': False
             }
 
         except Exception as e:
+            # 確定済みバッチは保持し、未確定分のみ破棄する
+            committed = batch.committed if batch else {"added": 0, "existing": 0, "errors": 0}
             if scraper and scraper.cancelled:
                 print(f"[SYNC] [CANCELLED] {scraper.cancel_reason}")
                 db.rollback()
                 return {
                     'success': False,
                     'cancelled': True,
-                    'message': cancelled_message,
-                    'added': 0,
-                    'existing': 0,
-                    'errors': 0,
+                    'message': MovieAgent._with_committed_note(cancelled_message(), committed),
+                    'added': committed["added"],
+                    'existing': committed["existing"],
+                    'errors': committed["errors"],
                     'can_fallback_to_interactive': False
                 }
             print(f"同期エラー: {e}")
@@ -456,10 +834,10 @@ class MovieAgent:
             return {
                 'success': False,
                 'cancelled': False,
-                'message': f'同期中にエラーが発生しました: {str(e)}',
-                'added': 0,
-                'existing': 0,
-                'errors': 1,
+                'message': MovieAgent._with_committed_note(f'同期中にエラーが発生しました: {str(e)}', committed),
+                'added': committed["added"],
+                'existing': committed["existing"],
+                'errors': committed["errors"] + 1,
                 'can_fallback_to_interactive': False
             }
 
@@ -479,8 +857,5 @@ class MovieAgent:
         Returns:
             検索結果リスト
         """
-        scraper = MovieComScraper()
-        try:
-            return scraper.search(query)
-        finally:
-            scraper.close()
+        # HTTP 検索（結果キャッシュ付き）。取得できない場合のみブラウザで再検索する
+        return get_default_search_client().search(query)
@@ -0,0 +1,486 @@
+"""
+同期ジョブ（映画.com 同期を別プロセスで実行する）
+
+API プロセスはジョブを sync_jobs に記録してワーカープロセスを起動し、すぐに応答を返す。
+ワーカーは同期を実行しながら進捗をキューで API プロセスへ送り、中止要求はイベントで受け取る。
+
+- 実行中（queued/running）のジョブはアカウントごとに1件まで。同じアカウントの開始要求は実行中のジョブを返す
+- 実行中の進捗は API プロセスのメモリに保持し、sync_jobs へは開始・終了時にまとめて書き込む
+  （行ごとの進捗で書き込みを増やさず、ワーカーがページの行を書き込む間のロック待ちも避ける）
+- 中止要求はページ・行の区切りで反映される。ログイン待ちなどで止まらない場合は
+  猶予（EIGA_SYNC_CANCEL_GRACE 秒・既定10）の後にワーカーを停止する
+- API を複数プロセスで動かす場合に備え、ジョブには起動元プロセス（ホスト名・PID・識別子）を記録する。
+  他プロセスからの中止要求は sync_jobs.cancel_requested に書き、ワーカーと起動元がそれを読んで止める。
+  取り残しとして失敗にするのは、同じホスト上で起動元プロセスが終了しているジョブのみ
+"""
+try:
+    # backend/ 配下から起動する通常実行系
+    from app.db.database import SessionLocal
+    from app.models.models import EigaComCredentials, SyncJob
+except ModuleNotFoundError:
+    # ルート実行（テスト等）向けフォールバック
+    from backend.app.db.database import SessionLocal
+    from backend.app.models.models import EigaComCredentials, SyncJob
+from agent.scrapers.http_client import env_number
+from agent.tasks.enrichment import wake_default_enrichment_worker
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import sys
+import threading
+import time
+import uuid
+
+from sqlalchemy.exc import IntegrityError
+
+ACTIVE_STATUSES = ("queued", "running")
+PROGRESS_FIELDS = ("page", "fetched", "processed", "added", "existing", "errors")
+CANCEL_POLL_INTERVAL = 1.0  # sync_jobs.cancel_requested を読みに行く間隔（秒）
+
+# このプロセスの識別子（PID が再利用されても別プロセスと区別できるようにする）
+_PROCESS_TOKEN = uuid.uuid4().hex
+_HOSTNAME = socket.gethostname()
+
+
+def sync_account_key(db, email: Optional[str], use_saved_credentials: bool) -> str:
+    """
+    同時実行を絞る単位。ログイン前に決める必要があるため、
+    明示入力・保存済み資格情報のメールアドレス、どちらもなければ対話ログインを1単位とする。
+    """
+    if email:
+        return f"email:{email.strip().lower()}"
+    if use_saved_credentials:
+        cred = db.query(EigaComCredentials).filter(EigaComCredentials.is_active == True).order_by(  # noqa: E712
+            EigaComCredentials.updated_at.desc()
+        ).first()
+        if cred:
+            return f"email:{cred.email.strip().lower()}"
+    return "interactive"
+
+
+def _public_options(options: Dict) -> Dict:
+    return {key: value for key, value in options.items() if key != "password"}
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _owner_alive(job: SyncJob) -> bool:
+    """ジョブを起動した API プロセスが動いているか（別ホストは確認できないため動いているとみなす）。"""
+    if job.owner_pid is None or job.owner_host is None:
+        # 起動元を記録する前のジョブ
+        return False
+    if job.owner_host != _HOSTNAME:
+        return True
+    if job.owner_pid == os.getpid():
+        return job.owner_token == _PROCESS_TOKEN
+    return _process_alive(job.owner_pid)
+
+
+def _read_cancel_requested(session_factory, job_id: str) -> bool:
+    db = session_factory()
+    try:
+        return bool(db.query(SyncJob.cancel_requested).filter(SyncJob.id == job_id).scalar())
+    finally:
+        db.close()
+
+
+def _failure_result(message: str, cancelled: bool = False, counts: Optional[Dict] = None) -> Dict:
+    counts = counts or {}
+    return {
+        "success": False,
+        "cancelled": cancelled,
+        "message": message,
+        "added": counts.get("added", 0),
+        "existing": counts.get("existing", 0),
+        "errors": counts.get("errors", 0) + (0 if cancelled else 1),
+        "can_fallback_to_interactive": False,
+    }
+
+
+class SyncJobChannel:
+    """
+    ワーカー側の通信口（進捗の送信と中止要求の確認）。
+
+    cancel_poll を渡すと、起動元からのイベントに加えて CANCEL_POLL_INTERVAL ごとに
+    DB の中止要求（他の API プロセスからの要求）も確認する。
+    """
+
+    PROGRESS_INTERVAL = 0.5  # 行ごとの進捗はこの間隔（秒）に間引く。ページが変わった時は必ず送る
+
+    def __init__(self, messages, cancel_event, cancel_poll: Optional[Callable[[], bool]] = None):
+        self.messages = messages
+        self.cancel_event = cancel_event
+        self.cancel_poll = cancel_poll
+        self._last_sent = 0.0
+        self._last_page = None
+        self._last_polled = 0.0
+
+    def started(self) -> None:
+        self.messages.put(("started", os.getpid()))
+
+    def progress(self, values: Dict) -> None:
+        now = time.monotonic()
+        if values.get("page") == self._last_page and now - self._last_sent < self.PROGRESS_INTERVAL:
+            return
+        self._last_sent = now
+        self._last_page = values.get("page")
+        self.messages.put(("progress", {key: values.get(key, 0) for key in PROGRESS_FIELDS}))
+
+    def cancel_requested(self) -> bool:
+        if self.cancel_event.is_set():
+            return True
+        now = time.monotonic()
+        if self.cancel_poll and now - self._last_polled >= CANCEL_POLL_INTERVAL:
+            self._last_polled = now
+            try:
+                if self.cancel_poll():
+                    self.cancel_event.set()
+            except Exception as e:
+                print(f"[WARN] 同期ジョブの中止要求を確認できませんでした: {e}")
+        return self.cancel_event.is_set()
+
+    def finished(self, result: Dict) -> None:
+        self.messages.put(("result", result))
+
+
+def run_sync_job(options: Dict, messages, cancel_event, job_id: str) -> None:
+    """ワーカープロセスの入口。同期を実行し、結果をキューへ送る。"""
+    # 強制停止（terminate）時も finally でブラウザを閉じられるよう SystemExit に変換する
+    signal.signal(signal.SIGTERM, lambda *_args: sys.exit(143))
+    from agent.tasks.movie_agent import MovieAgent
+
+    channel = SyncJobChannel(
+        messages, cancel_event, cancel_poll=lambda: _read_cancel_requested(SessionLocal, job_id)
+    )
+    channel.started()
+    try:
+        result = MovieAgent.sync_from_eiga_com_with_options(
+            **options,
+            progress=channel.progress,
+            should_cancel=channel.cancel_requested,
+        )
+    except Exception as e:
+        print(f"[SYNC] 同期ジョブエラー: {e}")
+        result = _failure_result(f"同期中にエラーが発生しました: {e}")
+    channel.finished(result)
+
+
+class _JobHandle:
+    """API プロセスが保持する実行中ジョブの状態。"""
+
+    def __init__(self, job_id: str, process, messages, cancel_event):
+        self.job_id = job_id
+        self.process = process
+        self.messages = messages
+        self.cancel_event = cancel_event
+        self.status = "queued"
+        self.progress = {key: 0 for key in PROGRESS_FIELDS}
+        self.cancel_requested = False
+        self.result: Optional[Dict] = None
+        self.started_at: Optional[datetime] = None
+        self.done = threading.Event()
+
+
+class SyncJobRunner:
+    """同期ジョブの開始・状態取得・中止（API プロセス側）。"""
+
+    DEFAULT_CANCEL_GRACE = 10.0  # EIGA_SYNC_CANCEL_GRACE で上書き可
+
+    def __init__(
+        self,
+        session_factory=None,
+        target: Optional[Callable] = None,
+        cancel_grace: Optional[float] = None,
+        context=None,
+    ):
+        if cancel_grace is None:
+            cancel_grace = env_number("EIGA_SYNC_CANCEL_GRACE", self.DEFAULT_CANCEL_GRACE, float)
+        self.session_factory = session_factory or SessionLocal
+        self.target = target or run_sync_job
+        self.cancel_grace = max(0.0, float(cancel_grace))
+        # fork は親のスレッド・DB 接続を引き継ぐため、常に spawn で起動する
+        self.context = context or multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._handles: Dict[str, _JobHandle] = {}
+
+    # ---- 公開 API ----
+
+    def start(self, options: Dict) -> Tuple[Dict, bool]:
+        """
+        ジョブを開始する。同じアカウントのジョブが実行中ならそれを返す。
+
+        Returns:
+            (ジョブ, 新規に開始したか)
+        """
+        with self._lock:
+            db = self.session_factory()
+            try:
+                self._reap_orphans(db)
+                account_key = sync_account_key(db, options.get("email"), options.get("use_saved_credentials", True))
+                active = self._active_job(db, account_key)
+                if active:
+                    return self._to_dict(active), False
+
+                job = SyncJob(
+                    id=uuid.uuid4().hex,
+                    account_key=account_key,
+                    status="queued",
+                    options=json.dumps(_public_options(options), ensure_ascii=False),
+                    owner_host=_HOSTNAME,
+                    owner_pid=os.getpid(),
+                    owner_token=_PROCESS_TOKEN,
+                )
+                messages = self.context.Queue()
+                cancel_event = self.context.Event()
+                process = self.context.Process(
+                    target=self.target,
+                    args=(options, messages, cancel_event, job.id),
+                    name=f"sync-job-{job.id[:8]}",
+                    daemon=True,
+                )
+                handle = _JobHandle(job.id, process, messages, cancel_event)
+                # 確定直後の状態取得で取り残しと誤判定されないよう、先に登録しておく
+                self._handles[job.id] = handle
+                db.add(job)
+                try:
+                    db.commit()
+                except IntegrityError:
+                    # 別プロセスから同時に開始された場合も実行中のジョブに合流する
+                    self._handles.pop(job.id, None)
+                    db.rollback()
+                    active = self._active_job(db, account_key)
+                    if active:
+                        return self._to_dict(active), False
+                    raise
+
+                try:
+                    process.start()
+                except Exception as e:
+                    self._handles.pop(job.id, None)
+                    job.status = "failed"
+                    job.message = f"同期ワーカーを起動できませんでした: {e}"
+                    job.finished_at = datetime.utcnow()
+                    db.commit()
+                    raise
+                print(f"[SYNC] 同期ジョブを開始しました: {job.id} (pid={process.pid}, {account_key})")
+                threading.Thread(target=self._watch, args=(handle,), name=f"sync-job-watch-{job.id[:8]}", daemon=True).start()
+                return self._to_dict(job), True
+            finally:
+                db.close()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        db = self.session_factory()
+        try:
+            self._reap_orphans(db)
+            job = db.get(SyncJob, job_id)
+            return self._to_dict(job) if job else None
+        finally:
+            db.close()
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        db = self.session_factory()
+        try:
+            self._reap_orphans(db)
+            jobs = db.query(SyncJob).order_by(SyncJob.created_at.desc()).limit(limit).all()
+            return [self._to_dict(job) for job in jobs]
+        finally:
+            db.close()
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """
+        中止を要求する（実行中でなければ何もしない）。
+        他の API プロセスが起動したジョブは sync_jobs.cancel_requested に書き込み、起動元とワーカーに任せる。
+        """
+        handle = self._handles.get(job_id)
+        if handle:
+            if not handle.done.is_set():
+                self._request_cancel(handle)
+            return self.get(job_id)
+
+        db = self.session_factory()
+        try:
+            updated = db.query(SyncJob).filter(
+                SyncJob.id == job_id,
+                SyncJob.status.in_(ACTIVE_STATUSES),
+                SyncJob.cancel_requested == False,  # noqa: E712
+            ).update({"cancel_requested": True}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        if updated:
+            print(f"[SYNC] 他プロセスの同期ジョブへ中止を要求しました: {job_id}")
+        return self.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """ジョブの終了を待って状態を返す（timeout 経過時は実行中の状態を返す）。"""
+        handle = self._handles.get(job_id)
+        if handle:
+            handle.done.wait(timeout)
+        return self.get(job_id)
+
+    # ---- 内部処理 ----
+
+    @staticmethod
+    def _active_job(db, account_key: str) -> Optional[SyncJob]:
+        return db.query(SyncJob).filter(
+            SyncJob.account_key == account_key,
+            SyncJob.status.in_(ACTIVE_STATUSES),
+        ).first()
+
+    def _to_dict(self, job: SyncJob) -> Dict:
+        data = {
+            "id": job.id,
+            "status": job.status,
+            "options": json.loads(job.options) if job.options else {},
+            "message": job.message,
+            "cancel_requested": bool(job.cancel_requested),
+            "result": json.loads(job.result) if job.result else None,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
+        data.update({key: getattr(job, key) or 0 for key in PROGRESS_FIELDS})
+        handle = self._handles.get(job.id)
+        if handle and job.status in ACTIVE_STATUSES:
+            # 実行中の進捗はメモリ上の最新値を返す
+            data.update(handle.progress)
+            data["status"] = handle.status
+            data["started_at"] = handle.started_at
+            data["cancel_requested"] = handle.cancel_requested
+        return data
+
+    def _request_cancel(self, handle: _JobHandle) -> None:
+        if handle.cancel_requested:
+            return
+        handle.cancel_requested = True
+        handle.cancel_event.set()
+        print(f"[SYNC] 同期ジョブの中止を要求しました: {handle.job_id}")
+        timer = threading.Timer(self.cancel_grace, self._terminate_if_alive, args=(handle,))
+        timer.daemon = True
+        timer.start()
+
+    def _poll_cancel(self, handle: _JobHandle) -> None:
+        """他の API プロセスから DB 経由で届いた中止要求を反映する（強制停止の猶予をここで始める）。"""
+        if handle.cancel_requested:
+            return
+        try:
+            if _read_cancel_requested(self.session_factory, handle.job_id):
+                self._request_cancel(handle)
+        except Exception as e:
+            print(f"[WARN] 同期ジョブの中止要求を確認できませんでした: {handle.job_id} ({e})")
+
+    def _watch(self, handle: _JobHandle) -> None:
+        """ワーカーからのメッセージを受け取り、終了後に結果を sync_jobs へ書き込む。"""
+        last_polled = time.monotonic()
+        while True:
+            if time.monotonic() - last_polled >= CANCEL_POLL_INTERVAL:
+                last_polled = time.monotonic()
+                self._poll_cancel(handle)
+            try:
+                kind, payload = handle.messages.get(timeout=0.5)
+            except queue.Empty:
+                if not handle.process.is_alive():
+                    break
+                continue
+            # 実行中の進捗はメモリに保持し、DB へは終了時にまとめて書く
+            if kind == "started":
+                handle.status = "running"
+                handle.started_at = datetime.utcnow()
+            elif kind == "progress":
+                handle.progress.update(payload)
+            elif kind == "result":
+                handle.result = payload
+        handle.process.join()
+        self._finish(handle)
+
+    def _finish(self, handle: _JobHandle) -> None:
+        # ワーカーが DB の中止要求を見て止まった場合もイベント経由でここに伝わる
+        handle.cancel_requested = handle.cancel_requested or handle.cancel_event.is_set()
+        result = handle.result
+        if result is None:
+            if handle.cancel_requested:
+                result = _failure_result("同期を中止しました（ワーカーを停止）", cancelled=True, counts=handle.progress)
+            else:
+                result = _failure_result(
+                    f"同期ワーカーが異常終了しました（exit code {handle.process.exitcode}）", counts=handle.progress
+                )
+        if result.get("success"):
+            status = "succeeded"
+        elif result.get("cancelled"):
+            status = "cancelled"
+        else:
+            status = "failed"
+        values = dict(handle.progress)
+        values.update({key: result.get(key, 0) for key in ("added", "existing", "errors")})
+        try:
+            self._update_job(
+                handle.job_id,
+                status=status,
+                message=result.get("message"),
+                result=json.dumps(result, ensure_ascii=False),
+                cancel_requested=handle.cancel_requested,
+                started_at=handle.started_at,
+                finished_at=datetime.utcnow(),
+                **values,
+            )
+        except Exception as e:
+            print(f"[WARN] 同期ジョブの結果を保存できませんでした: {handle.job_id} ({e})")
+        finally:
+            handle.status = status
+            handle.done.set()
+            self._handles.pop(handle.job_id, None)
+        print(f"[SYNC] 同期ジョブが終了しました: {handle.job_id} ({status})")
+        # 詳細を後回しにして登録した映画の補完をすぐに始める
+        if values.get("added"):
+            wake_default_enrichment_worker()
+
+    def _terminate_if_alive(self, handle: _JobHandle) -> None:
+        if handle.process.is_alive():
+            print(f"[WARN] 同期ジョブが中止要求に応じないため停止します: {handle.job_id}")
+            handle.process.terminate()
+
+    def _update_job(self, job_id: str, **values) -> None:
+        db = self.session_factory()
+        try:
+            db.query(SyncJob).filter(SyncJob.id == job_id).update(values, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def _reap_orphans(self, db) -> None:
+        """起動元の API プロセスが終了して取り残された実行中ジョブを失敗にする（他プロセスのジョブは残す）。"""
+        orphans = [
+            job for job in db.query(SyncJob).filter(SyncJob.status.in_(ACTIVE_STATUSES)).all()
+            if job.id not in self._handles and not _owner_alive(job)
+        ]
+        for job in orphans:
+            job.status = "failed"
+            job.message = "API の再起動により同期ジョブが中断されました"
+            job.finished_at = datetime.utcnow()
+        if orphans:
+            db.commit()
+
+
+_default_runner: Optional[SyncJobRunner] = None
+_default_runner_lock = threading.Lock()
+
+
+def get_default_sync_job_runner() -> SyncJobRunner:
+    global _default_runner
+    with _default_runner_lock:
+        if _default_runner is None:
+            _default_runner = SyncJobRunner()
+        return _default_runner
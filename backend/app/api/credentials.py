@@ -39,7 +39,7 @@ class CredentialUpsertRequest(BaseModel):
 
 
 @router.get("/eiga", response_model=CredentialView)
-async def get_credentials(db: Session = Depends(get_db)):
+def get_credentials(db: Session = Depends(get_db)):
     """有効な映画.com資格情報のメタ情報を取得（平文は返さない）。"""
     cred = (
         db.query(EigaComCredentials)
@@ -60,7 +60,7 @@ async def get_credentials(db: Session = Depends(get_db)):
 
 
 @router.put("/eiga", response_model=CredentialView)
-async def put_credentials(payload: CredentialUpsertRequest, db: Session = Depends(get_db)):
+def put_credentials(payload: CredentialUpsertRequest, db: Session = Depends(get_db)):
     """
     資格情報の保存/更新/有効化。
     - email+password: 保存または更新
@@ -102,7 +102,7 @@ async def put_credentials(payload: CredentialUpsertRequest, db: Session = Depend
 
 
 @router.delete("/eiga")
-async def delete_credentials(db: Session = Depends(get_db)):
+def delete_credentials(db: Session = Depends(get_db)):
     """保存済み資格情報を削除する。"""
     deleted = db.query(EigaComCredentials).delete(synchronize_session=False)
     db.commit()
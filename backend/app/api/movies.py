@@ -2,16 +2,22 @@
 映画管理 API
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
+from sqlalchemy import or_, tuple_
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
+from app.db.movie_fts import search_movies as search_local_movies
 from app.models.models import Movie
-from app.utils.cast_utils import dump_cast_text, is_cast_empty, parse_cast_text
-from agent.scrapers.eiga_scraper import MovieComScraper
+from app.utils.cast_utils import parse_cast_text
+from app.utils.movie_details import apply_movie_details, build_movie_url, missing_field_condition
+from app.utils.pagination import decode_cursor, encode_cursor, set_next_cursor
+from agent.scrapers.detail_client import EigaDetailClient
+from agent.scrapers.detail_fetcher import DetailFetcher
+from agent.scrapers.http_client import env_number
 
 router = APIRouter()
 
@@ -29,10 +35,48 @@ class MovieResponse(BaseModel):
     external_id: Optional[str] = None
 
 
+class MovieSearchResponse(BaseModel):
+    query: str
+    total: int
+    limit: int
+    offset: int
+    items: List[MovieResponse]
+
+
 class RefreshDetailsRequest(BaseModel):
     force_update: bool = False
 
 
+RefreshableField = Literal["released_year", "director", "synopsis", "genre", "image_url", "cast"]
+
+
+class BulkRefreshDetailsRequest(BaseModel):
+    movie_ids: Optional[List[int]] = Field(None, max_length=1000)
+    missing_fields: Optional[List[RefreshableField]] = None
+    force_update: bool = False
+    limit: int = Field(200, ge=1, le=1000)
+
+
+class RefreshDetailsResult(BaseModel):
+    movie_id: int
+    status: Literal["updated", "unchanged", "failed", "skipped", "not_found"]
+    updated_fields: List[str] = []
+    error: Optional[str] = None
+
+
+class BulkRefreshDetailsResponse(BaseModel):
+    success: bool
+    force_update: bool
+    requested: int
+    updated: int
+    failed: int
+    results: List[RefreshDetailsResult]
+
+
+# 一括詳細再取得で何件反映するごとに commit するか
+DEFAULT_REFRESH_COMMIT_BATCH = 50
+
+
 def _to_movie_response(movie: Movie) -> MovieResponse:
     return MovieResponse(
         id=movie.id,
@@ -48,29 +92,142 @@ def _to_movie_response(movie: Movie) -> MovieResponse:
     )
 
 
-def _is_empty(value) -> bool:
-    if value is None:
-        return True
-    if isinstance(value, str):
-        return value.strip() == ""
-    return False
+@router.get("/", response_model=List[MovieResponse])
+def list_movies(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    全映画取得（タイトル, ID 順）
+    - cursor 指定時はその位置の続きから取得する（skip は無視）
+    - 続きがある場合は `Link: <...>; rel="next"` / `X-Next-Cursor` ヘッダーを返す
+    """
+    query = db.query(Movie).order_by(Movie.title, Movie.id)
+    if cursor:
+        title, movie_id = decode_cursor(cursor, 2)
+        query = query.filter(tuple_(Movie.title, Movie.id) > tuple_(title, movie_id))
+    elif skip:
+        query = query.offset(skip)
+    movies = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(movies) > limit:
+        movies = movies[:limit]
+        next_cursor = encode_cursor([movies[-1].title, movies[-1].id])
+    set_next_cursor(request, response, next_cursor, limit)
+    return [_to_movie_response(movie) for movie in movies]
+
+
+@router.get("/search", response_model=MovieSearchResponse)
+def search_movies(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    登録済み映画の全文検索（タイトル/監督/キャスト/ジャンル/あらすじ、関連度順）
+    """
+    total, movies = search_local_movies(db, q, limit=limit, offset=offset)
+    return MovieSearchResponse(
+        query=q,
+        total=total,
+        limit=limit,
+        offset=offset,
+        items=[_to_movie_response(movie) for movie in movies],
+    )
+
+
+@router.post("/refresh-details", response_model=BulkRefreshDetailsResponse)
+def refresh_movies_details(payload: BulkRefreshDetailsRequest, db: Session = Depends(get_db)):
+    """
+    複数映画の詳細情報を並列に再取得して更新する。
+    - movie_ids: 対象の映画ID（指定順に結果を返す）
+    - missing_fields: いずれかの項目が空の映画に絞る（movie_ids なしの場合は ID 順に limit 件）
+    - force_update: 単体の refresh-details と同じ（False: 空値のみ / True: 強制上書き）
+    取得は DetailFetcher（同時数 EIGA_DETAIL_WORKERS・間隔 EIGA_DETAIL_MIN_INTERVAL）で行い、
+    EIGA_REFRESH_COMMIT_BATCH 件（既定50）ごとに commit する。
+    """
+    if not payload.movie_ids and not payload.missing_fields:
+        raise HTTPException(status_code=400, detail="movie_ids か missing_fields を指定してください")
 
+    query = db.query(Movie)
+    if payload.movie_ids:
+        query = query.filter(Movie.id.in_(payload.movie_ids))
+    if payload.missing_fields:
+        # external_id がない映画は再取得できないため条件指定では対象にしない
+        query = query.filter(Movie.external_id.isnot(None))
+        query = query.filter(or_(*(missing_field_condition(name) for name in dict.fromkeys(payload.missing_fields))))
+    if payload.movie_ids:
+        movies = {movie.id: movie for movie in query}
+        order = list(dict.fromkeys(payload.movie_ids))
+    else:
+        movies = {movie.id: movie for movie in query.order_by(Movie.id).limit(payload.limit)}
+        order = list(movies)
 
-def _build_movie_url(movie: Movie) -> Optional[str]:
-    if not movie.external_id:
-        return None
-    return f"https://eiga.com/movie/{movie.external_id}/"
+    results: Dict[int, RefreshDetailsResult] = {}
+    movie_ids_by_url: Dict[str, List[int]] = {}
+    for movie_id in order:
+        movie = movies.get(movie_id)
+        if movie is None:
+            # movie_ids 指定時に存在しない、または missing_fields の条件に合わない映画
+            exists = payload.missing_fields and db.query(Movie.id).filter(Movie.id == movie_id).first()
+            results[movie_id] = RefreshDetailsResult(
+                movie_id=movie_id,
+                status="skipped" if exists else "not_found",
+                error="missing_fields の条件に該当しません" if exists else "映画が見つかりません",
+            )
+            continue
+        movie_url = build_movie_url(movie)
+        if not movie_url:
+            results[movie_id] = RefreshDetailsResult(
+                movie_id=movie_id, status="skipped", error="external_id がないため詳細再取得できません"
+            )
+            continue
+        movie_ids_by_url.setdefault(movie_url, []).append(movie_id)
 
+    force = payload.force_update
+    client = EigaDetailClient()
+    fetcher = DetailFetcher(lambda url: client.get_movie_details(url, revalidate=force))
+    commit_batch = max(1, env_number("EIGA_REFRESH_COMMIT_BATCH", DEFAULT_REFRESH_COMMIT_BATCH, int))
+    pending = 0
+    # 取得は並列、DB への反映はこのスレッドで完了順に行う（Session はスレッド間で共有しない）
+    for movie_url, details, fetch_error in fetcher.iter_details(movie_ids_by_url.keys()):
+        for movie_id in movie_ids_by_url[movie_url]:
+            if not details:
+                reason = f"詳細情報の取得に失敗しました: {fetch_error}" if fetch_error else "詳細情報の取得に失敗しました"
+                results[movie_id] = RefreshDetailsResult(movie_id=movie_id, status="failed", error=reason)
+                continue
+            updated_fields = apply_movie_details(movies[movie_id], details, force)
+            results[movie_id] = RefreshDetailsResult(
+                movie_id=movie_id,
+                status="updated" if updated_fields else "unchanged",
+                updated_fields=updated_fields,
+            )
+            pending += 1
+            if pending >= commit_batch:
+                db.commit()
+                pending = 0
+    db.commit()
 
-@router.get("/", response_model=List[MovieResponse])
-async def list_movies(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """全映画取得"""
-    movies = db.query(Movie).offset(skip).limit(limit).all()
-    return [_to_movie_response(movie) for movie in movies]
+    ordered = [results[movie_id] for movie_id in order]
+    print(f"[DEBUG] 詳細一括再取得: 対象 {len(order)} 件 / 取得 {len(movie_ids_by_url)} URL")
+    return BulkRefreshDetailsResponse(
+        success=True,
+        force_update=force,
+        requested=len(order),
+        updated=sum(1 for result in ordered if result.status == "updated"),
+        failed=sum(1 for result in ordered if result.status == "failed"),
+        results=ordered,
+    )
 
 
 @router.get("/{movie_id}", response_model=MovieResponse)
-async def get_movie(movie_id: int, db: Session = Depends(get_db)):
+def get_movie(movie_id: int, db: Session = Depends(get_db)):
     """映画詳細取得"""
     movie = db.query(Movie).filter(Movie.id == movie_id).first()
     if not movie:
@@ -79,7 +236,7 @@ async def get_movie(movie_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/{movie_id}/refresh-details")
-async def refresh_movie_details(
+def refresh_movie_details(
     movie_id: int,
     payload: RefreshDetailsRequest,
     db: Session = Depends(get_db),
@@ -93,40 +250,18 @@ async def refresh_movie_details(
     if not movie:
         raise HTTPException(status_code=404, detail="映画が見つかりません")
 
-    movie_url = _build_movie_url(movie)
+    movie_url = build_movie_url(movie)
     if not movie_url:
         raise HTTPException(status_code=422, detail="external_id がないため詳細再取得できません")
 
-    scraper = MovieComScraper()
-    try:
-        details = scraper.get_movie_details(movie_url)
-    finally:
-        scraper.close()
+    # HTTP 1回で取得する（ブラウザは起動しない）。強制更新時は TTL 内のキャッシュも条件付き GET で再検証する
+    details = EigaDetailClient().get_movie_details(movie_url, revalidate=payload.force_update)
 
     if not details:
         raise HTTPException(status_code=502, detail="詳細情報の取得に失敗しました")
 
-    updated_fields = []
     force = payload.force_update
-
-    def apply_if_allowed(field_name: str, new_value):
-        current = getattr(movie, field_name)
-        if force or _is_empty(current):
-            setattr(movie, field_name, new_value)
-            updated_fields.append(field_name)
-
-    apply_if_allowed("released_year", details.get("released_year"))
-    apply_if_allowed("release_date", details.get("release_date"))
-    apply_if_allowed("director", details.get("director"))
-    apply_if_allowed("synopsis", details.get("synopsis"))
-    apply_if_allowed("genre", details.get("genre"))
-    apply_if_allowed("image_url", details.get("image_url"))
-
-    new_cast = details.get("cast", [])
-    if force or is_cast_empty(movie.cast):
-        movie.cast = dump_cast_text(new_cast)
-        updated_fields.append("cast")
-
+    updated_fields = apply_movie_details(movie, details, force)
     db.commit()
     db.refresh(movie)
 
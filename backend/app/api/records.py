@@ -1,10 +1,13 @@
 """
 視聴記録 API
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.models.models import Record, Movie, ViewingMethod, Mood
+from app.utils.pagination import decode_cursor, encode_cursor, parse_cursor_datetime, set_next_cursor
 from pydantic import BaseModel, root_validator, validator
 from typing import List, Optional
 from datetime import datetime
@@ -56,14 +59,47 @@ class RecordResponse(BaseModel):
     class Config:
         from_attributes = True
 
+def _commit_record(db: Session) -> None:
+    """記録を確定する。同じ映画・視聴日時の記録が既にあれば 409。"""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="同じ映画・視聴日時の記録が既に存在します")
+
 @router.get("/", response_model=List[RecordResponse])
-async def list_records(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """全記録取得"""
-    records = db.query(Record).offset(skip).limit(limit).all()
+def list_records(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    全記録取得（視聴日の新しい順、同日時は ID 降順）
+    - cursor 指定時はその位置の続きから取得する（skip は無視）
+    - 続きがある場合は `Link: <...>; rel="next"` / `X-Next-Cursor` ヘッダーを返す
+    """
+    query = db.query(Record).order_by(Record.viewed_date.desc(), Record.id.desc())
+    if cursor:
+        viewed_date, record_id = decode_cursor(cursor, 2)
+        query = query.filter(
+            tuple_(Record.viewed_date, Record.id) < tuple_(parse_cursor_datetime(viewed_date), record_id)
+        )
+    elif skip:
+        query = query.offset(skip)
+    records = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = encode_cursor([records[-1].viewed_date, records[-1].id])
+    set_next_cursor(request, response, next_cursor, limit)
     return records
 
 @router.post("/", response_model=RecordResponse)
-async def create_record(record: RecordCreate, db: Session = Depends(get_db)):
+def create_record(record: RecordCreate, db: Session = Depends(get_db)):
     """記録作成"""
     # 映画の存在確認
     movie = db.query(Movie).filter(Movie.id == record.movie_id).first()
@@ -72,12 +108,12 @@ async def create_record(record: RecordCreate, db: Session = Depends(get_db)):
     
     db_record = Record(**record.dict())
     db.add(db_record)
-    db.commit()
+    _commit_record(db)
     db.refresh(db_record)
     return db_record
 
 @router.get("/{record_id}", response_model=RecordResponse)
-async def get_record(record_id: int, db: Session = Depends(get_db)):
+def get_record(record_id: int, db: Session = Depends(get_db)):
     """記録詳細取得"""
     record = db.query(Record).filter(Record.id == record_id).first()
     if not record:
@@ -85,7 +121,7 @@ async def get_record(record_id: int, db: Session = Depends(get_db)):
     return record
 
 @router.delete("/{record_id}")
-async def delete_record(record_id: int, db: Session = Depends(get_db)):
+def delete_record(record_id: int, db: Session = Depends(get_db)):
     """記録削除"""
     record = db.query(Record).filter(Record.id == record_id).first()
     if not record:
@@ -95,7 +131,7 @@ async def delete_record(record_id: int, db: Session = Depends(get_db)):
     return {"message": "削除しました"}
 
 @router.patch("/{record_id}", response_model=RecordResponse)
-async def update_record(record_id: int, payload: RecordUpdate, db: Session = Depends(get_db)):
+def update_record(record_id: int, payload: RecordUpdate, db: Session = Depends(get_db)):
     """記録更新"""
     record = db.query(Record).filter(Record.id == record_id).first()
     if not record:
@@ -105,6 +141,6 @@ async def update_record(record_id: int, payload: RecordUpdate, db: Session = Dep
     for key, value in updates.items():
         setattr(record, key, value)
 
-    db.commit()
+    _commit_record(db)
     db.refresh(record)
     return record
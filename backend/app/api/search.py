@@ -1,13 +1,18 @@
 """
 映画検索・スクレイピング API
 """
-from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.models.models import Movie
 from agent.tasks.movie_agent import MovieAgent
+from agent.tasks.sync_jobs import get_default_sync_job_runner
+from agent.scrapers.http_client import get_default_http_client
+from agent.scrapers.driver_pool import get_default_driver_pool
+from agent.scrapers.search_client import get_default_search_client
+from agent.scrapers.waits import get_wait_metrics
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 router = APIRouter()
@@ -29,6 +34,8 @@ class SyncRequest(BaseModel):
     password: Optional[str] = None  # オプション：対話型ログイン時はNone
     save_credentials: bool = False
     use_saved_credentials: bool = True
+    incremental: bool = False  # 前回の最新作品に到達した時点で巡回を終了する
+    defer_details: Optional[bool] = None  # 新規映画の詳細取得を enrichment ワーカーに任せる（None は既定に従う）
 
 class SyncResponse(BaseModel):
     success: bool
@@ -40,7 +47,7 @@ class SyncResponse(BaseModel):
     can_fallback_to_interactive: bool = False
 
 @router.post("/movies", response_model=List[SearchResult])
-async def search_movies(search: SearchQuery, db: Session = Depends(get_db)):
+def search_movies(search: SearchQuery, db: Session = Depends(get_db)):
     """
     映画検索（ネットから取得）
     """
@@ -55,7 +62,7 @@ async def search_movies(search: SearchQuery, db: Session = Depends(get_db)):
         return []
 
 @router.post("/register")
-async def register_movie(movie: SearchResult, db: Session = Depends(get_db)):
+def register_movie(movie: SearchResult, db: Session = Depends(get_db)):
     """
     映画登録（エージェントが詳細情報を自動取得）
     """
@@ -83,10 +90,71 @@ async def register_movie(movie: SearchResult, db: Session = Depends(get_db)):
             "message": f"登録中にエラーが発生しました: {str(e)}"
         }
 
+class SyncJobResponse(BaseModel):
+    id: str
+    status: str  # queued / running / succeeded / failed / cancelled
+    created: bool = False  # 今回の要求で開始したか（False は実行中のジョブへの合流）
+    options: Dict = {}
+    page: int = 0
+    fetched: int = 0
+    processed: int = 0
+    added: int = 0
+    existing: int = 0
+    errors: int = 0
+    message: Optional[str] = None
+    cancel_requested: bool = False
+    result: Optional[SyncResponse] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+@router.post("/sync/jobs", response_model=SyncJobResponse, status_code=202)
+def start_sync_job(request: SyncRequest, response: Response):
+    """
+    映画.com 同期をジョブとして別プロセスで開始する（すぐに応答する）
+    
+    同じアカウントの同期が実行中なら新たに起動せず、そのジョブを返す（created=false）。
+    """
+    job, created = get_default_sync_job_runner().start(request.dict())
+    if not created:
+        response.status_code = 200
+    response.headers["Location"] = f"/api/search/sync/jobs/{job['id']}"
+    return SyncJobResponse(**job, created=created)
+
+@router.get("/sync/jobs", response_model=List[SyncJobResponse])
+def list_sync_jobs(limit: int = Query(20, ge=1, le=100)):
+    """
+    同期ジョブ一覧（新しい順）
+    """
+    return [SyncJobResponse(**job) for job in get_default_sync_job_runner().recent(limit)]
+
+@router.get("/sync/jobs/{job_id}", response_model=SyncJobResponse)
+def get_sync_job(job_id: str):
+    """
+    同期ジョブの状態・進捗（ページ・取得件数・反映行数・追加/既存/エラー件数）を取得
+    """
+    job = get_default_sync_job_runner().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="同期ジョブが見つかりません")
+    return SyncJobResponse(**job)
+
+@router.post("/sync/jobs/{job_id}/cancel", response_model=SyncJobResponse, status_code=202)
+def cancel_sync_job(job_id: str):
+    """
+    同期ジョブの中止を要求する（確定済みの行は保持される）
+    """
+    job = get_default_sync_job_runner().cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="同期ジョブが見つかりません")
+    return SyncJobResponse(**job)
+
 @router.post("/sync", response_model=SyncResponse)
-async def sync_eiga_com(request: SyncRequest, background_tasks: BackgroundTasks):
+def sync_eiga_com(request: SyncRequest):
     """
-    映画.comから視聴履歴を同期
+    映画.comから視聴履歴を同期（互換用。ジョブを開始して終了まで待つ）
+    
+    同期は別プロセスで実行し、待機はこのリクエストのワーカースレッドで行うため他の API はブロックされない。
+    進捗を表示する場合は /sync/jobs を使う。
     
     Args:
         email: メールアドレス（オプション：対話型ログイン用）
@@ -96,13 +164,20 @@ async def sync_eiga_com(request: SyncRequest, background_tasks: BackgroundTasks)
         同期結果
     """
     try:
-        result = MovieAgent.sync_from_eiga_com_with_options(
-            email=request.email,
-            password=request.password,
-            save_credentials=request.save_credentials,
-            use_saved_credentials=request.use_saved_credentials
+        runner = get_default_sync_job_runner()
+        job, _created = runner.start(request.dict())
+        job = runner.wait(job["id"])
+        if job.get("result"):
+            return SyncResponse(**job["result"])
+        return SyncResponse(
+            success=False,
+            cancelled=job["status"] == "cancelled",
+            message=job.get("message") or "同期ジョブの結果を取得できませんでした",
+            added=job["added"],
+            existing=job["existing"],
+            errors=job["errors"] + 1,
+            can_fallback_to_interactive=False
         )
-        return SyncResponse(**result)
     except Exception as e:
         print(f"同期エラー: {e}")
         import traceback
@@ -116,3 +191,31 @@ async def sync_eiga_com(request: SyncRequest, background_tasks: BackgroundTasks)
             errors=1,
             can_fallback_to_interactive=False
         )
+
+@router.get("/http-cache")
+def get_http_cache_stats():
+    """
+    映画詳細ページ用HTTPキャッシュの統計（ヒット/再検証/ミス/保存/追い出し件数）を取得
+    """
+    return get_default_http_client().cache_stats()
+
+@router.get("/wait-metrics")
+def get_wait_metrics_summary():
+    """
+    スクレイパーのブラウザ待機時間を手順別に取得（回数/合計/平均/最大/タイムアウト数）
+    """
+    return get_wait_metrics().snapshot()
+
+@router.get("/driver-pool")
+def get_driver_pool_stats():
+    """
+    ブラウザ（WebDriver）プールの状態（待機/貸出中/起動/入れ替え件数）を取得
+    """
+    return get_default_driver_pool().stats()
+
+@router.get("/search-cache")
+def get_search_cache_stats():
+    """
+    映画検索結果キャッシュの統計（ヒット/ミス/保存/期限切れ/追い出し件数）を取得
+    """
+    return get_default_search_client().cache.stats()
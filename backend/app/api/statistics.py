@@ -1,19 +1,30 @@
 """
 統計・分析 API
 """
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.db.data_version import get_data_version
 from app.db.database import get_db
+from app.db.statistics_summary import (
+    is_statistics_built,
+    read_statistics_summary,
+    recent_since,
+    scan_record_aggregates,
+)
 from app.models.models import Movie, Record
+from app.utils.response_cache import VersionedResponseCache
 
 router = APIRouter()
 
+# 統計レスポンスのキャッシュ（movies/records の書き込みで版数が進むと別キーになる）
+_response_cache = VersionedResponseCache()
+
 
 class StatisticsResponse(BaseModel):
     """統計情報レスポンス（統一仕様）"""
@@ -31,13 +42,39 @@ class StatisticsResponse(BaseModel):
 
 
 def _compute_overview(db: Session) -> Dict:
-    """統一統計レスポンスを生成する。"""
+    """
+    統一統計レスポンスを生成する。
+
+    統計サマリー（statistics_buckets）が構築済みならそれを読み、未構築なら records/movies を集計する。
+    """
+    if not is_statistics_built(db):
+        return _compute_overview_scan(db)
+    overview = read_statistics_summary(db)
+    overview["recent_records"] = _recent_records(db)
+    return overview
+
+
+def _compute_overview_scan(db: Session) -> Dict:
+    """
+    records/movies を直接集計して統一統計レスポンスを生成する。
+
+    統計サマリーが未構築の場合と、`scripts/rebuild-statistics.py --check` の照合に使う。
+    件数・平均評価・直近90日件数・評価分布・気分/視聴方法別件数は
+    records の1回の走査（scan_record_aggregates。サマリー再構築と共通）でまとめて求める。
+    """
     total_movies = db.query(func.count(Movie.id)).scalar() or 0
-    total_records = db.query(func.count(Record.id)).scalar() or 0
-    avg_rating = db.query(func.avg(Record.rating)).scalar() or 0.0
 
-    since = datetime.utcnow() - timedelta(days=90)
-    recent_90_days = db.query(func.count(Record.id)).filter(Record.viewed_date >= since).scalar() or 0
+    scanned = scan_record_aggregates(db, since=recent_since())
+    total_records, rating_sum, rating_count = scanned["total"]
+    rating_distribution = [{"range": bucket, "count": count} for bucket, count in scanned["rating"].items()]
+    mood_stats = sorted(
+        ({"name": name, "value": count} for name, count in scanned["mood"].items() if count),
+        key=lambda item: item["name"],
+    )
+    viewing_method_stats = sorted(
+        ({"name": name, "value": count} for name, count in scanned["method"].items() if count),
+        key=lambda item: item["name"],
+    )
 
     genre_stats = []
     genre_results = (
@@ -69,41 +106,28 @@ def _compute_overview(db: Session) -> Dict:
             top_genre = genre
             top_genre_count = count
 
-    mood_stats = []
-    mood_results = (
-        db.query(Record.mood, func.count(Record.id).label("count"))
-        .filter(Record.mood.isnot(None))
-        .group_by(Record.mood)
-        .all()
-    )
-    for mood, count in mood_results:
-        if mood:
-            mood_stats.append({"name": mood.value if hasattr(mood, "value") else mood, "value": count})
-
-    viewing_method_stats = []
-    viewing_results = db.query(Record.viewing_method, func.count(Record.id).label("count")).group_by(Record.viewing_method).all()
-    for method, count in viewing_results:
-        if method:
-            viewing_method_stats.append({"name": method.value if hasattr(method, "value") else method, "value": count})
-
-    rating_distribution = []
-    for i in range(5):
-        rating_min = i + 1
-        rating_max = i + 2
-        count = (
-            db.query(func.count(Record.id))
-            .filter(Record.rating >= rating_min, Record.rating < rating_max)
-            .scalar()
-            or 0
-        )
-        rating_distribution.append({"range": f"{rating_min}-{rating_max}", "count": count})
+    return {
+        "total_movies": total_movies,
+        "total_records": total_records,
+        "recent_90_days": scanned["recent"],
+        "top_genre": top_genre,
+        "average_rating": (rating_sum / rating_count) if rating_count else 0.0,
+        "genre_stats": genre_stats,
+        "mood_stats": mood_stats,
+        "viewing_method_stats": viewing_method_stats,
+        "rating_distribution": rating_distribution,
+        "recent_records": _recent_records(db),
+    }
+
 
+def _recent_records(db: Session, limit: int = 10) -> List[Dict]:
+    """視聴日が新しい順の記録一覧（統計画面の「最近の記録」）。"""
     recent_records = []
     recent_data = (
         db.query(Record, Movie)
         .join(Movie, Record.movie_id == Movie.id)
         .order_by(Record.viewed_date.desc())
-        .limit(10)
+        .limit(limit)
         .all()
     )
     for record, movie in recent_data:
@@ -117,26 +141,32 @@ def _compute_overview(db: Session) -> Dict:
                 "viewing_method": record.viewing_method.value if getattr(record, "viewing_method", None) else None,
             }
         )
+    return recent_records
 
-    return {
-        "total_movies": total_movies,
-        "total_records": total_records,
-        "recent_90_days": recent_90_days,
-        "top_genre": top_genre,
-        "average_rating": float(avg_rating),
-        "genre_stats": genre_stats,
-        "mood_stats": mood_stats,
-        "viewing_method_stats": viewing_method_stats,
-        "rating_distribution": rating_distribution,
-        "recent_records": recent_records,
-    }
+
+def _versioned_response(request: Request, response: Response, db: Session, endpoint: str, params: Dict, compute):
+    """
+    データ版数が同じ間は計算済みレスポンスを返し、If-None-Match が一致すれば 304 を返す。
+
+    直近90日やタイムラインは書き込みが無くても日付で変わるため、UTC 日付も版数トークンに含める。
+    ETag は計算に成功した場合のみ付ける（失敗時の代替レスポンスをクライアントに再検証させない）。
+    """
+    token = f"{get_data_version(db)}:{datetime.utcnow().date().isoformat()}"
+    etag = _response_cache.make_etag(endpoint, params, token)
+    if _response_cache.etag_matches(request.headers.get("if-none-match"), etag):
+        _response_cache.record_not_modified()
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    body = _response_cache.get_or_compute(endpoint, params, token, compute)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return body
 
 
 @router.get("/overview", response_model=StatisticsResponse)
-async def get_statistics(db: Session = Depends(get_db)):
+def get_statistics(request: Request, response: Response, db: Session = Depends(get_db)):
     """統一統計情報を取得（正規エンドポイント）。"""
     try:
-        return _compute_overview(db)
+        return _versioned_response(request, response, db, "overview", {}, lambda: _compute_overview(db))
     except Exception as e:
         print(f"統計取得エラー: {e}")
         return {
@@ -154,7 +184,7 @@ async def get_statistics(db: Session = Depends(get_db)):
 
 
 @router.get("/statistics/overview", response_model=StatisticsResponse)
-async def get_statistics_legacy(response: Response, db: Session = Depends(get_db)):
+def get_statistics_legacy(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     互換エンドポイント（非推奨）。
     正規エンドポイント: /api/statistics/overview
@@ -162,69 +192,181 @@ async def get_statistics_legacy(response: Response, db: Session = Depends(get_db
     response.headers["Deprecation"] = "true"
     response.headers["Sunset"] = "Sun, 31 May 2026 23:59:59 GMT"
     response.headers["Link"] = '</api/statistics/overview>; rel="successor-version"'
-    return await get_statistics(db)
+    return get_statistics(request, response, db)
 
 
-@router.get("/timeline")
-async def get_timeline(days: int = 30, db: Session = Depends(get_db)):
-    """期間別の視聴数推移を取得。"""
-    try:
-        start_date = datetime.utcnow() - timedelta(days=days)
-
-        timeline = []
-        for i in range(days):
-            date = start_date + timedelta(days=i)
-            date_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-            date_end = date_start + timedelta(days=1)
-
-            count = (
-                db.query(func.count(Record.id))
-                .filter(Record.viewed_date >= date_start, Record.viewed_date < date_end)
-                .scalar()
-                or 0
-            )
+TIMELINE_GRANULARITIES = ("day", "week", "month", "year")
+TIMELINE_MAX_BUCKETS = 3660
 
-            timeline.append({"date": date.strftime("%Y-%m-%d"), "count": count})
 
-        return timeline
+@router.get("/timeline")
+def get_timeline(
+    request: Request,
+    response: Response,
+    days: int = Query(30),
+    granularity: str = Query("day"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+):
+    """
+    期間別の視聴数推移を取得。
+    - 既定は昨日までの直近 days 日間（from/to 指定時はその範囲。両端を含む）。from 未指定で days が0以下なら空
+    - granularity: day / week（月曜始まり）/ month / year。各要素の date は区間の開始日
+    - 範囲の端で区間の一部しか含まない週・月・年は partial=True（count はその範囲内の件数）
+    """
+    _validate_granularity(granularity)
+    if date_from is None and days <= 0:
+        # 従来どおり日数0以下は対象日なし
+        return []
+    start, end = _timeline_range(days, granularity, date_from, date_to)
+    params = {"granularity": granularity, "from": start.isoformat(), "to": end.isoformat()}
+    try:
+        return _versioned_response(
+            request, response, db, "timeline", params, lambda: _compute_timeline(db, start, end, granularity)
+        )
     except Exception as e:
         print(f"タイムライン取得エラー: {e}")
         return []
 
 
+def _validate_granularity(granularity: str) -> None:
+    if granularity not in TIMELINE_GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity は {' / '.join(TIMELINE_GRANULARITIES)} のいずれかを指定してください")
+
+
+def _timeline_range(days: int, granularity: str, date_from: Optional[date], date_to: Optional[date]) -> Tuple[date, date]:
+    """タイムラインの対象期間（両端を含む日付）を決めて検証する。"""
+    end = date_to or (datetime.utcnow().date() - timedelta(days=1))
+    start = date_from or (end - timedelta(days=days - 1))
+    if start > end:
+        raise HTTPException(status_code=400, detail="from は to 以前の日付を指定してください")
+    if _bucket_count(start, end, granularity) > TIMELINE_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"区間数が上限（{TIMELINE_MAX_BUCKETS}）を超えます。granularity を粗くしてください")
+    return start, end
+
+
+def _bucket_start(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def _next_bucket(bucket: date, granularity: str) -> date:
+    if granularity == "week":
+        return bucket + timedelta(days=7)
+    if granularity == "month":
+        return (bucket.replace(day=28) + timedelta(days=4)).replace(day=1)
+    if granularity == "year":
+        return bucket.replace(year=bucket.year + 1)
+    return bucket + timedelta(days=1)
+
+
+def _bucket_count(start: date, end: date, granularity: str) -> int:
+    first, last = _bucket_start(start, granularity), _bucket_start(end, granularity)
+    if granularity == "week":
+        return (last - first).days // 7 + 1
+    if granularity == "month":
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    if granularity == "year":
+        return last.year - first.year + 1
+    return (last - first).days + 1
+
+
+def _timeline_buckets(start: date, end: date, granularity: str) -> List[date]:
+    buckets = []
+    bucket = _bucket_start(start, granularity)
+    while bucket <= end:
+        buckets.append(bucket)
+        bucket = _next_bucket(bucket, granularity)
+    return buckets
+
+
+def _bucket_key_expression(granularity: str):
+    """viewed_date を区間の開始日（YYYY-MM-DD）へ丸める SQLite 式。"""
+    if granularity == "week":
+        # 'weekday 0' で直後（当日含む）の日曜へ進め、6日戻して月曜にする
+        return func.date(Record.viewed_date, "weekday 0", "-6 days")
+    if granularity == "month":
+        return func.strftime("%Y-%m-01", Record.viewed_date)
+    if granularity == "year":
+        return func.strftime("%Y-01-01", Record.viewed_date)
+    return func.date(Record.viewed_date)
+
+
+def _compute_timeline(db: Session, start: date, end: date, granularity: str = "day") -> List[Dict]:
+    """start〜end（両端を含む）の区間別視聴数。1回の GROUP BY で数え、記録のない区間は0で埋める。"""
+    bucket = _bucket_key_expression(granularity)
+    counts = dict(
+        db.query(bucket, func.count(Record.id))
+        .filter(
+            Record.viewed_date >= datetime.combine(start, time.min),
+            Record.viewed_date < datetime.combine(end + timedelta(days=1), time.min),
+        )
+        .group_by(bucket)
+        .all()
+    )
+    return [
+        {
+            "date": key.isoformat(),
+            "count": counts.get(key.isoformat(), 0),
+            "partial": key < start or _next_bucket(key, granularity) > end + timedelta(days=1),
+        }
+        for key in _timeline_buckets(start, end, granularity)
+    ]
+
+
 @router.get("/mood-recommendations")
-async def get_mood_recommendations(mood: str, db: Session = Depends(get_db)):
+def get_mood_recommendations(request: Request, response: Response, mood: str, db: Session = Depends(get_db)):
     """指定の気分で高評価の映画を取得（レコメンド）。"""
     try:
-        recommendations = []
-        results = (
-            db.query(
-                Movie,
-                func.avg(Record.rating).label("avg_rating"),
-                func.count(Record.id).label("view_count"),
-            )
-            .join(Record, Movie.id == Record.movie_id)
-            .filter(Record.mood == mood, Record.rating.isnot(None))
-            .group_by(Movie.id)
-            .order_by(func.avg(Record.rating).desc())
-            .limit(10)
-            .all()
+        return _versioned_response(
+            request, response, db, "mood-recommendations", {"mood": mood},
+            lambda: _compute_mood_recommendations(db, mood),
         )
-
-        for movie, avg_rating, view_count in results:
-            if avg_rating and avg_rating >= 3.5:
-                recommendations.append(
-                    {
-                        "id": movie.id,
-                        "title": movie.title,
-                        "genre": movie.genre,
-                        "average_rating": float(avg_rating),
-                        "play_count": view_count,
-                        "image_url": movie.image_url,
-                    }
-                )
-
-        return recommendations
     except Exception as e:
         print(f"レコメンド取得エラー: {e}")
         return []
+
+
+def _compute_mood_recommendations(db: Session, mood: str) -> List[Dict]:
+    """指定の気分で平均評価3.5以上の映画（最大10件）。"""
+    recommendations = []
+    results = (
+        db.query(
+            Movie,
+            func.avg(Record.rating).label("avg_rating"),
+            func.count(Record.id).label("view_count"),
+        )
+        .join(Record, Movie.id == Record.movie_id)
+        .filter(Record.mood == mood, Record.rating.isnot(None))
+        .group_by(Movie.id)
+        .order_by(func.avg(Record.rating).desc())
+        .limit(10)
+        .all()
+    )
+
+    for movie, avg_rating, view_count in results:
+        if avg_rating and avg_rating >= 3.5:
+            recommendations.append(
+                {
+                    "id": movie.id,
+                    "title": movie.title,
+                    "genre": movie.genre,
+                    "average_rating": float(avg_rating),
+                    "play_count": view_count,
+                    "image_url": movie.image_url,
+                }
+            )
+
+    return recommendations
+
+
+@router.get("/cache-stats")
+def get_statistics_cache_stats():
+    """統計レスポンスキャッシュの統計（ヒット/ミス/304/追い出し件数）を取得"""
+    return _response_cache.stats()
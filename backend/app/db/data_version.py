@@ -0,0 +1,40 @@
+"""
+ライブラリ（movies/records）のデータ版数
+
+movies/records への ORM 書き込みを含む flush ごとに data_versions の版数を1つ進める。
+同じトランザクション内で更新するため、ロールバックされた書き込みでは版数も戻る。
+統計レスポンスのキャッシュ/ETag はこの版数をキーにする。
+"""
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.models import DataVersion, Movie, Record
+
+LIBRARY_SCOPE = "library"
+
+
+def get_data_version(db: Session, scope: str = LIBRARY_SCOPE) -> int:
+    row = db.get(DataVersion, scope)
+    return int(row.version) if row else 0
+
+
+def bump_data_version(connection, scope: str = LIBRARY_SCOPE) -> None:
+    table = DataVersion.__table__
+    now = datetime.utcnow()
+    stmt = sqlite_insert(table).values(scope=scope, version=1, updated_at=now)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.scope],
+        set_={"version": table.c.version + 1, "updated_at": now},
+    )
+    connection.execute(stmt)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_on_library_write(session: Session, flush_context, instances) -> None:
+    for obj in (*session.new, *session.deleted, *session.dirty):
+        if isinstance(obj, (Movie, Record)) and (obj not in session.dirty or session.is_modified(obj)):
+            bump_data_version(session.connection())
+            return
@@ -2,9 +2,8 @@
 データベース設定
 """
 import os
-from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import StaticPool
+from app.db.engine import create_sqlite_engine
 
 # DB保存先
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,12 +12,8 @@ DB_PATH = os.path.join(BASE_DIR, "instance", "movies.db")
 # DBディレクトリ作成
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 
-# SQLiteエンジン設定
-engine = create_engine(
-    f"sqlite:///{DB_PATH}",
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+# SQLiteエンジン設定（WAL・PRAGMA・接続プールは app/db/engine.py）
+engine = create_sqlite_engine(DB_PATH)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -34,19 +29,35 @@ def get_db():
 def create_tables():
     """テーブル作成"""
     Base.metadata.create_all(bind=engine)
-    _apply_lightweight_migrations()
+    _apply_migrations()
+    _ensure_full_text_index()
+    _ensure_statistics_summary()
 
 
-def _apply_lightweight_migrations():
-    """
-    既存SQLiteに対する軽量マイグレーション。
-    Alembic未導入環境向けに、必要最小限のカラム追加を行う。
-    """
-    inspector = inspect(engine)
-    if "movies" not in inspector.get_table_names():
-        return
+def _apply_migrations():
+    """既存SQLiteへ未適用のスキーマ移行（カラム・インデックス追加）を適用する。"""
+    from app.db.migrations import apply_migrations
+
+    apply_migrations(engine)
+
+
+def _ensure_full_text_index():
+    """映画の全文検索用 FTS5 テーブルと同期トリガーを作成する。"""
+    from app.db.movie_fts import ensure_movie_fts
 
-    movie_columns = {col["name"] for col in inspector.get_columns("movies")}
     with engine.begin() as conn:
-        if "release_date" not in movie_columns:
-            conn.execute(text("ALTER TABLE movies ADD COLUMN release_date DATETIME"))
+        ensure_movie_fts(conn)
+
+
+def _ensure_statistics_summary():
+    """統計サマリーが未構築なら既存の records/movies から構築する。"""
+    from app.db.statistics_summary import is_statistics_built, rebuild_statistics
+
+    db = SessionLocal()
+    try:
+        if not is_statistics_built(db):
+            rows = rebuild_statistics(db)
+            db.commit()
+            print(f"[DEBUG] 統計サマリーを構築しました: {rows} 行")
+    finally:
+        db.close()
@@ -0,0 +1,92 @@
+"""
+SQLite エンジン設定（接続プール・PRAGMA）
+
+接続ごとに PRAGMA を設定する connect フックと、接続プールつきエンジンを作る。
+WAL モードでは書き込み（同期など）のトランザクション中でも別接続からの読み取りが進む。
+
+環境変数（未設定時は既定値）:
+  SQLITE_JOURNAL_MODE      journal_mode（WAL）
+  SQLITE_SYNCHRONOUS       synchronous（NORMAL。WAL ではコミット時の fsync を省いても破損しない）
+  SQLITE_MMAP_SIZE         mmap_size バイト数（256MiB）
+  SQLITE_CACHE_SIZE        cache_size（-65536 = 64MiB。負値は KiB 指定）
+  SQLITE_BUSY_TIMEOUT_MS   busy_timeout ミリ秒（5000）
+  DB_POOL_SIZE             常時保持する接続数（5）
+  DB_MAX_OVERFLOW          一時的に追加できる接続数（10）
+"""
+import os
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from agent.scrapers.http_client import env_number
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": "268435456",
+    "cache_size": "-65536",
+    "busy_timeout": "5000",
+}
+
+_PRAGMA_ENV = {
+    "journal_mode": "SQLITE_JOURNAL_MODE",
+    "synchronous": "SQLITE_SYNCHRONOUS",
+    "mmap_size": "SQLITE_MMAP_SIZE",
+    "cache_size": "SQLITE_CACHE_SIZE",
+    "busy_timeout": "SQLITE_BUSY_TIMEOUT_MS",
+}
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+
+
+def sqlite_pragmas() -> Dict[str, str]:
+    """接続時に設定する PRAGMA（環境変数で上書き可）。"""
+    pragmas = {}
+    for name, default in DEFAULT_PRAGMAS.items():
+        value = (os.getenv(_PRAGMA_ENV[name]) or "").strip()
+        if value and not value.lstrip("-").isalnum():
+            print(f"[WARN] {_PRAGMA_ENV[name]} の値が不正なため既定値を使用します: {value}")
+            value = ""
+        pragmas[name] = value or default
+    return pragmas
+
+
+def configure_sqlite_connection(dbapi_connection, pragmas: Dict[str, str]) -> None:
+    """DBAPI 接続へ PRAGMA を設定する。"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def create_sqlite_engine(
+    db_path: str,
+    pragmas: Optional[Dict[str, str]] = None,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+) -> Engine:
+    """
+    ファイル SQLite 用のエンジンを作る。
+    接続は QueuePool で使い回し、リクエスト（スレッド）ごとに別接続を割り当てる。
+    FastAPI のスレッドプール間で接続が受け渡されるため check_same_thread は無効にする
+    （プールが同時に1スレッドだけへ貸し出すので安全）。
+    """
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=max(1, pool_size if pool_size is not None else env_number("DB_POOL_SIZE", DEFAULT_POOL_SIZE, int)),
+        max_overflow=max(0, max_overflow if max_overflow is not None else env_number("DB_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW, int)),
+    )
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, _connection_record):
+        configure_sqlite_connection(dbapi_connection, pragmas)
+
+    return engine
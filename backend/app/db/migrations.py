@@ -0,0 +1,112 @@
+"""
+スキーマ移行（番号つきマイグレーション）
+
+create_all は既存テーブルへのカラム・インデックス追加を行わないため、
+既存 SQLite に必要な変更を番号順に適用し、適用済み番号を schema_migrations に記録する。
+各マイグレーションは冪等に書く（create_all 済みの新規DBでも適用済みとして記録されるだけになる）。
+"""
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+
+def _add_movies_release_date(conn: Connection) -> None:
+    movie_columns = {col["name"] for col in inspect(conn).get_columns("movies")}
+    if "release_date" not in movie_columns:
+        conn.execute(text("ALTER TABLE movies ADD COLUMN release_date DATETIME"))
+
+
+def _add_records_pagination_index(conn: Connection) -> None:
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_records_viewed_date_id ON records (viewed_date, id)"))
+
+
+def _add_query_indexes(conn: Connection) -> None:
+    # 気分別おすすめ（mood 絞り込み + rating + movie_id 集計）を表参照なしで賄う
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_records_mood_rating_movie_id ON records (mood, rating, movie_id)"))
+    # 評価分布・統計サマリー再構築の評価別集計用
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_records_rating ON records (rating)"))
+    # ジャンル別集計用
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_movies_genre ON movies (genre)"))
+
+
+def _add_records_unique_movie_viewed_date(conn: Connection) -> Optional[str]:
+    duplicates = conn.execute(text(
+        "SELECT COUNT(*) FROM (SELECT 1 FROM records GROUP BY movie_id, viewed_date HAVING COUNT(*) > 1)"
+    )).scalar()
+    if duplicates:
+        # 重複がある間は一意制約を張れないため、同じ列の通常インデックスで検索だけ速くしておく
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_records_movie_id_viewed_date ON records (movie_id, viewed_date)"
+        ))
+        return f"(movie_id, viewed_date) が重複する記録が {duplicates} 組あります"
+    conn.execute(text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_records_movie_id_viewed_date ON records (movie_id, viewed_date)"
+    ))
+    conn.execute(text("DROP INDEX IF EXISTS ix_records_movie_id_viewed_date"))
+    return None
+
+
+def _add_sync_jobs_owner(conn: Connection) -> None:
+    job_columns = {col["name"] for col in inspect(conn).get_columns("sync_jobs")}
+    for name, column_type in (("owner_host", "VARCHAR(255)"), ("owner_pid", "INTEGER"), ("owner_token", "VARCHAR(32)")):
+        if name not in job_columns:
+            conn.execute(text(f"ALTER TABLE sync_jobs ADD COLUMN {name} {column_type}"))
+
+
+def _add_sync_state_viewed_date(conn: Connection) -> None:
+    state_columns = {col["name"] for col in inspect(conn).get_columns("eiga_sync_states")}
+    if "last_seen_viewed_date" not in state_columns:
+        conn.execute(text("ALTER TABLE eiga_sync_states ADD COLUMN last_seen_viewed_date DATETIME"))
+
+
+# マイグレーション関数は適用を見送る場合にその理由を返す（未適用のまま次回起動時に再試行する）
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], Optional[str]]]] = [
+    (1, "movies.release_date カラム追加", _add_movies_release_date),
+    (2, "records 一覧ページング用インデックス", _add_records_pagination_index),
+    (3, "records/movies の絞り込み・集計用インデックス", _add_query_indexes),
+    (4, "records (movie_id, viewed_date) 一意インデックス", _add_records_unique_movie_viewed_date),
+    (5, "sync_jobs 起動元プロセスのカラム追加", _add_sync_jobs_owner),
+    (6, "eiga_sync_states.last_seen_viewed_date カラム追加", _add_sync_state_viewed_date),
+]
+
+
+def _ensure_migrations_table(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL, applied_at DATETIME NOT NULL)"
+        ))
+
+
+def applied_versions(engine: Engine) -> List[int]:
+    _ensure_migrations_table(engine)
+    with engine.connect() as conn:
+        return [row[0] for row in conn.execute(text("SELECT version FROM schema_migrations ORDER BY version"))]
+
+
+def apply_migrations(engine: Engine) -> List[int]:
+    """
+    未適用のマイグレーションを番号順に適用し、今回適用した番号を返す。
+    マイグレーションごとに1トランザクションで適用と記録を行う。見送りの場合は
+    その中で行った代替処理のみ確定し、未適用のまま次へ進む。
+    """
+    done = set(applied_versions(engine))
+    applied = []
+    for version, name, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            deferred = migrate(conn)
+            if not deferred:
+                conn.execute(
+                    text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:version, :name, :applied_at)"),
+                    {"version": version, "name": name, "applied_at": datetime.utcnow()},
+                )
+        if deferred:
+            print(f"[WARN] マイグレーション {version}（{name}）を見送りました: {deferred}")
+            continue
+        applied.append(version)
+        print(f"[DEBUG] マイグレーション {version} を適用しました: {name}")
+    return applied
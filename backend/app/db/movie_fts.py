@@ -0,0 +1,145 @@
+"""
+映画の全文検索（SQLite FTS5 + trigram トークナイザ）
+"""
+import re
+from typing import List, Tuple
+
+from sqlalchemy import or_, text
+from sqlalchemy.orm import Session
+
+from app.models.models import Movie
+
+FTS_TABLE = "movies_fts"
+FTS_COLUMNS = ("title", "director", "cast", "genre", "synopsis")
+# bm25 の列重み（FTS_COLUMNS と同順）。タイトル一致を最優先にする
+FTS_WEIGHTS = (10.0, 5.0, 3.0, 2.0, 1.0)
+# trigram は3文字未満の語を照合できないため、それより短い語を含む検索は LIKE で行う
+TRIGRAM_MIN_LENGTH = 3
+
+_COLUMN_LIST = ", ".join(f'"{c}"' for c in FTS_COLUMNS)
+_NEW_VALUES = ", ".join(f'new."{c}"' for c in FTS_COLUMNS)
+_OLD_VALUES = ", ".join(f'old."{c}"' for c in FTS_COLUMNS)
+
+_TRIGGERS = {
+    "movies_fts_ai": f"""
+        CREATE TRIGGER movies_fts_ai AFTER INSERT ON movies BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) VALUES (new.id, {_NEW_VALUES});
+        END
+    """,
+    "movies_fts_ad": f"""
+        CREATE TRIGGER movies_fts_ad AFTER DELETE ON movies BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMN_LIST}) VALUES ('delete', old.id, {_OLD_VALUES});
+        END
+    """,
+    "movies_fts_au": f"""
+        CREATE TRIGGER movies_fts_au AFTER UPDATE ON movies BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMN_LIST}) VALUES ('delete', old.id, {_OLD_VALUES});
+            INSERT INTO {FTS_TABLE}(rowid, {_COLUMN_LIST}) VALUES (new.id, {_NEW_VALUES});
+        END
+    """,
+}
+
+
+def ensure_movie_fts(conn) -> bool:
+    """
+    movies を外部コンテンツとする FTS5 テーブルと同期トリガーを用意する。
+
+    テーブルを新規作成した場合は既存行から索引を再構築する。
+    FTS5/trigram が使えない SQLite では何もせず False を返す（検索は LIKE で行う）。
+    """
+    existing = {
+        row[0]
+        for row in conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE 'movies_fts%'"
+        ))
+    }
+    created = FTS_TABLE not in existing
+    if created:
+        try:
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                f"{_COLUMN_LIST}, content='movies', content_rowid='id', tokenize='trigram')"
+            ))
+        except Exception as e:
+            print(f"[WARN] FTS5(trigram) を利用できないため映画検索は LIKE で行います: {e}")
+            return False
+    for name, ddl in _TRIGGERS.items():
+        if name not in existing:
+            conn.execute(text(ddl))
+    if created:
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    return True
+
+
+def is_movie_fts_available(db: Session) -> bool:
+    row = db.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+    ), {"name": FTS_TABLE}).first()
+    return row is not None
+
+
+def split_search_terms(query: str) -> List[str]:
+    return [term for term in re.split(r"\s+", (query or "").strip()) if term]
+
+
+def _fts_match_expression(terms: List[str]) -> str:
+    # 各語をフレーズとして引用し、演算子として解釈されないようにする（語は AND 結合）
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def search_movies(db: Session, query: str, limit: int = 20, offset: int = 0) -> Tuple[int, List[Movie]]:
+    """
+    ローカルの映画を全文検索する。
+
+    Returns:
+        (総件数, 関連度順の Movie リスト[offset:offset+limit])
+    """
+    terms = split_search_terms(query)
+    if not terms:
+        return 0, []
+    if all(len(term) >= TRIGRAM_MIN_LENGTH for term in terms) and is_movie_fts_available(db):
+        return _search_with_fts(db, terms, limit, offset)
+    return _search_with_like(db, terms, limit, offset)
+
+
+def _search_with_fts(db: Session, terms: List[str], limit: int, offset: int) -> Tuple[int, List[Movie]]:
+    match = _fts_match_expression(terms)
+    total = db.execute(
+        text(f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"),
+        {"match": match},
+    ).scalar() or 0
+    if not total:
+        return 0, []
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    rows = db.execute(
+        text(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match "
+            f"ORDER BY bm25({FTS_TABLE}, {weights}), rowid LIMIT :limit OFFSET :offset"
+        ),
+        {"match": match, "limit": limit, "offset": offset},
+    ).all()
+    ids = [row[0] for row in rows]
+    return total, _movies_in_order(db, ids)
+
+
+def _search_with_like(db: Session, terms: List[str], limit: int, offset: int) -> Tuple[int, List[Movie]]:
+    columns = [getattr(Movie, c) for c in FTS_COLUMNS]
+    patterns = [
+        "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        for term in terms
+    ]
+    query = db.query(Movie)
+    for pattern in patterns:
+        query = query.filter(or_(*[col.like(pattern, escape="\\") for col in columns]))
+    total = query.count()
+    # タイトルに一致する語が多いものを先頭にする
+    title_hits = [Movie.title.like(pattern, escape="\\").desc() for pattern in patterns]
+    ordered = query.order_by(*title_hits, Movie.id)
+    return total, ordered.offset(offset).limit(limit).all()
+
+
+def _movies_in_order(db: Session, ids: List[int]) -> List[Movie]:
+    if not ids:
+        return []
+    by_id = {movie.id: movie for movie in db.query(Movie).filter(Movie.id.in_(ids)).all()}
+    return [by_id[i] for i in ids if i in by_id]
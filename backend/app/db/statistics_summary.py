@@ -0,0 +1,349 @@
+"""
+統計サマリー（statistics_buckets）の差分更新・再構築・読み出し
+
+records/movies の ORM 書き込み（記録 API・同期・映画登録）を before_flush で捕捉し、
+件数・評価帯・ジャンル/気分/視聴方法別件数・日別件数を同じトランザクション内で加減算する。
+Core の一括 UPDATE/DELETE などセッションを経由しない書き込みは反映されないため、
+その場合は `scripts/rebuild-statistics.py` で再構築する。
+"""
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.models import Mood, Movie, Record, StatisticsBucket, ViewingMethod
+
+KIND_TOTAL = "total"
+KIND_MOVIES = "movies"
+KIND_RATING = "rating"
+KIND_GENRE = "genre"
+KIND_MOOD = "mood"
+KIND_METHOD = "method"
+KIND_DAY = "day"
+KIND_META = "meta"
+
+META_BUILT_KEY = "built"
+RATING_BUCKETS = tuple(f"{i}-{i + 1}" for i in range(1, 6))
+RECENT_DAYS = 90
+
+_RECORD_FIELDS = ("movie_id", "rating", "mood", "viewing_method", "viewed_date")
+
+
+def rating_bucket(rating: Optional[float]) -> Optional[str]:
+    """評価値の帯（"1-2" … "5-6"）。範囲外・未評価は None。"""
+    if rating is None:
+        return None
+    lower = int(math.floor(rating))
+    if 1 <= lower <= 5:
+        return f"{lower}-{lower + 1}"
+    return None
+
+
+def recent_since(now: Optional[datetime] = None) -> datetime:
+    """直近90日の起点（日単位。90日前の 0:00）。"""
+    now = now or datetime.utcnow()
+    return (now - timedelta(days=RECENT_DAYS)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _enum_value(value):
+    return value.value if hasattr(value, "value") else value
+
+
+def _day_key(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime("%Y-%m-%d") if value else None
+
+
+class StatisticsDeltas:
+    """(kind, key) ごとの件数・評価合計・評価件数の増減。"""
+
+    def __init__(self):
+        self.values: Dict[Tuple[str, str], List] = {}
+
+    def add(self, kind: str, key: str, sign: int, rating: Optional[float] = None, weight: int = 1) -> None:
+        entry = self.values.setdefault((kind, key), [0, 0.0, 0])
+        entry[0] += sign * weight
+        if rating is not None:
+            entry[1] += sign * rating
+            entry[2] += sign * weight
+
+    def add_record(self, values: Dict, genre: Optional[str], sign: int) -> None:
+        rating = values.get("rating")
+        self.add(KIND_TOTAL, "", sign, rating)
+        bucket = rating_bucket(rating)
+        if bucket:
+            self.add(KIND_RATING, bucket, sign)
+        if genre:
+            self.add(KIND_GENRE, genre, sign, rating)
+        mood = _enum_value(values.get("mood"))
+        if mood:
+            self.add(KIND_MOOD, mood, sign)
+        method = _enum_value(values.get("viewing_method"))
+        if method:
+            self.add(KIND_METHOD, method, sign)
+        day = _day_key(values.get("viewed_date"))
+        if day:
+            self.add(KIND_DAY, day, sign)
+
+    def apply(self, connection) -> None:
+        table = StatisticsBucket.__table__
+        now = datetime.utcnow()
+        for (kind, key), (count, rating_sum, rating_count) in self.values.items():
+            if not count and not rating_count and not rating_sum:
+                continue
+            stmt = sqlite_insert(table).values(
+                kind=kind, key=key, count=count, rating_sum=rating_sum, rating_count=rating_count, updated_at=now,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.kind, table.c.key],
+                set_={
+                    "count": table.c.count + stmt.excluded.count,
+                    "rating_sum": table.c.rating_sum + stmt.excluded.rating_sum,
+                    "rating_count": table.c.rating_count + stmt.excluded.rating_count,
+                    "updated_at": now,
+                },
+            )
+            connection.execute(stmt)
+
+
+def _previous_values(obj, fields) -> Dict:
+    """flush 前（DB 上）の値。変更された属性は履歴の旧値を使う。"""
+    state = inspect(obj)
+    values = {}
+    for name in fields:
+        history = state.attrs[name].history
+        values[name] = history.deleted[0] if history.deleted else getattr(obj, name)
+    return values
+
+
+def _current_values(obj, fields) -> Dict:
+    return {name: getattr(obj, name) for name in fields}
+
+
+def _has_changes(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in fields)
+
+
+def _collect_deltas(session: Session) -> StatisticsDeltas:
+    deltas = StatisticsDeltas()
+    genres: Dict[int, Optional[str]] = {}
+
+    def genre_of(movie_id, movie=None):
+        if movie is not None:
+            return movie.genre
+        if movie_id is None:
+            return None
+        if movie_id not in genres:
+            found = session.get(Movie, movie_id)
+            genres[movie_id] = found.genre if found else None
+        return genres[movie_id]
+
+    # 1) 映画の増減と、ジャンル変更に伴う既存記録の付け替え（DB 上の値で移す）
+    for obj in session.new:
+        if isinstance(obj, Movie):
+            deltas.add(KIND_MOVIES, "", 1)
+    for obj in session.deleted:
+        if isinstance(obj, Movie):
+            deltas.add(KIND_MOVIES, "", -1)
+    for obj in session.dirty:
+        if not isinstance(obj, Movie) or obj.id is None or not _has_changes(obj, ("genre",)):
+            continue
+        old_genre = _previous_values(obj, ("genre",))["genre"]
+        new_genre = obj.genre
+        if old_genre == new_genre:
+            continue
+        count, rating_sum, rating_count = session.execute(
+            select(func.count(Record.id), func.coalesce(func.sum(Record.rating), 0.0), func.count(Record.rating))
+            .where(Record.movie_id == obj.id)
+        ).one()
+        for genre, sign in ((old_genre, -1), (new_genre, 1)):
+            if genre and count:
+                entry = deltas.values.setdefault((KIND_GENRE, genre), [0, 0.0, 0])
+                entry[0] += sign * count
+                entry[1] += sign * float(rating_sum)
+                entry[2] += sign * rating_count
+
+    # 2) 記録の増減（ジャンルは所属映画の現在値で判定する）
+    for obj in session.new:
+        if isinstance(obj, Record):
+            deltas.add_record(_current_values(obj, _RECORD_FIELDS), genre_of(obj.movie_id, obj.__dict__.get("movie")), 1)
+    for obj in session.deleted:
+        if isinstance(obj, Record):
+            values = _previous_values(obj, _RECORD_FIELDS)
+            deltas.add_record(values, genre_of(values["movie_id"]), -1)
+    for obj in session.dirty:
+        if not isinstance(obj, Record) or not _has_changes(obj, _RECORD_FIELDS):
+            continue
+        old_values = _previous_values(obj, _RECORD_FIELDS)
+        deltas.add_record(old_values, genre_of(old_values["movie_id"]), -1)
+        deltas.add_record(_current_values(obj, _RECORD_FIELDS), genre_of(obj.movie_id, obj.__dict__.get("movie")), 1)
+    return deltas
+
+
+@event.listens_for(Session, "before_flush")
+def _track_statistics(session: Session, flush_context, instances) -> None:
+    if not any(isinstance(obj, (Movie, Record)) for obj in (*session.new, *session.dirty, *session.deleted)):
+        return
+    with session.no_autoflush:
+        deltas = _collect_deltas(session)
+    if deltas.values:
+        deltas.apply(session.connection())
+
+
+# --- 再構築 ---------------------------------------------------------------
+
+
+def scan_record_aggregates(db: Session, since: Optional[datetime] = None) -> Dict:
+    """
+    records を1回走査（条件付き集計）して、件数・評価合計・評価帯別・気分/視聴方法別件数を求める。
+
+    since を渡すとその日時以降の件数（"recent"）も同じ走査で数える。
+    """
+    def count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    columns = [func.count(Record.id), func.sum(Record.rating), func.count(Record.rating)]
+    columns += [count_if((Record.rating >= i) & (Record.rating < i + 1)) for i in range(1, 6)]
+    columns += [count_if(Record.mood == mood) for mood in Mood]
+    columns += [count_if(Record.viewing_method == method) for method in ViewingMethod]
+    if since is not None:
+        columns.append(count_if(Record.viewed_date >= since))
+    row = list(db.query(*columns).one())
+
+    count, rating_sum, rating_count = row[:3]
+    values = [int(value or 0) for value in row[3:]]
+    ratings, values = values[:len(RATING_BUCKETS)], values[len(RATING_BUCKETS):]
+    moods, values = values[:len(Mood)], values[len(Mood):]
+    methods, values = values[:len(ViewingMethod)], values[len(ViewingMethod):]
+    return {
+        "total": (count or 0, float(rating_sum or 0.0), rating_count or 0),
+        KIND_RATING: dict(zip(RATING_BUCKETS, ratings)),
+        KIND_MOOD: {mood.value: value for mood, value in zip(Mood, moods)},
+        KIND_METHOD: {method.value: value for method, value in zip(ViewingMethod, methods)},
+        "recent": values[0] if since is not None else None,
+    }
+
+
+def is_statistics_built(db: Session) -> bool:
+    return db.get(StatisticsBucket, (KIND_META, META_BUILT_KEY)) is not None
+
+
+def rebuild_statistics(db: Session) -> int:
+    """
+    records/movies を走査して statistics_buckets を作り直す（commit は呼び出し側）。
+
+    集計値が変わりうるため、同じトランザクションで data_versions の版数も進めて統計レスポンスのキャッシュを無効化する。
+
+    Returns:
+        作成した集計行の数
+    """
+    deltas = StatisticsDeltas()
+    deltas.add(KIND_MOVIES, "", 1, weight=db.query(func.count(Movie.id)).scalar() or 0)
+
+    # 件数・評価帯・気分・視聴方法は records の1回の走査で求める
+    scanned = scan_record_aggregates(db)
+    _add_aggregate(deltas, KIND_TOTAL, "", scanned["total"])
+    for kind in (KIND_RATING, KIND_MOOD, KIND_METHOD):
+        for key, count in scanned[kind].items():
+            if count:
+                deltas.add(kind, key, 1, weight=count)
+
+    rows = (
+        db.query(Movie.genre, func.count(Record.id), func.sum(Record.rating), func.count(Record.rating))
+        .join(Record, Movie.id == Record.movie_id)
+        .filter(Movie.genre.isnot(None), Movie.genre != "")
+        .group_by(Movie.genre)
+    )
+    for genre, *aggregate in rows:
+        _add_aggregate(deltas, KIND_GENRE, genre, aggregate)
+
+    day = func.date(Record.viewed_date)
+    for key, count in db.query(day, func.count(Record.id)).filter(Record.viewed_date.isnot(None)).group_by(day):
+        deltas.add(KIND_DAY, key, 1, weight=count)
+
+    deltas.add(KIND_META, META_BUILT_KEY, 1)
+
+    # data_version も models 読み込み時に登録されるモジュールのため、循環を避けてここで読み込む
+    from app.db.data_version import bump_data_version
+
+    db.query(StatisticsBucket).delete(synchronize_session=False)
+    deltas.apply(db.connection())
+    bump_data_version(db.connection())
+    return len(deltas.values)
+
+
+def _add_aggregate(deltas: StatisticsDeltas, kind: str, key: str, aggregate) -> None:
+    count, rating_sum, rating_count = aggregate
+    entry = deltas.values.setdefault((kind, key), [0, 0.0, 0])
+    entry[0] += count or 0
+    entry[1] += float(rating_sum or 0.0)
+    entry[2] += rating_count or 0
+
+
+# --- 読み出し -------------------------------------------------------------
+
+
+def read_statistics_summary(db: Session, now: Optional[datetime] = None) -> Dict:
+    """
+    サマリー表から概要統計（直近記録一覧を除く）を組み立てる。
+
+    日別以外の集計行（ジャンル数程度）と直近90日分の日別行のみを読む。
+    """
+    rows = db.query(StatisticsBucket).filter(StatisticsBucket.kind != KIND_DAY).all()
+    by_kind: Dict[str, List[StatisticsBucket]] = {}
+    for row in rows:
+        by_kind.setdefault(row.kind, []).append(row)
+
+    def single(kind):
+        items = by_kind.get(kind) or []
+        return items[0] if items else None
+
+    total = single(KIND_TOTAL)
+    movies = single(KIND_MOVIES)
+    since_key = _day_key(recent_since(now))
+    recent_90_days = (
+        db.query(func.coalesce(func.sum(StatisticsBucket.count), 0))
+        .filter(StatisticsBucket.kind == KIND_DAY, StatisticsBucket.key >= since_key)
+        .scalar()
+        or 0
+    )
+
+    genre_stats = []
+    top_genre = None
+    top_genre_count = -1
+    for row in sorted(by_kind.get(KIND_GENRE, []), key=lambda r: r.key):
+        if row.count <= 0:
+            continue
+        genre_stats.append({
+            "name": row.key,
+            "value": row.count,
+            "average_rating": (row.rating_sum / row.rating_count) if row.rating_count else 0.0,
+        })
+        if row.count > top_genre_count:
+            top_genre = row.key
+            top_genre_count = row.count
+
+    def histogram(kind):
+        return [
+            {"name": row.key, "value": row.count}
+            for row in sorted(by_kind.get(kind, []), key=lambda r: r.key)
+            if row.count > 0
+        ]
+
+    rating_counts = {row.key: row.count for row in by_kind.get(KIND_RATING, [])}
+    return {
+        "total_movies": movies.count if movies else 0,
+        "total_records": total.count if total else 0,
+        "recent_90_days": int(recent_90_days),
+        "top_genre": top_genre,
+        "average_rating": (total.rating_sum / total.rating_count) if total and total.rating_count else 0.0,
+        "genre_stats": genre_stats,
+        "mood_stats": histogram(KIND_MOOD),
+        "viewing_method_stats": histogram(KIND_METHOD),
+        "rating_distribution": [
+            {"range": bucket, "count": max(0, rating_counts.get(bucket, 0))} for bucket in RATING_BUCKETS
+        ],
+    }
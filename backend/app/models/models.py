@@ -1,7 +1,7 @@
 """
 データモデル定義
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Enum, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -13,7 +13,7 @@ class Movie(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True)
-    genre = Column(String(255))
+    genre = Column(String(255), index=True)
     release_date = Column(DateTime)
     released_year = Column(Integer)
     director = Column(String(255))
@@ -62,6 +62,18 @@ class Record(Base):
     # リレーション
     movie = relationship("Movie", back_populates="records")
 
+    # 既存DBへは app.db.migrations で同名のインデックスを作成する
+    __table_args__ = (
+        # 同じ作品・同じ視聴日時の記録は1件のみ（同期の重複判定・movie_id での結合にも使う）
+        Index("uq_records_movie_id_viewed_date", "movie_id", "viewed_date", unique=True),
+        # 一覧のキーセットページング（視聴日, ID 順）用
+        Index("ix_records_viewed_date_id", "viewed_date", "id"),
+        # 気分別おすすめ（mood 絞り込み + rating + movie_id 集計）用
+        Index("ix_records_mood_rating_movie_id", "mood", "rating", "movie_id"),
+        # 評価分布の集計用
+        Index("ix_records_rating", "rating"),
+    )
+
 class EigaComCredentials(Base):
     """映画.com ログイン情報"""
     __tablename__ = "eiga_credentials"
@@ -73,3 +85,89 @@ class EigaComCredentials(Base):
     last_sync = Column(DateTime, nullable=True)  # 最後の同期日時
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class EigaSyncState(Base):
+    """映画.com 同期状態（アカウントごとの差分同期の基準点）"""
+    __tablename__ = "eiga_sync_states"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    account_key = Column(String(255), nullable=False, unique=True)  # 映画.com ユーザーID（不明時はメール）
+    last_seen_external_id = Column(String(255))  # 前回同期時の最新（sort=new 先頭）作品ID
+    last_seen_viewed_date = Column(DateTime)  # 同 視聴日（再鑑賞と区別するため作品IDと組で基準点にする）
+    last_sync = Column(DateTime)
+    last_full_sync = Column(DateTime)  # 全ページを巡回した最終日時
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class StatisticsBucket(Base):
+    """統計サマリー（records/movies の書き込み時に差分更新する集計値）"""
+    __tablename__ = "statistics_buckets"
+    
+    kind = Column(String(32), primary_key=True)  # total / movies / rating / genre / mood / method / day / meta
+    key = Column(String(255), primary_key=True, default="")  # ジャンル名・気分・視聴方法・評価帯（"1-2"）・日付（YYYY-MM-DD）
+    count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Float, nullable=False, default=0.0)  # 評価ありレコードの評価合計（平均算出用）
+    rating_count = Column(Integer, nullable=False, default=0)  # 評価ありレコード数
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DataVersion(Base):
+    """データ版数（movies/records の書き込みごとに加算。統計レスポンスのキャッシュキー/ETag に使う）"""
+    __tablename__ = "data_versions"
+    
+    scope = Column(String(32), primary_key=True)  # library（movies/records）
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SyncJob(Base):
+    """映画.com 同期ジョブ（別プロセスのワーカーが進捗・結果を書き戻す）"""
+    __tablename__ = "sync_jobs"
+    
+    id = Column(String(32), primary_key=True)
+    account_key = Column(String(255), nullable=False)  # 同時実行を1件に絞る単位（email:{メール} / interactive）
+    status = Column(String(16), nullable=False, default="queued")  # queued / running / succeeded / failed / cancelled
+    options = Column(Text)  # 開始時の指定（JSON。パスワードは含めない）
+    page = Column(Integer, nullable=False, default=0)  # 処理中の一覧ページ番号
+    fetched = Column(Integer, nullable=False, default=0)  # 一覧から取得した件数
+    processed = Column(Integer, nullable=False, default=0)  # DB へ反映した行数
+    added = Column(Integer, nullable=False, default=0)
+    existing = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    message = Column(Text)
+    result = Column(Text)  # 完了時の同期結果（JSON。/sync のレスポンスと同じ形）
+    cancel_requested = Column(Boolean, nullable=False, default=False)  # 他の API プロセスからの中止要求もここで伝える
+    owner_host = Column(String(255))  # ジョブを起動した API プロセスのホスト名
+    owner_pid = Column(Integer)  # 同 PID
+    owner_token = Column(String(32))  # 同プロセスの識別子（PID の再利用と区別する）
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # 実行中（queued/running）のジョブはアカウントごとに1件まで
+        Index(
+            "uq_sync_jobs_active_account",
+            "account_key",
+            unique=True,
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+    )
+
+
+class MovieEnrichment(Base):
+    """映画詳細の後追い取得（enrichment ワーカー）の試行状況"""
+    __tablename__ = "movie_enrichment"
+    
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)  # 詳細取得の試行回数（成功・失敗とも加算）
+    last_attempt_at = Column(DateTime)
+    next_attempt_at = Column(DateTime)  # 失敗時の再試行可能時刻（指数バックオフ）
+    last_error = Column(Text)
+    completed_at = Column(DateTime)  # 詳細を反映できた時刻（以後は対象外）
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# 書き込み時に統計サマリー・データ版数を更新する flush フックを登録する
+from app.db import data_version, statistics_summary  # noqa: E402,F401
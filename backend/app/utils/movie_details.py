@@ -0,0 +1,61 @@
+"""
+映画詳細（映画.com の詳細ページ）を Movie へ反映するユーティリティ
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, or_
+
+from app.models.models import Movie
+from app.utils.cast_utils import dump_cast_text, is_cast_empty, parse_cast_text
+
+# 詳細再取得で更新対象になる項目（cast 以外はそのまま代入する）。
+# release_date は詳細ページから取得できない（一覧ページの同期でのみ入る）ため含めない
+DETAIL_FIELDS = ("released_year", "director", "synopsis", "genre", "image_url")
+REFRESHABLE_FIELDS = DETAIL_FIELDS + ("cast",)
+
+
+def is_empty_value(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip() == ""
+    return False
+
+
+def missing_field_condition(field_name: str):
+    """項目が空の映画を選ぶ SQL 条件（is_empty_value / is_cast_empty の判定に合わせる）。"""
+    column = getattr(Movie, field_name)
+    if field_name == "cast":
+        return or_(column.is_(None), func.trim(column).in_(["", "[]"]))
+    if field_name == "released_year":
+        return column.is_(None)
+    return or_(column.is_(None), func.trim(column) == "")
+
+
+def build_movie_url(movie: Movie) -> Optional[str]:
+    if not movie.external_id:
+        return None
+    return f"https://eiga.com/movie/{movie.external_id}/"
+
+
+def apply_movie_details(movie: Movie, details: Dict, force: bool) -> List[str]:
+    """
+    取得した詳細を Movie に反映し、値が変わった項目名を返す（commit はしない）。
+    - force=False: 空値の項目のみ更新
+    - force=True: 全項目を上書き
+    """
+    updated_fields = []
+    for field_name in DETAIL_FIELDS:
+        current = getattr(movie, field_name)
+        if force or is_empty_value(current):
+            new_value = details.get(field_name)
+            setattr(movie, field_name, new_value)
+            if new_value != current:
+                updated_fields.append(field_name)
+
+    if force or is_cast_empty(movie.cast):
+        new_cast = dump_cast_text(details.get("cast", []))
+        if parse_cast_text(new_cast) != parse_cast_text(movie.cast):
+            updated_fields.append("cast")
+        movie.cast = new_cast
+    return updated_fields
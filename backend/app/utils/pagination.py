@@ -0,0 +1,45 @@
+"""
+キーセット（カーソル）ページングのユーティリティ
+"""
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import HTTPException, Request, Response
+
+
+def encode_cursor(values: List) -> str:
+    """並び順キーの値（例: [title, id]）を不透明なカーソル文字列へ変換する。"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """カーソル文字列を値リストへ戻す（不正な場合は 400）。"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="cursor が不正です")
+    return values
+
+
+def parse_cursor_datetime(value) -> datetime:
+    """カーソル内の ISO 形式日時を datetime へ戻す（不正な場合は 400）。"""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="cursor が不正です")
+
+
+def set_next_cursor(request: Request, response: Response, next_cursor: Optional[str], limit: int) -> None:
+    """次ページがあれば `Link: <...>; rel="next"` と `X-Next-Cursor` を付与する。"""
+    if not next_cursor:
+        return
+    url = request.url.remove_query_params("skip").include_query_params(cursor=next_cursor, limit=limit)
+    response.headers["Link"] = f'<{url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = next_cursor
@@ -0,0 +1,69 @@
+"""
+データ版数つきレスポンスキャッシュ（ETag / 304 Not Modified）
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+
+class VersionedResponseCache:
+    """
+    (エンドポイント, パラメータ, 版数トークン) をキーに計算済みレスポンスを保持する。
+
+    版数トークンが変われば別キーになるため明示的な無効化は不要で、
+    古い版数のエントリは件数上限（LRU）で追い出される。
+    """
+
+    DEFAULT_MAX_ENTRIES = 128
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, object]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0}
+
+    @staticmethod
+    def make_etag(endpoint: str, params: Dict, token: str) -> str:
+        raw = json.dumps([endpoint, params, token], sort_keys=True, ensure_ascii=False, default=str)
+        return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        if not if_none_match:
+            return False
+        candidates = [item.strip() for item in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self._stats["not_modified"] += 1
+
+    def get_or_compute(self, endpoint: str, params: Dict, token: str, compute: Callable[[], object]):
+        key = (endpoint, json.dumps(params, sort_keys=True, default=str), token)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._entries[key]
+            self._stats["misses"] += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        stats["max_entries"] = self.max_entries
+        return stats
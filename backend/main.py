@@ -5,13 +5,32 @@ import sys
 import os
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
-from app.db.database import create_tables
 
 # プロジェクトルートをPYTHONPATHに追加して、トップレベルの `agent` パッケージをimport可能にする
+# （app.db.engine も agent の設定読み取りを使うため、app より先に追加する）
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if ROOT not in sys.path:
     sys.path.append(ROOT)
 
+from app.db.database import create_tables
+from agent.scrapers.driver_pool import shutdown_default_driver_pool, warm_driver_pool_in_background
+from agent.scrapers.http_client import env_number
+from agent.tasks.enrichment import start_default_enrichment_worker, stop_default_enrichment_worker
+
+DEFAULT_THREADPOOL_SIZE = 40  # anyio の既定と同じ。API_THREADPOOL_SIZE で上書き可
+
+
+def configure_threadpool() -> int:
+    """
+    ルートハンドラ（同期 def。DB・スクレイパー処理を含む）を実行するスレッドプールの上限を設定する。
+    DB 接続数（DB_POOL_SIZE + DB_MAX_OVERFLOW）を超えた分は接続の空き待ちになる。
+    """
+    import anyio.to_thread
+
+    limit = max(1, env_number("API_THREADPOOL_SIZE", DEFAULT_THREADPOOL_SIZE, int))
+    anyio.to_thread.current_default_thread_limiter().total_tokens = limit
+    return limit
+
 def create_app():
     """FastAPI アプリケーション生成"""
     app = FastAPI(title="Movie App API", version="1.0.0")
@@ -23,12 +42,21 @@ def create_app():
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "Link", "X-Next-Cursor"],
     )
     
     # DB初期化
     @app.on_event("startup")
     async def startup():
+        configure_threadpool()
         create_tables()
+        warm_driver_pool_in_background()
+        start_default_enrichment_worker()
+
+    @app.on_event("shutdown")
+    async def shutdown():
+        stop_default_enrichment_worker()
+        shutdown_default_driver_pool()
     
     # ルート登録
     from app.api import movies, records, search, statistics, credentials
@@ -0,0 +1,66 @@
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.scrapers import http_client
+from app.db.database import get_db
+from app.models.models import Base
+
+
+@pytest.fixture(autouse=True)
+def isolated_http_cache(tmp_path, monkeypatch):
+    """共通 HTTP クライアントのディスクキャッシュをテストごとの一時ディレクトリに向ける（backend/instance を汚さない）。"""
+    monkeypatch.setenv("EIGA_HTTP_CACHE_DIR", str(tmp_path / "http_cache"))
+    http_client.set_default_http_client(None)
+    yield
+    http_client.set_default_http_client(None)
+
+
+@pytest.fixture()
+def engine():
+    """全接続で同じ DB を共有するインメモリ SQLite（テーブル作成済み）。"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def session_factory(engine):
+    """テスト用 DB へのセッションを作る。初期データはテストモジュール側で同名フィクスチャを上書きして投入する。"""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture()
+def api_client(session_factory):
+    """(router, prefix) の組を受け取り、get_db をテスト用 DB に差し替えた TestClient を返す。"""
+    def build(*routers):
+        app = FastAPI()
+        for router, prefix in routers:
+            app.include_router(router, prefix=prefix)
+
+        def override_get_db():
+            session = session_factory()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        return TestClient(app)
+
+    return build
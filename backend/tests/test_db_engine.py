@@ -0,0 +1,72 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+import threading
+
+from sqlalchemy.orm import sessionmaker
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.db.engine import create_sqlite_engine, sqlite_pragmas
+from app.models.models import Base, Movie, Record, ViewingMethod
+
+
+def test_connections_get_pragmas_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_CACHE_SIZE", "-2048")
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT_MS", "1; DROP TABLE movies")
+    pragmas = sqlite_pragmas()
+    assert pragmas["cache_size"] == "-2048"
+    assert pragmas["busy_timeout"] == "5000"
+
+    engine = create_sqlite_engine(str(tmp_path / "app.db"), pragmas=pragmas)
+    try:
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == -2048
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+    finally:
+        engine.dispose()
+
+
+def test_reads_proceed_while_a_write_transaction_is_open(tmp_path):
+    engine = create_sqlite_engine(str(tmp_path / "app.db"), pragmas=dict(sqlite_pragmas(), busy_timeout="100"))
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        seed = session_factory()
+        seed.add(Movie(title="Committed"))
+        seed.commit()
+        seed.close()
+
+        # 同期のような長い書き込みトランザクションを開いたままにする
+        writer = session_factory()
+        movie = Movie(title="Pending")
+        writer.add(movie)
+        writer.flush()
+        writer.add(Record(movie_id=movie.id, viewed_date=datetime(2026, 1, 1), viewing_method=ViewingMethod.OTHER))
+        writer.flush()
+
+        results = {}
+
+        def read():
+            reader = session_factory()
+            try:
+                results["titles"] = [title for (title,) in reader.query(Movie.title).order_by(Movie.id)]
+                results["records"] = reader.query(Record).count()
+            finally:
+                reader.close()
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join(timeout=5)
+        assert results == {"titles": ["Committed"], "records": 0}
+
+        writer.commit()
+        writer.close()
+        read()
+        assert results == {"titles": ["Committed", "Pending"], "records": 1}
+    finally:
+        engine.dispose()
@@ -0,0 +1,54 @@
+from pathlib import Path
+import sys
+import threading
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.scrapers.detail_fetcher import DetailFetcher
+
+
+def test_detail_fetcher_runs_concurrently_and_deduplicates():
+    calls = []
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fetch(url):
+        with lock:
+            calls.append(url)
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        if url.endswith("/3/"):
+            raise RuntimeError("boom")
+        return {"external_id": url.rstrip("/").split("/")[-1]}
+
+    urls = [f"https://eiga.com/movie/{i}/" for i in range(8)] + ["https://eiga.com/movie/1/"]
+    fetcher = DetailFetcher(fetch, max_workers=4, min_interval=0)
+    results = {url: (details, error) for url, details, error in fetcher.iter_details(urls)}
+
+    assert len(calls) == 8
+    assert active["peak"] > 1
+    assert active["peak"] <= 4
+    assert isinstance(results["https://eiga.com/movie/3/"][1], RuntimeError)
+    assert results["https://eiga.com/movie/5/"][0] == {"external_id": "5"}
+
+
+def test_detail_fetcher_rate_limits_per_host():
+    started = []
+
+    def fetch(url):
+        started.append(time.monotonic())
+        return {}
+
+    urls = [f"https://eiga.com/movie/{i}/" for i in range(4)]
+    fetcher = DetailFetcher(fetch, max_workers=4, min_interval=0.05)
+    list(fetcher.iter_details(urls))
+
+    started.sort()
+    gaps = [b - a for a, b in zip(started, started[1:])]
+    assert all(gap >= 0.04 for gap in gaps)
@@ -0,0 +1,111 @@
+from pathlib import Path
+import sys
+import threading
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.scrapers.driver_pool import WebDriverPool
+from agent.scrapers.eiga_scraper import MovieComScraper
+
+
+class FakeDriver:
+    def __init__(self, serial):
+        self.serial = serial
+        self.alive = True
+        self.quit_called = False
+        self.cookie_resets = 0
+        self.visited = []
+
+    @property
+    def window_handles(self):
+        if not self.alive:
+            raise RuntimeError("invalid session id")
+        return ["main"]
+
+    def delete_all_cookies(self):
+        self.cookie_resets += 1
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+        self.alive = False
+
+
+class FakeFactory:
+    def __init__(self):
+        self.launched = []
+
+    def __call__(self):
+        driver = FakeDriver(len(self.launched))
+        self.launched.append(driver)
+        return driver
+
+
+def test_pool_reuses_warm_driver_and_resets_state():
+    factory = FakeFactory()
+    pool = WebDriverPool(factory, size=2, max_uses=10, ttl=0)
+
+    with pool.borrow() as first:
+        first_driver = first.driver
+    with pool.borrow() as second:
+        assert second.driver is first_driver
+
+    assert len(factory.launched) == 1
+    assert first_driver.cookie_resets == 2
+    assert first_driver.visited[-1] == "about:blank"
+    assert pool.stats()["idle"] == 1
+
+
+def test_pool_recycles_after_max_uses_and_unhealthy_driver():
+    factory = FakeFactory()
+    pool = WebDriverPool(factory, size=1, max_uses=2, ttl=0)
+
+    for _ in range(2):
+        with pool.borrow():
+            pass
+    # 2回使ったブラウザは返却時に終了し、次は新規起動
+    assert factory.launched[0].quit_called is True
+    with pool.borrow() as item:
+        assert item.driver is factory.launched[1]
+
+    # 待機中に落ちたブラウザは貸出前のヘルスチェックで入れ替える
+    factory.launched[1].alive = False
+    with pool.borrow() as item:
+        assert item.driver is factory.launched[2]
+    assert pool.stats()["retired"] == 2
+
+
+def test_pool_checkout_waits_for_checkin_and_times_out():
+    factory = FakeFactory()
+    pool = WebDriverPool(factory, size=1, max_uses=10, ttl=0)
+
+    held = pool.checkout()
+    assert pool.checkout(timeout=0.05) is None
+
+    result = {}
+    waiter = threading.Thread(target=lambda: result.setdefault("item", pool.checkout(timeout=5)))
+    waiter.start()
+    pool.checkin(held)
+    waiter.join(timeout=5)
+
+    assert result["item"].driver is held.driver
+    assert pool.stats()["timeouts"] == 1
+    assert len(factory.launched) == 1
+
+
+def test_borrowed_scraper_does_not_quit_pooled_driver():
+    factory = FakeFactory()
+    pool = WebDriverPool(factory, size=1, max_uses=10, ttl=0)
+
+    with MovieComScraper.borrowed(pool=pool) as scraper:
+        assert scraper.driver is factory.launched[0]
+        assert scraper.owns_driver is False
+
+    assert factory.launched[0].quit_called is False
+    assert pool.stats()["idle"] == 1
+    pool.shutdown()
+    assert factory.launched[0].quit_called is True
@@ -0,0 +1,172 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+import threading
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.scrapers.eiga_scraper import MovieComScraper
+from agent.scrapers.http_client import EigaHttpClient
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "eiga"
+
+
+class FakeListDriver:
+    """page_source の取得回数と execute_script の呼び出し回数を数える最小ドライバ。"""
+
+    def __init__(self, markup, ready_after=0):
+        self._markup = markup
+        self.ready_after = ready_after
+        self.page_source_reads = 0
+        self.script_calls = 0
+
+    @property
+    def page_source(self):
+        self.page_source_reads += 1
+        return self._markup
+
+    def execute_script(self, script, *args):
+        self.script_calls += 1
+        return self.script_calls > self.ready_after
+
+
+class CookieDriver:
+    """ログイン済みブラウザの Cookie / User-Agent だけを返す最小ドライバ。"""
+
+    def __init__(self, cookies):
+        self.cookies = cookies
+
+    def get_cookies(self):
+        return self.cookies
+
+    def execute_script(self, script, *args):
+        return "FakeBrowser/1.0"
+
+
+class ListPageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        return None
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("Cookie"), self.headers.get("User-Agent")))
+        if self.path.startswith("/movie/"):
+            body = (FIXTURES / "movie_detail.html").read_bytes()
+        elif "session=logged-in" in (self.headers.get("Cookie") or ""):
+            body = (FIXTURES / "watched_list.html").read_bytes()
+        else:
+            body = "<html><body><a href='/movie/1/'>ランキング</a><input name='email'></body></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def list_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ListPageHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _scraper_with(driver, http_client=None):
+    scraper = MovieComScraper.__new__(MovieComScraper)
+    scraper.driver = driver
+    scraper.http_client = http_client
+    scraper.list_via_http = True
+    scraper.list_http_client = None
+    return scraper
+
+
+def test_wait_for_movie_list_dom_polls_without_page_source():
+    markup = (FIXTURES / "watched_list.html").read_text(encoding="utf-8")
+    driver = FakeListDriver(markup, ready_after=2)
+    scraper = _scraper_with(driver)
+
+    assert scraper._wait_for_movie_list_dom(timeout=5) is True
+    assert driver.script_calls == 3
+    assert driver.page_source_reads == 0
+
+    soup, movie_divs = scraper._capture_movie_list_page()
+    assert len(movie_divs) == 60
+    assert soup.find("a", class_="next") is not None
+    assert driver.page_source_reads == 1
+
+
+def test_wait_for_movie_list_dom_times_out():
+    driver = FakeListDriver("<html></html>", ready_after=10**6)
+    scraper = _scraper_with(driver)
+
+    assert scraper._wait_for_movie_list_dom(timeout=1) is False
+    assert driver.page_source_reads == 0
+
+
+def test_list_page_fetched_over_http_with_browser_cookies(list_server):
+    base_url = f"http://127.0.0.1:{list_server.server_address[1]}"
+    driver = CookieDriver([{"name": "session", "value": "logged-in", "domain": "127.0.0.1", "path": "/"}])
+    scraper = _scraper_with(driver, EigaHttpClient(base_url=base_url))
+    try:
+        captured = scraper._fetch_movie_list_page_via_http("https://eiga.com/user/12345/movie/?page=2")
+    finally:
+        scraper.close()
+
+    assert captured is not None
+    soup, movie_divs = captured
+    assert len(movie_divs) == 60
+    path, cookie, user_agent = list_server.requests[0]
+    assert path == "/user/12345/movie/?page=2"
+    assert "session=logged-in" in cookie
+    assert user_agent == "FakeBrowser/1.0"
+
+
+def test_list_page_http_falls_back_when_list_dom_missing(list_server):
+    base_url = f"http://127.0.0.1:{list_server.server_address[1]}"
+    driver = CookieDriver([{"name": "session", "value": "expired", "domain": "127.0.0.1", "path": "/"}])
+    scraper = _scraper_with(driver, EigaHttpClient(base_url=base_url))
+    try:
+        assert scraper._fetch_movie_list_page_via_http("https://eiga.com/user/12345/movie/?page=2") is None
+        # 一度失敗したら以降のページはブラウザ取得に任せる
+        assert scraper.list_via_http is False
+        assert scraper._fetch_movie_list_page_via_http("https://eiga.com/user/12345/movie/?page=3") is None
+    finally:
+        scraper.close()
+
+    assert len(list_server.requests) == 1
+
+
+def test_detail_fetch_does_not_start_browser(list_server, monkeypatch):
+    launches = []
+    monkeypatch.setattr(
+        MovieComScraper, "create_driver",
+        staticmethod(lambda headless=False: launches.append(headless) or (None, "no browser", None)),
+    )
+    base_url = f"http://127.0.0.1:{list_server.server_address[1]}"
+    scraper = MovieComScraper(headless=True, http_client=EigaHttpClient(base_url=base_url))
+    try:
+        details = scraper.get_movie_details("https://eiga.com/movie/90001/")
+        assert details is not None
+        assert details["external_id"] == "90001"
+        assert launches == []
+        assert scraper.driver_started is False
+        assert len(list_server.requests) == 1
+
+        # ブラウザが必要な処理で初めて起動する
+        assert scraper.driver is None
+        assert launches == [True]
+        assert scraper.init_error == "no browser"
+    finally:
+        scraper.close()
+    assert launches == [True]
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.scrapers.detail_fetcher import DetailFetcher
+from agent.tasks.enrichment import MovieEnrichmentWorker
+from app.models.models import Base, Movie, MovieEnrichment, Record, StatisticsBucket, ViewingMethod
+from app.utils.cast_utils import dump_cast_text, parse_cast_text
+
+DETAILS = {"genre": "SF", "cast": ["俳優A"], "synopsis": "あらすじ", "director": "監督"}
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = factory()
+    base = datetime(2025, 1, 1)
+    db.add_all([
+        Movie(id=1, title="新しい", external_id="1", created_at=base + timedelta(days=3)),
+        Movie(id=2, title="古い", external_id="2", created_at=base, director="既存監督"),
+        Movie(id=3, title="失敗する", external_id="broken", created_at=base + timedelta(days=1)),
+        Movie(id=4, title="完成済み", external_id="4", created_at=base, genre="ドラマ",
+              cast=dump_cast_text(["既存"]), synopsis="既存"),
+        Movie(id=5, title="IDなし", created_at=base),
+    ])
+    db.add(Record(movie_id=2, viewed_date=base, viewing_method=ViewingMethod.OTHER))
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
+
+
+def _worker(session_factory, calls, **kwargs):
+    def fetch(url):
+        calls.append(url)
+        return None if "broken" in url else dict(DETAILS)
+
+    kwargs.setdefault("batch_size", 10)
+    return MovieEnrichmentWorker(
+        session_factory=session_factory,
+        fetcher=DetailFetcher(fetch, max_workers=2, min_interval=0),
+        interval=0,
+        max_attempts=2,
+        retry_base=60,
+        **kwargs,
+    )
+
+
+def test_enriches_incomplete_movies_oldest_first(session_factory):
+    calls = []
+    worker = _worker(session_factory, calls, batch_size=2)
+    assert worker.run_once() == {"picked": 2, "enriched": 1, "failed": 1}
+    assert sorted(calls) == ["https://eiga.com/movie/2/", "https://eiga.com/movie/broken/"]
+    assert worker.run_once() == {"picked": 1, "enriched": 1, "failed": 0}
+    # 完了済み・再試行待ち・external_id なしは対象にしない
+    assert worker.run_once()["picked"] == 0
+
+    db = session_factory()
+    try:
+        movie = db.get(Movie, 2)
+        assert (movie.genre, movie.director, parse_cast_text(movie.cast)) == ("SF", "既存監督", ["俳優A"])
+        state = db.get(MovieEnrichment, 2)
+        assert state.attempts == 1 and state.completed_at and state.last_error is None
+        assert db.get(StatisticsBucket, ("genre", "SF")).count == 1
+        assert db.get(MovieEnrichment, 4) is None
+    finally:
+        db.close()
+
+
+def test_failed_fetches_back_off_until_max_attempts(session_factory):
+    calls = []
+    worker = _worker(session_factory, calls)
+    worker.run_once()
+
+    db = session_factory()
+    try:
+        state = db.get(MovieEnrichment, 3)
+        assert state.attempts == 1 and state.completed_at is None
+        assert state.next_attempt_at - state.last_attempt_at == timedelta(seconds=60)
+        assert "失敗" in state.last_error
+        # 再試行時刻を過ぎたら再び対象になり、回数上限で打ち切る
+        state.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+    finally:
+        db.close()
+
+    calls.clear()
+    assert worker.run_once() == {"picked": 1, "enriched": 0, "failed": 1}
+    assert calls == ["https://eiga.com/movie/broken/"]
+
+    db = session_factory()
+    try:
+        state = db.get(MovieEnrichment, 3)
+        assert state.attempts == 2
+        assert state.next_attempt_at - state.last_attempt_at == timedelta(seconds=120)
+        state.next_attempt_at = None
+        db.commit()
+    finally:
+        db.close()
+    assert worker.run_once()["picked"] == 0
@@ -0,0 +1,88 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.scrapers import html_parser
+from agent.scrapers.detail_client import EigaDetailClient
+from agent.scrapers.eiga_scraper import MovieComScraper
+from agent.scrapers.html_parser import parse_html, resolve_parser_backend
+from agent.scrapers.search_client import EigaSearchClient
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "eiga"
+
+
+def _read(name):
+    return (FIXTURES / name).read_bytes()
+
+
+def _extract_list(backend):
+    soup = parse_html(_read("watched_list.html"), backend=backend)
+    movies = []
+    for div in soup.find_all("div", class_="list-my-data"):
+        data = MovieComScraper._parse_movie_div(div)
+        data.pop("viewed_date")
+        movies.append(data)
+    next_link = soup.find("a", class_="next")
+    return movies, next_link.get("href") if next_link else None
+
+
+def test_resolve_parser_backend_env_and_fallback(monkeypatch):
+    monkeypatch.setenv("EIGA_HTML_PARSER", "html.parser")
+    assert resolve_parser_backend() == "html.parser"
+    assert resolve_parser_backend("html.parser") == "html.parser"
+
+    monkeypatch.setattr(html_parser, "LXML_AVAILABLE", False)
+    html_parser._resolve_requested_backend.cache_clear()
+    try:
+        assert resolve_parser_backend("lxml") == "html.parser"
+        monkeypatch.setenv("EIGA_HTML_PARSER", "auto")
+        assert resolve_parser_backend() == "html.parser"
+    finally:
+        html_parser._resolve_requested_backend.cache_clear()
+
+
+def test_fixture_pages_parse_with_html_parser():
+    movies, next_href = _extract_list("html.parser")
+    assert len(movies) == 60
+    assert next_href == "/user/12345/movie/?page=3"
+    first = movies[0]
+    assert first["external_id"] == "90000"
+    assert first["title"] == "サンプル作品 第00章"
+    assert first["movie_url"] == "https://eiga.com/movie/90000/"
+    assert first["rating"] == 1.0
+    assert first["director"] == "監督00"
+    assert first["released_year"] == 2000
+
+    details = EigaDetailClient.parse_movie_details_page(
+        _read("movie_detail.html"), "https://eiga.com/movie/90001/"
+    )
+    assert details["title"] == "サンプル作品"
+    assert details["released_year"] == 2021
+    assert details["genre"] == "ドラマ"
+    assert details["director"] == "監督太郎"
+    assert len(details["cast"]) == 5
+    assert details["external_id"] == "90001"
+
+    results = EigaSearchClient.parse_search_results(_read("search.html"), max_results=10)
+    assert len(results) == 10
+    assert results[0]["external_id"] == "91000"
+
+
+@pytest.mark.skipif(not html_parser.LXML_AVAILABLE, reason="lxml が未導入")
+def test_lxml_backend_extracts_same_fields():
+    assert _extract_list("lxml") == _extract_list("html.parser")
+
+    outputs = {}
+    for backend in ("lxml", "html.parser"):
+        details = EigaDetailClient.parse_movie_details_page(
+            _read("movie_detail.html"), "https://eiga.com/movie/90001/", backend=backend
+        )
+        results = EigaSearchClient.parse_search_results(_read("search.html"), max_results=30, backend=backend)
+        outputs[backend] = (details, results)
+    assert outputs["lxml"] == outputs["html.parser"]
@@ -0,0 +1,182 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import gzip
+import os
+import sys
+import threading
+import time
+
+import pytest
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.scrapers.http_cache import HttpResponseCache
+from agent.scrapers.http_client import EigaHttpClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        return None
+
+    def do_GET(self):
+        server = self.server
+        server.connections.add(self.client_address)
+        server.paths.append(self.path)
+        if self.path.startswith("/flaky/") and server.flaky_failures > 0:
+            server.flaky_failures -= 1
+            self._send(503, b"busy", extra={"Retry-After": "0"})
+            return
+        body = f"<h1>{self.path}</h1>".encode("utf-8")
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            self._send(200, gzip.compress(body), extra={"Content-Encoding": "gzip"})
+        else:
+            self._send(200, body)
+
+    def _send(self, status, body, extra=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (extra or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.connections = set()
+    server.paths = []
+    server.flaky_failures = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_client_reuses_connection_and_decodes_gzip(stub_server):
+    client = EigaHttpClient(base_url=_base_url(stub_server), backoff_factor=0)
+    try:
+        for movie_id in (1, 2, 3):
+            response = client.get(f"https://eiga.com/movie/{movie_id}/")
+            assert response.status_code == 200
+            assert response.text == f"<h1>/movie/{movie_id}/</h1>"
+    finally:
+        client.close()
+
+    assert stub_server.paths == ["/movie/1/", "/movie/2/", "/movie/3/"]
+    assert len(stub_server.connections) == 1
+
+
+def test_client_retries_on_5xx(stub_server):
+    stub_server.flaky_failures = 2
+    client = EigaHttpClient(base_url=_base_url(stub_server), max_retries=3, backoff_factor=0)
+    try:
+        response = client.get("https://eiga.com/flaky/10/")
+    finally:
+        client.close()
+
+    assert response.status_code == 200
+    assert stub_server.paths.count("/flaky/10/") == 3
+
+
+def test_client_returns_last_response_when_retries_exhausted(stub_server):
+    stub_server.flaky_failures = 5
+    client = EigaHttpClient(base_url=_base_url(stub_server), max_retries=1, backoff_factor=0)
+    try:
+        response = client.get("https://eiga.com/flaky/11/")
+    finally:
+        client.close()
+
+    assert response.status_code == 503
+    assert stub_server.paths.count("/flaky/11/") == 2
+
+
+class ETagHandler(StubHandler):
+    def do_GET(self):
+        server = self.server
+        server.paths.append(self.path)
+        if self.headers.get("If-None-Match") == '"v1"':
+            self._send(304, b"", extra={"ETag": '"v1"'})
+            return
+        self._send(200, f"<h1>{self.path}</h1>".encode("utf-8"), extra={"ETag": '"v1"'})
+
+    def _send(self, status, body, extra=None):
+        if status == 304:
+            self.send_response(status)
+            for key, value in (extra or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            return
+        super()._send(status, body, extra)
+
+
+@pytest.fixture()
+def etag_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ETagHandler)
+    server.connections = set()
+    server.paths = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_cache_serves_fresh_entries_and_revalidates_stale(etag_server, tmp_path):
+    cache = HttpResponseCache(str(tmp_path), ttl=60)
+    client = EigaHttpClient(base_url=_base_url(etag_server), backoff_factor=0, cache=cache)
+    url = "https://eiga.com/movie/42/"
+    try:
+        first = client.get(url, use_cache=True)
+        second = client.get(url, use_cache=True)
+        cache.ttl = 0
+        third = client.get(url, use_cache=True)
+    finally:
+        client.close()
+
+    assert first.text == second.text == third.text == "<h1>/movie/42/</h1>"
+    # 2回目はネットワークなし、3回目は条件付き GET（304）
+    assert etag_server.paths == ["/movie/42/", "/movie/42/"]
+    stats = client.cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["revalidated"] == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = HttpResponseCache(str(tmp_path), ttl=60, max_bytes=25)
+
+    def fake_response(body):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.encoding = "utf-8"
+        return response
+
+    cache.store("https://eiga.com/movie/1/", fake_response(b"a" * 10))
+    cache.store("https://eiga.com/movie/2/", fake_response(b"b" * 10))
+    # 1 の最終アクセスを 2 より新しくする（mtime 分解能に依存しないよう明示的に進める）
+    _, body_path = cache._paths(cache.key_for("https://eiga.com/movie/1/"))
+    later = time.time() + 5
+    os.utime(body_path, (later, later))
+    cache.store("https://eiga.com/movie/3/", fake_response(b"c" * 10))
+
+    assert cache.lookup("https://eiga.com/movie/1/") is not None
+    assert cache.lookup("https://eiga.com/movie/2/") is None
+    assert cache.lookup("https://eiga.com/movie/3/") is not None
+    assert cache.stats()["evictions"] == 1
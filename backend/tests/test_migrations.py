@@ -0,0 +1,147 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+
+import pytest
+from sqlalchemy import create_engine, func, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.db.migrations import MIGRATIONS, applied_versions, apply_migrations
+from app.models.models import Base, Mood, Movie, Record
+
+LEGACY_SCHEMA = [
+    "CREATE TABLE movies (id INTEGER PRIMARY KEY, title VARCHAR(255) NOT NULL, genre VARCHAR(255), "
+    "released_year INTEGER, director VARCHAR(255), \"cast\" TEXT, synopsis TEXT, image_url VARCHAR(500), "
+    "external_id VARCHAR(255) UNIQUE, created_at DATETIME, updated_at DATETIME)",
+    "CREATE INDEX ix_movies_title ON movies (title)",
+    "CREATE TABLE records (id INTEGER PRIMARY KEY, movie_id INTEGER NOT NULL REFERENCES movies (id), "
+    "viewed_date DATETIME NOT NULL, viewing_method VARCHAR(9) NOT NULL, rating FLOAT, mood VARCHAR(10), "
+    "comment TEXT, created_at DATETIME, updated_at DATETIME)",
+    "INSERT INTO movies (id, title) VALUES (1, 'A'), (2, 'B')",
+]
+
+
+@pytest.fixture()
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            conn.exec_driver_sql(statement)
+    yield engine
+    engine.dispose()
+
+
+def _index_names(engine, table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def _insert_records(engine, rows):
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO records (movie_id, viewed_date, viewing_method) VALUES (?, ?, 'OTHER')", rows
+        )
+
+
+def test_migrations_upgrade_legacy_database_once(legacy_engine):
+    _insert_records(legacy_engine, [(1, "2026-01-01 00:00:00.000000"), (2, "2026-01-01 00:00:00.000000")])
+    Base.metadata.create_all(bind=legacy_engine)
+
+    assert apply_migrations(legacy_engine) == [version for version, _name, _migrate in MIGRATIONS]
+    assert "release_date" in {col["name"] for col in inspect(legacy_engine).get_columns("movies")}
+    assert {
+        "uq_records_movie_id_viewed_date",
+        "ix_records_viewed_date_id",
+        "ix_records_mood_rating_movie_id",
+        "ix_records_rating",
+    } <= _index_names(legacy_engine, "records")
+    assert "ix_movies_genre" in _index_names(legacy_engine, "movies")
+    assert apply_migrations(legacy_engine) == []
+
+    with pytest.raises(Exception):
+        _insert_records(legacy_engine, [(1, "2026-01-01 00:00:00.000000")])
+
+
+def test_unique_index_waits_until_duplicates_are_resolved(legacy_engine):
+    _insert_records(legacy_engine, [(1, "2026-01-01 00:00:00.000000")] * 2)
+    Base.metadata.create_all(bind=legacy_engine)
+
+    apply_migrations(legacy_engine)
+    assert 4 not in applied_versions(legacy_engine)
+    indexes = _index_names(legacy_engine, "records")
+    assert "ix_records_movie_id_viewed_date" in indexes
+    assert "uq_records_movie_id_viewed_date" not in indexes
+
+    with legacy_engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM records WHERE id = (SELECT MAX(id) FROM records)")
+    assert apply_migrations(legacy_engine) == [4]
+    indexes = _index_names(legacy_engine, "records")
+    assert "uq_records_movie_id_viewed_date" in indexes
+    assert "ix_records_movie_id_viewed_date" not in indexes
+
+
+def _plan(db, query):
+    sql = str(query.statement.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}))
+    return " | ".join(row[-1] for row in db.execute(text("EXPLAIN QUERY PLAN " + sql)))
+
+
+def test_hot_queries_use_indexes():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        # 同期の重複判定（movie_id で絞って viewed_date を読む）はインデックスだけで完結する
+        plan = _plan(db, db.query(Record.movie_id, Record.viewed_date).filter(Record.movie_id.in_([1, 2, 3])))
+        assert "COVERING INDEX uq_records_movie_id_viewed_date" in plan
+
+        plan = _plan(db, db.query(Movie).filter(Movie.external_id == "123"))
+        assert "sqlite_autoindex_movies_1" in plan
+
+        plan = _plan(
+            db,
+            db.query(Movie.genre, func.count(Record.id), func.avg(Record.rating))
+            .join(Record, Movie.id == Record.movie_id)
+            .filter(Movie.genre.isnot(None))
+            .group_by(Movie.genre),
+        )
+        assert "ix_movies_genre" in plan
+        assert "uq_records_movie_id_viewed_date (movie_id=?)" in plan
+
+        plan = _plan(
+            db,
+            db.query(Movie.id, func.avg(Record.rating))
+            .join(Record, Movie.id == Record.movie_id)
+            .filter(Record.mood == Mood.HAPPY, Record.rating.isnot(None))
+            .group_by(Movie.id),
+        )
+        assert "COVERING INDEX ix_records_mood_rating_movie_id (mood=? AND rating>?)" in plan
+
+        plan = _plan(db, db.query(Record.rating, func.count(Record.id)).filter(Record.rating.isnot(None)).group_by(Record.rating))
+        assert "COVERING INDEX ix_records_rating" in plan
+
+        plan = _plan(
+            db,
+            db.query(func.count(Record.id)).filter(
+                Record.viewed_date >= datetime(2026, 1, 1), Record.viewed_date < datetime(2026, 2, 1)
+            ),
+        )
+        assert "COVERING INDEX ix_records_viewed_date_id" in plan
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_sync_jobs_owner_columns_are_added(legacy_engine):
+    with legacy_engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE sync_jobs (id VARCHAR(32) PRIMARY KEY, account_key VARCHAR(255) NOT NULL, "
+            "status VARCHAR(16) NOT NULL, cancel_requested BOOLEAN NOT NULL DEFAULT 0)"
+        )
+    Base.metadata.create_all(bind=legacy_engine)
+
+    assert 5 in apply_migrations(legacy_engine)
+    columns = {col["name"] for col in inspect(legacy_engine).get_columns("sync_jobs")}
+    assert {"owner_host", "owner_pid", "owner_token"} <= columns
@@ -0,0 +1,92 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.api import movies as movies_api
+from app.db.movie_fts import ensure_movie_fts, search_movies
+from app.models.models import Movie
+from app.utils.cast_utils import dump_cast_text
+
+
+@pytest.fixture()
+def session_factory(session_factory, engine):
+    db = session_factory()
+    db.add_all([
+        Movie(title="千と千尋の神隠し", director="宮崎駿", genre="アニメ",
+              cast=dump_cast_text(["柊瑠美", "入野自由"]), synopsis="不思議の町に迷い込んだ少女の物語"),
+        Movie(title="ハウルの動く城", director="宮崎駿", genre="アニメ",
+              cast=dump_cast_text(["倍賞千恵子", "木村拓哉"]), synopsis="魔法で老婆に変えられた少女"),
+        Movie(title="Inception", director="Christopher Nolan", genre="SF",
+              cast=dump_cast_text(["Leonardo DiCaprio"]), synopsis="夢の中に潜入する"),
+    ])
+    db.commit()
+    db.close()
+    # 既存行がある状態で作成し、索引が再構築されることも確認する
+    with engine.begin() as conn:
+        assert ensure_movie_fts(conn) is True
+        assert ensure_movie_fts(conn) is True
+    return session_factory
+
+
+def test_fts_search_ranks_title_matches_and_follows_writes(session_factory):
+    db = session_factory()
+    try:
+        total, movies = search_movies(db, "宮崎駿")
+        assert total == 2
+        total, movies = search_movies(db, "千と千尋")
+        assert [m.title for m in movies] == ["千と千尋の神隠し"]
+        total, movies = search_movies(db, "nolan dicaprio")
+        assert [m.title for m in movies] == ["Inception"]
+
+        # タイトル一致（重み大）があらすじ一致より前に来る
+        db.add(Movie(title="少女の旅立ち", synopsis="旅の話"))
+        db.commit()
+        total, movies = search_movies(db, "少女の")
+        assert total == 2
+        assert movies[0].title == "少女の旅立ち"
+
+        # トリガーで更新・削除が索引へ反映される
+        movie = db.query(Movie).filter(Movie.title == "Inception").first()
+        movie.director = "Someone Else"
+        db.commit()
+        assert search_movies(db, "nolan")[0] == 0
+        assert search_movies(db, "someone")[0] == 1
+        db.delete(movie)
+        db.commit()
+        assert search_movies(db, "someone")[0] == 0
+
+        total, movies = search_movies(db, "宮崎駿", limit=1, offset=1)
+        assert total == 2
+        assert len(movies) == 1
+    finally:
+        db.close()
+
+
+def test_short_query_uses_like(session_factory):
+    db = session_factory()
+    try:
+        total, movies = search_movies(db, "SF")
+        assert [m.title for m in movies] == ["Inception"]
+        total, _ = search_movies(db, "100%")
+        assert total == 0
+    finally:
+        db.close()
+
+
+def test_movies_search_endpoint(api_client):
+    client = api_client((movies_api.router, "/api/movies"))
+
+    response = client.get("/api/movies/search", params={"q": "アニメ", "limit": 1})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 2
+    assert body["limit"] == 1
+    assert len(body["items"]) == 1
+    assert body["items"][0]["director"] == "宮崎駿"
+
+    assert client.get("/api/movies/search").status_code == 422
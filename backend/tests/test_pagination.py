@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+import pytest
+from sqlalchemy import text
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.api import movies as movies_api
+from app.api import records as records_api
+from app.models.models import Movie, Record, ViewingMethod
+
+
+@pytest.fixture()
+def client(session_factory, api_client):
+    db = session_factory()
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    movies = [Movie(title=title) for title in ["B", "A", "C", "A", "D"]]
+    db.add_all(movies)
+    db.flush()
+    # 同じ視聴日時の記録を含めて (viewed_date, id) の同値処理を確認する
+    for i in range(7):
+        db.add(Record(movie_id=movies[i % 5].id, viewed_date=base + timedelta(days=i // 2),
+                      viewing_method=ViewingMethod.STREAMING))
+    db.commit()
+    db.close()
+    return api_client((movies_api.router, "/api/movies"), (records_api.router, "/api/records"))
+
+
+def _follow(client, url):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor:
+            assert response.headers["Link"].endswith('>; rel="next"')
+            assert f"cursor={cursor}" in response.headers["Link"]
+        url = response.headers["Link"][1:response.headers["Link"].index(">")] if cursor else None
+    return pages
+
+
+def test_movies_follow_cursor_in_title_order(client):
+    pages = _follow(client, "/api/movies/?limit=2")
+    assert [len(page) for page in pages] == [2, 2, 1]
+    items = [item for page in pages for item in page]
+    assert [(item["title"], item["id"]) for item in items] == [("A", 2), ("A", 4), ("B", 1), ("C", 3), ("D", 5)]
+
+
+def test_records_follow_cursor_newest_first(client):
+    pages = _follow(client, "/api/records/?limit=3")
+    assert [len(page) for page in pages] == [3, 3, 1]
+    items = [item for page in pages for item in page]
+    keys = [(item["viewed_date"], item["id"]) for item in items]
+    assert keys == sorted(keys, reverse=True)
+    assert len({item["id"] for item in items}) == 7
+
+    last = client.get("/api/records/?limit=7")
+    assert "X-Next-Cursor" not in last.headers
+    assert "Link" not in last.headers
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/api/movies/?cursor=not-a-cursor").status_code == 400
+    assert client.get("/api/records/?cursor=WzFd").status_code == 400
+
+
+def test_keyset_queries_use_indexes(engine):
+    with engine.connect() as conn:
+        plan = " ".join(row[-1] for row in conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM records WHERE (viewed_date, id) < ('2026-01-02', 3) "
+            "ORDER BY viewed_date DESC, id DESC LIMIT 3"
+        )))
+        assert "ix_records_viewed_date_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+        plan = " ".join(row[-1] for row in conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM movies WHERE (title, id) > ('A', 2) ORDER BY title, id LIMIT 3"
+        )))
+        assert "ix_movies_title" in plan
+        assert "TEMP B-TREE" not in plan
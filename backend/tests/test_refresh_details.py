@@ -0,0 +1,139 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+import threading
+import time
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.api import movies as movies_api
+from app.models.models import Movie
+from app.utils.cast_utils import dump_cast_text, parse_cast_text
+
+DETAILS = {
+    "released_year": 2010,
+    "director": "監督",
+    "synopsis": "あらすじ",
+    "genre": "SF",
+    "image_url": "https://example.com/poster.jpg",
+    "cast": ["俳優A", "俳優B"],
+}
+
+
+class FakeDetailClient:
+    """URL ごとの詳細を返し、同時実行数を記録する EigaDetailClient の代役。"""
+
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+    calls = []
+
+    def get_movie_details(self, movie_url, revalidate=False):
+        cls = FakeDetailClient
+        with cls.lock:
+            cls.calls.append((movie_url, revalidate))
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.active -= 1
+        if "broken" in movie_url:
+            return None
+        return dict(DETAILS)
+
+
+@pytest.fixture()
+def session_factory(session_factory):
+    db = session_factory()
+    db.add_all([
+        Movie(id=1, title="空っぽ", external_id="1"),
+        Movie(id=2, title="キャストだけ空", external_id="2", genre="ドラマ", director="既存監督",
+              synopsis="既存", cast="[]"),
+        Movie(id=3, title="埋まっている", external_id="3", genre="アニメ", director="既存監督",
+              synopsis="既存", image_url="x", released_year=2001, cast=dump_cast_text(["既存俳優"])),
+        Movie(id=4, title="IDなし"),
+        Movie(id=5, title="取得失敗", external_id="broken"),
+    ])
+    db.commit()
+    db.close()
+    return session_factory
+
+
+@pytest.fixture()
+def client(api_client, monkeypatch):
+    monkeypatch.setenv("EIGA_DETAIL_MIN_INTERVAL", "0")
+    monkeypatch.setenv("EIGA_DETAIL_WORKERS", "4")
+    monkeypatch.setenv("EIGA_REFRESH_COMMIT_BATCH", "1")
+    monkeypatch.setattr(movies_api, "EigaDetailClient", FakeDetailClient)
+    FakeDetailClient.calls = []
+    FakeDetailClient.max_active = 0
+    return api_client((movies_api.router, "/api/movies"))
+
+
+def test_bulk_refresh_by_ids_reports_each_movie(client, session_factory):
+    response = client.post("/api/movies/refresh-details", json={"movie_ids": [3, 1, 4, 5, 99, 2]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [(r["movie_id"], r["status"]) for r in body["results"]] == [
+        (3, "unchanged"), (1, "updated"), (4, "skipped"), (5, "failed"), (99, "not_found"), (2, "updated"),
+    ]
+    assert (body["requested"], body["updated"], body["failed"]) == (6, 2, 1)
+    assert body["results"][1]["updated_fields"] == ["released_year", "director", "synopsis", "genre", "image_url", "cast"]
+    assert body["results"][5]["updated_fields"] == ["released_year", "image_url", "cast"]
+    assert FakeDetailClient.max_active > 1
+    assert all(revalidate is False for _, revalidate in FakeDetailClient.calls)
+
+    db = session_factory()
+    try:
+        filled = db.get(Movie, 1)
+        assert (filled.genre, filled.director, parse_cast_text(filled.cast)) == ("SF", "監督", ["俳優A", "俳優B"])
+        kept = db.get(Movie, 2)
+        assert (kept.genre, kept.director) == ("ドラマ", "既存監督")
+        assert parse_cast_text(kept.cast) == ["俳優A", "俳優B"]
+    finally:
+        db.close()
+
+
+def test_bulk_refresh_by_missing_fields_and_force(client, session_factory):
+    body = client.post("/api/movies/refresh-details", json={"missing_fields": ["genre"], "limit": 1}).json()
+    assert [(r["movie_id"], r["status"]) for r in body["results"]] == [(1, "updated")]
+
+    # external_id のない映画 4 は条件指定の対象外
+    body = client.post("/api/movies/refresh-details", json={"missing_fields": ["cast", "genre"]}).json()
+    assert [(r["movie_id"], r["status"]) for r in body["results"]] == [(2, "updated"), (5, "failed")]
+
+    body = client.post("/api/movies/refresh-details", json={"movie_ids": [3], "force_update": True}).json()
+    assert body["results"][0]["status"] == "updated"
+    assert FakeDetailClient.calls[-1] == ("https://eiga.com/movie/3/", True)
+    db = session_factory()
+    try:
+        assert db.get(Movie, 3).genre == "SF"
+    finally:
+        db.close()
+
+    assert client.post("/api/movies/refresh-details", json={}).status_code == 400
+    assert client.post("/api/movies/refresh-details", json={"missing_fields": ["title"]}).status_code == 422
+    # 詳細ページから埋まらない項目は指定できない
+    assert client.post("/api/movies/refresh-details", json={"missing_fields": ["release_date"]}).status_code == 422
+
+
+def test_force_refresh_keeps_release_date(client, session_factory):
+    release_date = datetime(2001, 7, 20)
+    db = session_factory()
+    try:
+        db.get(Movie, 3).release_date = release_date
+        db.commit()
+    finally:
+        db.close()
+
+    body = client.post("/api/movies/refresh-details", json={"movie_ids": [3], "force_update": True}).json()
+    assert "release_date" not in body["results"][0]["updated_fields"]
+    db = session_factory()
+    try:
+        assert db.get(Movie, 3).release_date == release_date
+    finally:
+        db.close()
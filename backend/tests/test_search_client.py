@@ -0,0 +1,118 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+import threading
+import urllib.parse
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.scrapers.http_client import EigaHttpClient
+from agent.scrapers.search_client import EigaSearchClient, SearchResultCache, search_cache_key
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "eiga"
+
+
+class SearchPageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        return None
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query).get("q", [""])[0]
+        self.server.queries.append(query)
+        if self.server.fail:
+            status, body = 500, b"error"
+        elif query == "none":
+            body = '<html><body><main id="contents"><p>該当する作品はありません</p></main></body></html>'
+            status, body = 200, body.encode("utf-8")
+        elif query == "blocked":
+            status, body = 200, "<html><body><p>アクセスが制限されています</p></body></html>".encode("utf-8")
+        else:
+            status, body = 200, (FIXTURES / "search.html").read_bytes()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def search_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SearchPageHandler)
+    server.queries = []
+    server.fail = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _client(server, browser_calls, cache=None):
+    http_client = EigaHttpClient(base_url=f"http://127.0.0.1:{server.server_address[1]}", max_retries=0)
+
+    def browser_search(query, max_results):
+        browser_calls.append(query)
+        return [{"title": "ブラウザ結果", "movie_url": "https://eiga.com/movie/1/", "external_id": "1"}]
+
+    return EigaSearchClient(http_client=http_client, cache=cache or SearchResultCache(ttl=60, max_entries=10),
+                            browser_search=browser_search, browser_fallback=True)
+
+
+def test_search_uses_http_and_caches_normalized_query(search_server):
+    browser_calls = []
+    client = _client(search_server, browser_calls)
+
+    first = client.search("  Ｓｅａｒｃｈ   Movie ", max_results=10)
+    second = client.search("search movie", max_results=5)
+
+    assert len(first) == 10
+    assert first[0]["external_id"] == "91000"
+    assert second == first[:5]
+    assert search_server.queries == ["Search Movie"]
+    assert browser_calls == []
+    assert client.cache.stats()["hits"] == 1
+
+
+def test_search_falls_back_to_browser_only_when_http_page_is_unusable(search_server):
+    browser_calls = []
+    client = _client(search_server, browser_calls)
+
+    search_server.fail = True
+    assert client.search("error")[0]["title"] == "ブラウザ結果"
+    search_server.fail = False
+    assert client.search("blocked")[0]["title"] == "ブラウザ結果"
+    # 正常な0件のページはブラウザを使わず、空の結果をキャッシュする
+    assert client.search("none") == []
+    assert client.search("none") == []
+    client.search("found")
+
+    assert browser_calls == ["error", "blocked"]
+    assert search_server.queries == ["error", "blocked", "none", "found"]
+
+
+def test_search_result_cache_expires_and_evicts(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("agent.scrapers.search_client.time.monotonic", lambda: now[0])
+    cache = SearchResultCache(ttl=10, max_entries=2)
+
+    cache.put("a", [{"title": "A"}])
+    cache.put("b", [{"title": "B"}])
+    assert cache.get("a") == [{"title": "A"}]
+    cache.put("c", [{"title": "C"}])  # 最終参照が古い b を追い出す
+    assert cache.get("b") is None
+    now[0] += 11
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expired"] == 1
+    assert search_cache_key(" ＡＢＣ ") == search_cache_key("abc")
@@ -0,0 +1,92 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.api import records as records_api
+from app.api import statistics as statistics_api
+from app.db.data_version import get_data_version
+from app.models.models import Movie
+from app.utils.response_cache import VersionedResponseCache
+
+
+@pytest.fixture()
+def client(session_factory, api_client, monkeypatch):
+    db = session_factory()
+    db.add(Movie(title="Cached", genre="ドラマ"))
+    db.commit()
+    db.close()
+
+    monkeypatch.setattr(statistics_api, "_response_cache", VersionedResponseCache())
+    return api_client((records_api.router, "/api/records"), (statistics_api.router, "/api/statistics"))
+
+
+def test_overview_is_cached_per_data_version_and_revalidated_with_etag(client, session_factory, monkeypatch):
+    calls = []
+    original = statistics_api._compute_overview
+    monkeypatch.setattr(statistics_api, "_compute_overview", lambda db: calls.append(1) or original(db))
+
+    first = client.get("/api/statistics/overview")
+    etag = first.headers["ETag"]
+    second = client.get("/api/statistics/overview")
+    not_modified = client.get("/api/statistics/overview", headers={"If-None-Match": etag})
+
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == etag
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert len(calls) == 1
+
+    db = session_factory()
+    version = get_data_version(db)
+    movie_id = db.query(Movie).first().id
+    db.close()
+    client.post("/api/records/", json={
+        "movie_id": movie_id,
+        "viewed_date": datetime.utcnow().isoformat(),
+        "viewing_method": "tv",
+    })
+    db = session_factory()
+    assert get_data_version(db) == version + 1
+    db.close()
+
+    changed = client.get("/api/statistics/overview", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["total_records"] == 1
+    assert len(calls) == 2
+
+
+def test_cache_key_includes_params(client):
+    week = client.get("/api/statistics/timeline", params={"days": 7})
+    month = client.get("/api/statistics/timeline", params={"days": 30})
+    assert len(week.json()) == 7
+    assert len(month.json()) == 30
+    assert week.headers["ETag"] != month.headers["ETag"]
+
+    stats = client.get("/api/statistics/cache-stats").json()
+    assert stats["misses"] == 2
+
+
+def test_failed_compute_is_not_given_an_etag(client, monkeypatch):
+    def broken(*_args):
+        raise RuntimeError("boom")
+
+    original = statistics_api._compute_overview
+    monkeypatch.setattr(statistics_api, "_compute_overview", broken)
+    monkeypatch.setattr(statistics_api, "_compute_timeline", broken)
+    failed = client.get("/api/statistics/overview")
+    assert failed.status_code == 200 and failed.json()["total_movies"] == 0
+    assert "ETag" not in failed.headers
+    assert "ETag" not in client.get("/api/statistics/timeline").headers
+
+    # 失敗時の代替レスポンスはキャッシュされず、復旧後は実際の集計が返る
+    monkeypatch.setattr(statistics_api, "_compute_overview", original)
+    recovered = client.get("/api/statistics/overview")
+    assert recovered.status_code == 200 and recovered.json()["total_movies"] == 1
+    assert recovered.headers["ETag"]
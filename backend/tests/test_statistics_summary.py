@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.api import records as records_api
+from app.api import statistics as statistics_api
+from app.db.data_version import get_data_version
+from app.db.statistics_summary import is_statistics_built, read_statistics_summary, rebuild_statistics
+from app.models.models import Mood, Movie, Record, StatisticsBucket, ViewingMethod
+
+
+def _seed(db):
+    now = datetime.utcnow()
+    drama = Movie(title="Drama", genre="ドラマ")
+    anime = Movie(title="Anime", genre="アニメ")
+    untitled = Movie(title="No Genre")
+    db.add_all([drama, anime, untitled])
+    db.flush()
+    db.add_all([
+        Record(movie_id=drama.id, viewed_date=now - timedelta(days=1), viewing_method=ViewingMethod.THEATER,
+               rating=4.5, mood=Mood.HAPPY),
+        Record(movie_id=drama.id, viewed_date=now - timedelta(days=200), viewing_method=ViewingMethod.STREAMING,
+               rating=3.0),
+        Record(movie=anime, viewed_date=now - timedelta(days=10), viewing_method=ViewingMethod.TV,
+               rating=5.0, mood=Mood.EXCITED),
+        Record(movie_id=untitled.id, viewed_date=now - timedelta(days=5), viewing_method=ViewingMethod.OTHER),
+    ])
+    db.commit()
+    return drama, anime, untitled
+
+
+def _assert_matches_scan(db):
+    scanned = statistics_api._compute_overview_scan(db)
+    scanned.pop("recent_records")
+    assert read_statistics_summary(db) == scanned
+
+
+def test_summary_tracks_orm_writes_and_matches_scan(session_factory):
+    db = session_factory()
+    try:
+        rebuild_statistics(db)
+        db.commit()
+        assert is_statistics_built(db)
+
+        drama, anime, untitled = _seed(db)
+        _assert_matches_scan(db)
+        summary = read_statistics_summary(db)
+        assert summary["total_records"] == 4
+        assert summary["recent_90_days"] == 3
+        assert summary["top_genre"] == "ドラマ"
+
+        # 評価・気分・作品の付け替え
+        record = db.query(Record).filter(Record.rating == 3.0).first()
+        record.rating = 1.5
+        record.mood = Mood.SAD
+        record.movie_id = anime.id
+        db.commit()
+        _assert_matches_scan(db)
+
+        # 映画のジャンル変更は既存記録ごと移る
+        untitled.genre = "ドラマ"
+        anime.genre = None
+        db.commit()
+        _assert_matches_scan(db)
+
+        db.delete(db.query(Record).filter(Record.rating == 4.5).first())
+        db.add(Movie(title="Extra", genre="SF"))
+        db.commit()
+        _assert_matches_scan(db)
+
+        # 失敗した書き込みはロールバックで集計も戻る
+        db.add(Record(movie_id=drama.id, viewed_date=datetime.utcnow(), viewing_method=ViewingMethod.DVD, rating=2.0))
+        db.flush()
+        db.rollback()
+        _assert_matches_scan(db)
+    finally:
+        db.close()
+
+
+def test_rebuild_recovers_from_out_of_band_changes(session_factory):
+    db = session_factory()
+    try:
+        _seed(db)
+        rebuild_statistics(db)
+        db.commit()
+        _assert_matches_scan(db)
+
+        # セッションを経由しない一括更新は差分更新されない（データ版数も進まない）
+        version = get_data_version(db)
+        db.query(Record).update({Record.rating: 2.0}, synchronize_session=False)
+        db.commit()
+        assert read_statistics_summary(db)["average_rating"] != 2.0
+        assert get_data_version(db) == version
+
+        # 再構築は同じトランザクションで版数を進める（ロールバックすれば版数も戻る）
+        rebuild_statistics(db)
+        db.rollback()
+        assert get_data_version(db) == version
+        rebuild_statistics(db)
+        db.commit()
+        assert get_data_version(db) == version + 1
+        _assert_matches_scan(db)
+        assert db.query(StatisticsBucket).filter(StatisticsBucket.kind == "rating").count() == 1
+    finally:
+        db.close()
+
+
+def test_record_endpoints_keep_overview_current(session_factory, api_client):
+    db = session_factory()
+    drama, _anime, _untitled = _seed(db)
+    movie_id = drama.id
+    rebuild_statistics(db)
+    db.commit()
+    db.close()
+
+    client = api_client((records_api.router, "/api/records"), (statistics_api.router, "/api/statistics"))
+
+    created = client.post("/api/records/", json={
+        "movie_id": movie_id,
+        "viewed_date": datetime.utcnow().isoformat(),
+        "viewing_method": "theater",
+        "rating": 4.0,
+        "mood": "relaxed",
+    }).json()
+    client.patch(f"/api/records/{created['id']}", json={"rating": 2.0})
+    overview = client.get("/api/statistics/overview").json()
+    assert overview["total_records"] == 5
+    assert {"name": "relaxed", "value": 1} in overview["mood_stats"]
+    assert overview["rating_distribution"][1] == {"range": "2-3", "count": 1}
+
+    client.delete(f"/api/records/{created['id']}")
+    overview = client.get("/api/statistics/overview").json()
+    assert overview["total_records"] == 4
+    assert all(item["name"] != "relaxed" for item in overview["mood_stats"])
+    assert len(overview["recent_records"]) == 4
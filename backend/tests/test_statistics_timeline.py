@@ -0,0 +1,117 @@
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import sys
+
+import pytest
+from sqlalchemy import event, func
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.api import statistics as statistics_api
+from app.models.models import Movie, Record, ViewingMethod
+
+VIEWED = [
+    datetime(2024, 12, 31, 23, 59, 59),
+    datetime(2025, 1, 1, 0, 0, 0),
+    datetime(2025, 1, 5, 21, 30),  # 日曜（週は 2024-12-30 始まり）
+    datetime(2025, 1, 6, 8, 0),  # 月曜
+    datetime(2025, 3, 15, 12, 0),
+    datetime(2025, 3, 15, 18, 0),
+    datetime(2026, 7, 1, 9, 0),
+]
+
+
+@pytest.fixture()
+def session_factory(session_factory):
+    db = session_factory()
+    for i, viewed in enumerate(VIEWED):
+        movie = Movie(title=f"Movie {i}")
+        db.add(movie)
+        db.flush()
+        db.add(Record(movie_id=movie.id, viewed_date=viewed, viewing_method=ViewingMethod.OTHER))
+    db.commit()
+    db.close()
+    return session_factory
+
+
+@pytest.fixture()
+def client(api_client):
+    return api_client((statistics_api.router, "/api/statistics"))
+
+
+def _per_day_counts(db, start, end):
+    """従来の1日1クエリでの集計（比較用）。"""
+    timeline = []
+    day = start
+    while day <= end:
+        begin = datetime.combine(day, datetime.min.time())
+        count = db.query(func.count(Record.id)).filter(
+            Record.viewed_date >= begin, Record.viewed_date < begin + timedelta(days=1)
+        ).scalar()
+        timeline.append({"date": day.isoformat(), "count": count, "partial": False})
+        day += timedelta(days=1)
+    return timeline
+
+
+def test_daily_timeline_matches_per_day_counts_in_one_query(session_factory, engine):
+    db = session_factory()
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    try:
+        start, end = date(2024, 12, 25), date(2025, 3, 20)
+        expected = _per_day_counts(db, start, end)
+        event.listen(engine, "before_cursor_execute", listener)
+        timeline = statistics_api._compute_timeline(db, start, end)
+        event.remove(engine, "before_cursor_execute", listener)
+        assert timeline == expected
+        assert len(statements) == 1
+        assert sum(item["count"] for item in timeline) == 6
+    finally:
+        db.close()
+
+
+def test_long_range_buckets_are_zero_filled(client):
+    weekly = client.get("/api/statistics/timeline", params={"granularity": "week", "from": "2024-12-30", "to": "2025-01-12"}).json()
+    assert weekly == [
+        {"date": "2024-12-30", "count": 3, "partial": False},
+        {"date": "2025-01-06", "count": 1, "partial": False},
+    ]
+
+    monthly = client.get("/api/statistics/timeline", params={"granularity": "month", "from": "2015-01-01", "to": "2026-12-31"}).json()
+    assert len(monthly) == 144
+    assert {"date": "2025-03-01", "count": 2, "partial": False} in monthly
+    assert sum(item["count"] for item in monthly) == len(VIEWED)
+
+    yearly = client.get("/api/statistics/timeline", params={"granularity": "year", "from": "2024-06-01", "to": "2026-06-30"}).json()
+    # 範囲の端で一部しか含まない年は partial（count は範囲内のみ）
+    assert yearly == [
+        {"date": "2024-01-01", "count": 1, "partial": True},
+        {"date": "2025-01-01", "count": 5, "partial": False},
+        {"date": "2026-01-01", "count": 0, "partial": True},
+    ]
+
+    weekly = client.get("/api/statistics/timeline", params={"granularity": "week", "from": "2025-01-01", "to": "2025-01-06"}).json()
+    assert weekly == [
+        {"date": "2024-12-30", "count": 2, "partial": True},
+        {"date": "2025-01-06", "count": 1, "partial": True},
+    ]
+
+
+def test_default_range_ends_yesterday(client):
+    timeline = client.get("/api/statistics/timeline", params={"days": 3}).json()
+    yesterday = datetime.utcnow().date() - timedelta(days=1)
+    assert [item["date"] for item in timeline] == [
+        (yesterday - timedelta(days=n)).isoformat() for n in (2, 1, 0)
+    ]
+    # days が0以下の場合は従来どおり空（422 にはしない）
+    assert client.get("/api/statistics/timeline", params={"days": 0}).json() == []
+    assert client.get("/api/statistics/timeline", params={"days": -5}).json() == []
+
+
+def test_invalid_timeline_params_are_rejected(client):
+    assert client.get("/api/statistics/timeline", params={"granularity": "hour"}).status_code == 400
+    assert client.get("/api/statistics/timeline", params={"from": "2025-02-01", "to": "2025-01-01"}).status_code == 400
+    assert client.get("/api/statistics/timeline", params={"from": "2000-01-01", "to": "2025-01-01"}).status_code == 400
+    assert client.get("/api/statistics/timeline", params={"granularity": "month", "from": "2000-01-01", "to": "2025-01-01"}).status_code == 200
@@ -0,0 +1,204 @@
+from pathlib import Path
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.tasks import sync_jobs
+from agent.tasks.sync_jobs import SyncJobChannel, SyncJobRunner
+from app.api import search as search_api
+from app.models.models import Base, SyncJob
+
+
+# ---- ワーカープロセスで動かす同期の代役（spawn で読み込めるようモジュール直下に置く） ----
+
+def _fake_sync(options, messages, cancel_event, job_id):
+    channel = SyncJobChannel(messages, cancel_event)
+    channel.started()
+    counts = {"added": 0, "existing": 0, "errors": 0}
+    for page in range(1, options.get("pages", 3) + 1):
+        if channel.cancel_requested():
+            channel.finished({"success": False, "cancelled": True, "message": "同期を中止しました",
+                              "can_fallback_to_interactive": False, **counts})
+            return
+        counts["added"] += 2
+        channel.progress({"page": page, "fetched": page * 2, "processed": page * 2, **counts})
+        cancel_event.wait(options.get("page_seconds", 0.05))
+    channel.finished({"success": True, "cancelled": False, "message": "同期完了",
+                      "can_fallback_to_interactive": False, **counts})
+
+
+def _hanging_sync(options, messages, cancel_event, job_id):
+    SyncJobChannel(messages, cancel_event).started()
+    time.sleep(60)
+
+
+def _crashing_sync(options, messages, cancel_event, job_id):
+    SyncJobChannel(messages, cancel_event).started()
+    os._exit(3)
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def _runner(session_factory, target=_fake_sync, cancel_grace=0.5):
+    return SyncJobRunner(session_factory=session_factory, target=target, cancel_grace=cancel_grace)
+
+
+def _wait_for(predicate, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        value = predicate()
+        if value:
+            return value
+        time.sleep(0.05)
+    raise AssertionError("条件を満たしませんでした")
+
+
+def test_single_flight_per_account_and_result_is_stored(session_factory):
+    runner = _runner(session_factory)
+    first, created = runner.start({"email": "A@example.com", "password": "secret", "page_seconds": 0.3})
+    again, created_again = runner.start({"email": "a@example.com", "password": "secret"})
+    other, created_other = runner.start({"email": "b@example.com", "password": "secret", "pages": 1})
+    assert created and not created_again and created_other
+    assert again["id"] == first["id"]
+    assert other["id"] != first["id"]
+    assert "password" not in first["options"]
+
+    running = _wait_for(lambda: (job := runner.get(first["id"]))["page"] >= 1 and job)
+    assert running["status"] == "running"
+
+    done = runner.wait(first["id"], timeout=20)
+    assert done["status"] == "succeeded"
+    assert (done["page"], done["added"]) == (3, 6)
+    assert done["result"]["message"] == "同期完了"
+    assert runner.wait(other["id"], timeout=20)["status"] == "succeeded"
+
+    db = session_factory()
+    try:
+        row = db.get(SyncJob, first["id"])
+        assert (row.status, row.processed, row.added) == ("succeeded", 6, 6)
+        assert row.started_at and row.finished_at
+    finally:
+        db.close()
+
+    # 終了後は同じアカウントで新しいジョブを開始できる
+    assert runner.start({"email": "a@example.com", "password": "secret", "pages": 1})[1]
+
+
+def test_cancel_is_cooperative_then_forced(session_factory):
+    runner = _runner(session_factory)
+    job, _ = runner.start({"pages": 50, "page_seconds": 0.2})
+    _wait_for(lambda: runner.get(job["id"])["page"] >= 1)
+    assert runner.cancel(job["id"])["cancel_requested"]
+    done = runner.wait(job["id"], timeout=20)
+    assert done["status"] == "cancelled"
+    assert done["result"]["cancelled"] and done["added"] >= 2
+
+    hanging = _runner(session_factory, target=_hanging_sync)
+    job, _ = hanging.start({})
+    _wait_for(lambda: hanging.get(job["id"])["status"] == "running")
+    hanging.cancel(job["id"])
+    done = hanging.wait(job["id"], timeout=20)
+    assert done["status"] == "cancelled"
+    assert "ワーカーを停止" in done["message"]
+
+
+def test_crashed_and_orphaned_jobs_are_failed(session_factory):
+    runner = _runner(session_factory, target=_crashing_sync)
+    job, _ = runner.start({})
+    done = runner.wait(job["id"], timeout=20)
+    assert done["status"] == "failed"
+    assert "exit code 3" in done["message"]
+
+    db = session_factory()
+    db.add(SyncJob(id="orphan", account_key="interactive", status="running"))
+    db.commit()
+    db.close()
+    orphan = runner.get("orphan")
+    assert orphan["status"] == "failed"
+    assert "再起動" in orphan["message"]
+
+
+def test_only_jobs_whose_owner_is_gone_are_reaped(session_factory):
+    runner = _runner(session_factory)
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    host = sync_jobs._HOSTNAME
+    db = session_factory()
+    db.add_all([
+        SyncJob(id="exited", account_key="a", status="running", owner_host=host, owner_pid=exited.pid, owner_token="x"),
+        SyncJob(id="restarted", account_key="b", status="running", owner_host=host, owner_pid=os.getpid(), owner_token="old"),
+        SyncJob(id="parent", account_key="c", status="running", owner_host=host, owner_pid=os.getppid(), owner_token="x"),
+        SyncJob(id="remote", account_key="d", status="running", owner_host="other-host", owner_pid=1, owner_token="x"),
+    ])
+    db.commit()
+    db.close()
+
+    statuses = {job["id"]: job["status"] for job in runner.recent()}
+    assert statuses == {"exited": "failed", "restarted": "failed", "parent": "running", "remote": "running"}
+
+
+def test_cancel_from_another_api_process(session_factory):
+    owner = _runner(session_factory)
+    job, _ = owner.start({"pages": 50, "page_seconds": 0.2})
+    _wait_for(lambda: owner.get(job["id"])["page"] >= 1)
+
+    # 同じ DB を見る別の API プロセス（ジョブのハンドルを持たない）から中止する
+    other = _runner(session_factory)
+    requested = other.cancel(job["id"])
+    # 他プロセスからは DB 上の状態（実行中は開始時のまま）が見える
+    assert requested["status"] in sync_jobs.ACTIVE_STATUSES and requested["cancel_requested"]
+
+    done = owner.wait(job["id"], timeout=20)
+    assert done["status"] == "cancelled" and done["cancel_requested"]
+    assert done["result"]["cancelled"]
+
+
+def test_sync_job_endpoints(session_factory, monkeypatch):
+    runner = _runner(session_factory)
+    monkeypatch.setattr(sync_jobs, "_default_runner", runner)
+    app = FastAPI()
+    app.include_router(search_api.router, prefix="/api/search")
+    client = TestClient(app)
+
+    payload = {"email": "user@example.com", "password": "secret"}
+    started = client.post("/api/search/sync/jobs", json=payload)
+    assert started.status_code == 202
+    job_id = started.json()["id"]
+    assert started.headers["Location"] == f"/api/search/sync/jobs/{job_id}"
+    joined = client.post("/api/search/sync/jobs", json=payload)
+    assert joined.status_code == 200
+    assert joined.json()["id"] == job_id and joined.json()["created"] is False
+
+    runner.wait(job_id, timeout=20)
+    status = client.get(f"/api/search/sync/jobs/{job_id}").json()
+    assert status["status"] == "succeeded"
+    assert status["result"]["added"] == 6
+    assert [job["id"] for job in client.get("/api/search/sync/jobs").json()] == [job_id]
+    assert client.post(f"/api/search/sync/jobs/{job_id}/cancel").json()["status"] == "succeeded"
+    assert client.get("/api/search/sync/jobs/missing").status_code == 404
+
+    # 互換の /sync はジョブの終了を待って従来形式で返す
+    result = client.post("/api/search/sync", json=payload).json()
+    assert result["success"] is True and result["added"] == 6
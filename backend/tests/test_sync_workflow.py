@@ -3,7 +3,7 @@ from pathlib import Path
 import sys
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -14,15 +14,19 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 import agent.tasks.movie_agent as movie_agent_module
+from agent.tasks.movie_agent import SyncCommitBatch
 
 if "app.models.models" in sys.modules:
-    from app.models.models import Base, Movie, Record
+    from app.models.models import Base, EigaSyncState, Movie, Record
 else:
-    from backend.app.models.models import Base, Movie, Record
+    from backend.app.models.models import Base, EigaSyncState, Movie, Record
 
 
 class FakeScraper:
     scenario = "success"
+    page_log = []
+    page_viewed_dates = {}  # "paged" のページ番号 -> 視聴日（再鑑賞の再現用）
+    on_fetch = None  # 一覧ページ・詳細ページの取得時に呼ぶ（通信中の DB 状態の確認用）
 
     def __init__(self, headless=False):
         self.driver = object()
@@ -32,9 +36,61 @@ class FakeScraper:
     def login(self, email=None, password=None):
         return True
 
+    def request_cancel(self, reason):
+        self.cancelled = True
+        self.cancel_reason = reason
+
+    def iter_watched_movie_pages(self):
+        if self.scenario in ("paged", "paged_interrupted"):
+            for page in range(3):
+                if page == 2 and self.scenario == "paged_interrupted":
+                    raise RuntimeError("page 3 failed")
+                FakeScraper.page_log.append(page)
+                if FakeScraper.on_fetch:
+                    FakeScraper.on_fetch()
+                yield [
+                    {
+                        "title": f"Paged Movie {page}-{i}",
+                        "external_id": str(5000 + page * 10 + i),
+                        "viewed_date": FakeScraper.page_viewed_dates.get(page, datetime(2025, 2, 1, 12, 0, 0)),
+                        "movie_url": f"https://eiga.com/movie/{5000 + page * 10 + i}/",
+                        "viewing_method": "other",
+                        "rating": None,
+                    }
+                    for i in range(5)
+                ]
+            return
+        if self.scenario == "row_fails":
+            # 4行目は視聴日がなく記録の INSERT が失敗する。2ページ目の取得は失敗する
+            yield [
+                {
+                    "title": f"Row Movie {i}",
+                    "external_id": str(7000 + i),
+                    "viewed_date": None if i == 3 else datetime(2025, 3, 1, 12, 0, 0),
+                    "movie_url": f"https://eiga.com/movie/{7000 + i}/",
+                    "viewing_method": "other",
+                    "rating": None,
+                }
+                for i in range(5)
+            ]
+            raise RuntimeError("page 2 failed")
+        yield self.fetch_watched_movies()
+
     def fetch_watched_movies(self):
         if self.scenario == "fetch_exception":
             raise RuntimeError("fetch failed")
+        if self.scenario == "bulk":
+            return [
+                {
+                    "title": f"Bulk Movie {i}",
+                    "external_id": str(1000 + i),
+                    "viewed_date": datetime(2025, 1, 1, 12, 0, 0),
+                    "movie_url": f"https://eiga.com/movie/{1000 + i}/",
+                    "viewing_method": "other",
+                    "rating": None,
+                }
+                for i in range(120)
+            ]
         return [
             {
                 "title": "Test Movie",
@@ -50,8 +106,12 @@ class FakeScraper:
         ]
 
     def get_movie_details(self, movie_url):
+        if FakeScraper.on_fetch:
+            FakeScraper.on_fetch()
         if self.scenario == "details_exception":
             raise RuntimeError("details failed")
+        if self.scenario in ("bulk", "paged", "paged_interrupted", "row_fails"):
+            return None
         return {
             "title": "Test Movie",
             "genre": "Drama",
@@ -77,6 +137,9 @@ def isolated_db(monkeypatch):
     TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     Base.metadata.create_all(bind=engine)
 
+    monkeypatch.setenv("EIGA_DETAIL_MIN_INTERVAL", "0")
+    # 既定では詳細取得を enrichment ワーカーへ回すため、同期中に取得する経路を明示する
+    monkeypatch.setenv("EIGA_SYNC_DEFER_DETAILS", "0")
     monkeypatch.setattr(movie_agent_module, "SessionLocal", TestSessionLocal)
     monkeypatch.setattr(movie_agent_module, "MovieComScraper", FakeScraper)
 
@@ -194,3 +257,299 @@ def test_sync_updates_existing_movie_metadata(isolated_db):
         assert db.query(Record).count() == 1
     finally:
         db.close()
+
+
+def test_sync_resolves_existing_entries_in_bulk(isolated_db):
+    FakeScraper.scenario = "bulk"
+
+    db = isolated_db()
+    try:
+        # 半数を既存映画（うち一部は視聴記録あり）として用意する
+        for i in range(60):
+            movie = Movie(title=f"Bulk Movie {i}", external_id=str(1000 + i))
+            db.add(movie)
+            db.flush()
+            if i % 2 == 0:
+                db.add(Record(movie_id=movie.id, viewed_date=datetime(2025, 1, 1, 12, 0, 0), viewing_method="other"))
+        db.commit()
+    finally:
+        db.close()
+
+    selects = []
+    engine = isolated_db.kw["bind"]
+
+    def count_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_selects)
+    try:
+        result = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(
+            email="user@example.com",
+            password="secret",
+            save_credentials=False,
+            use_saved_credentials=False,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count_selects)
+
+    db = isolated_db()
+    try:
+        assert result["success"] is True
+        assert result["added"] == 60
+        assert result["existing"] == 60
+        assert db.query(Movie).count() == 120
+        assert db.query(Record).count() == 120
+        # 行数に比例せず、一括解決の数クエリ程度に収まる
+        assert len(selects) < 10
+    finally:
+        db.close()
+
+
+def test_sync_commits_pages_in_batches(isolated_db, monkeypatch):
+    FakeScraper.scenario = "paged"
+    commits = []
+    real_commit = SyncCommitBatch.commit
+
+    def tracking_commit(self):
+        commits.append(self.pending)
+        real_commit(self)
+
+    monkeypatch.setattr(SyncCommitBatch, "commit", tracking_commit)
+
+    result = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(
+        email="user@example.com",
+        password="secret",
+        save_credentials=False,
+        use_saved_credentials=False,
+        commit_batch_size=4,
+    )
+
+    assert result["success"] is True
+    assert result["added"] == 15
+    # 4行ごとの確定 + 次のページ取得前の残り1行の確定（最後は状態保存のみ）
+    assert commits == [4, 1, 4, 1, 4, 1, 0]
+
+    db = isolated_db()
+    try:
+        assert db.query(Movie).count() == 15
+        assert db.query(Record).count() == 15
+    finally:
+        db.close()
+
+
+def test_sync_reports_progress_and_stops_on_cancel_request(isolated_db):
+    FakeScraper.scenario = "paged"
+    reports = []
+
+    result = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(
+        email="user@example.com",
+        password="secret",
+        save_credentials=False,
+        use_saved_credentials=False,
+        commit_batch_size=4,
+        progress=reports.append,
+        should_cancel=lambda: bool(reports) and reports[-1]["processed"] >= 6,
+    )
+
+    assert reports[0] == {"page": 1, "fetched": 5, "processed": 0, "added": 0, "existing": 0, "errors": 0}
+    assert reports[-1]["page"] == 2 and reports[-1]["processed"] == 6
+    assert result["cancelled"] is True
+    assert result["message"].startswith("同期を中止しました")
+    # 1ページ目（確定済みの5行）のみ残る
+    assert result["added"] == 5
+    db = isolated_db()
+    try:
+        assert db.query(Record).count() == 5
+    finally:
+        db.close()
+
+
+def test_sync_keeps_committed_batches_when_fetch_fails_midway(isolated_db):
+    FakeScraper.scenario = "paged_interrupted"
+
+    result = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(
+        email="user@example.com",
+        password="secret",
+        save_credentials=False,
+        use_saved_credentials=False,
+        commit_batch_size=4,
+    )
+
+    db = isolated_db()
+    try:
+        assert result["success"] is False
+        # 3ページ目の取得前に2ページ（10行）とも確定している
+        assert result["added"] == 10
+        assert db.query(Movie).count() == 10
+        assert db.query(Record).count() == 10
+    finally:
+        db.close()
+
+
+def test_sync_holds_no_transaction_while_fetching(isolated_db, monkeypatch):
+    FakeScraper.scenario = "paged"
+    bind = isolated_db.kw["bind"]
+    open_transactions = []
+
+    def record_state():
+        raw = bind.raw_connection()
+        try:
+            open_transactions.append(raw.dbapi_connection.in_transaction)
+        finally:
+            raw.close()
+
+    monkeypatch.setattr(FakeScraper, "on_fetch", staticmethod(record_state))
+    result = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(
+        email="user@example.com",
+        password="secret",
+        save_credentials=False,
+        use_saved_credentials=False,
+        commit_batch_size=200,
+    )
+
+    assert result["success"] is True and result["added"] == 15
+    # 一覧3ページ + 詳細15件。いずれの取得中も書き込みトランザクション（ロック）を持たない
+    assert len(open_transactions) == 18
+    assert not any(open_transactions)
+
+
+def test_failed_row_only_rolls_back_itself(isolated_db):
+    FakeScraper.scenario = "row_fails"
+
+    result = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(
+        email="user@example.com",
+        password="secret",
+        save_credentials=False,
+        use_saved_credentials=False,
+        commit_batch_size=5,
+    )
+
+    db = isolated_db()
+    try:
+        # 失敗した4行目（映画の追加を含む）だけが取り消され、同じバッチの他の行は確定する
+        assert result["success"] is False
+        # errors は失敗した1行 + 2ページ目の取得失敗
+        assert (result["added"], result["errors"]) == (4, 2)
+        titles = sorted(title for (title,) in db.query(Movie.title))
+        assert titles == ["Row Movie 0", "Row Movie 1", "Row Movie 2", "Row Movie 4"]
+        assert db.query(Record).count() == 4
+    finally:
+        db.close()
+
+
+def test_incremental_sync_stops_at_high_water_mark(isolated_db):
+    FakeScraper.scenario = "paged"
+    FakeScraper.page_log = []
+
+    first = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(
+        email="user@example.com",
+        password="secret",
+        save_credentials=False,
+        use_saved_credentials=False,
+        incremental=True,
+    )
+    # 基準点が無い初回は全ページを巡回する
+    assert first["added"] == 15
+    assert FakeScraper.page_log == [0, 1, 2]
+
+    db = isolated_db()
+    try:
+        state = db.query(EigaSyncState).one()
+        assert state.account_key == "email:user@example.com"
+        assert state.last_seen_external_id == "5000"
+        assert state.last_seen_viewed_date == datetime(2025, 2, 1, 12, 0, 0)
+        assert state.last_full_sync is not None
+    finally:
+        db.close()
+
+    FakeScraper.page_log = []
+    second = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(
+        email="user@example.com",
+        password="secret",
+        save_credentials=False,
+        use_saved_credentials=False,
+        incremental=True,
+    )
+    assert second["success"] is True
+    assert second["added"] == 0
+    assert FakeScraper.page_log == [0]
+
+    FakeScraper.page_log = []
+    full = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(
+        email="user@example.com",
+        password="secret",
+        save_credentials=False,
+        use_saved_credentials=False,
+    )
+    assert full["success"] is True
+    assert FakeScraper.page_log == [0, 1, 2]
+
+
+def test_incremental_sync_continues_past_known_movies_with_new_viewings(isolated_db, monkeypatch):
+    FakeScraper.scenario = "paged"
+    monkeypatch.setattr(FakeScraper, "page_log", [])
+    monkeypatch.setattr(FakeScraper, "page_viewed_dates", {})
+    options = dict(email="user@example.com", password="secret", save_credentials=False,
+                   use_saved_credentials=False, incremental=True)
+    assert movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(**options)["added"] == 15
+
+    # 1ページ目は登録済みの映画（基準点の作品を含む）の再鑑賞だけ。記録は未保存なので次のページへ進む
+    rewatched = datetime(2025, 4, 1, 20, 0, 0)
+    FakeScraper.page_viewed_dates = {0: rewatched}
+    FakeScraper.page_log = []
+    result = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(**options)
+    assert result["success"] is True
+    assert FakeScraper.page_log == [0, 1]
+
+    db = isolated_db()
+    try:
+        assert db.query(Movie).count() == 15
+        assert db.query(Record).count() == 20
+        assert db.query(Record).filter(Record.viewed_date == rewatched).count() == 5
+        state = db.query(EigaSyncState).one()
+        assert (state.last_seen_external_id, state.last_seen_viewed_date) == ("5000", rewatched)
+    finally:
+        db.close()
+
+
+def test_sync_defers_details_to_enrichment(isolated_db, monkeypatch):
+    FakeScraper.scenario = "success"
+    calls = []
+    monkeypatch.setattr(FakeScraper, "get_movie_details", lambda self, url: calls.append(url))
+
+    result = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(
+        email="user@example.com",
+        password="secret",
+        save_credentials=False,
+        use_saved_credentials=False,
+        defer_details=True,
+    )
+
+    db = isolated_db()
+    try:
+        assert result["success"] is True and result["added"] == 1
+        assert calls == []
+        movie = db.query(Movie).one()
+        # 一覧の情報だけで登録し、ジャンル・キャストは後から補完する
+        assert (movie.external_id, movie.director, movie.genre, movie.cast) == ("9999", "Director A", None, None)
+    finally:
+        db.close()
+
+    db = isolated_db()
+    db.query(Record).delete()
+    db.query(Movie).delete()
+    db.commit()
+    db.close()
+
+    # 既定（EIGA_SYNC_DEFER_DETAILS 未設定）はワーカーが無効なら従来どおり同期中に取得する
+    monkeypatch.delenv("EIGA_SYNC_DEFER_DETAILS")
+    monkeypatch.setenv("EIGA_ENRICH_ENABLED", "0")
+    result = movie_agent_module.MovieAgent.sync_from_eiga_com_with_options(
+        email="user@example.com",
+        password="secret",
+        save_credentials=False,
+        use_saved_credentials=False,
+    )
+    assert result["added"] == 1
+    assert calls == ["https://eiga.com/movie/9999/"]
@@ -0,0 +1,58 @@
+from pathlib import Path
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.scrapers.waits import BrowserWaits, WaitMetrics
+
+
+class FakeNavigatingDriver:
+    """current_url 参照 N 回目以降に遷移後URLを返すドライバ。"""
+
+    def __init__(self, change_after):
+        self.change_after = change_after
+        self.reads = 0
+
+    @property
+    def current_url(self):
+        self.reads += 1
+        if self.reads > self.change_after:
+            return "https://eiga.com/user/12345/"
+        return "https://id.eiga.com/authorize/"
+
+    def execute_script(self, script, *args):
+        return "complete"
+
+
+def test_url_changed_returns_as_soon_as_url_changes():
+    metrics = WaitMetrics()
+    waits = BrowserWaits(FakeNavigatingDriver(change_after=3), metrics=metrics, poll_frequency=0.01)
+
+    started = time.monotonic()
+    new_url = waits.url_changed("login.redirect", "https://id.eiga.com/authorize/", timeout=5)
+
+    assert new_url == "https://eiga.com/user/12345/"
+    assert time.monotonic() - started < 1
+    assert waits.document_ready("page.ready", timeout=5) is True
+
+    stats = metrics.snapshot()
+    assert stats["login.redirect"]["count"] == 1
+    assert stats["login.redirect"]["timeouts"] == 0
+    assert stats["page.ready"]["count"] == 1
+
+
+def test_until_records_timeouts():
+    metrics = WaitMetrics()
+    waits = BrowserWaits(FakeNavigatingDriver(change_after=10**6), metrics=metrics, poll_frequency=0.01)
+
+    assert waits.url_changed("login.redirect", "https://id.eiga.com/authorize/", timeout=0.1) is None
+    waits.settle("fallback.sleep", 0.01)
+
+    stats = metrics.snapshot()
+    assert stats["login.redirect"]["timeouts"] == 1
+    assert stats["login.redirect"]["max_seconds"] >= 0.1
+    assert stats["fallback.sleep"]["count"] == 1
+    assert metrics.summary_lines()[0].startswith("login.redirect")
@@ -45,6 +45,7 @@ function App() {
   const [isEditRecordModalVisible, setIsEditRecordModalVisible] = useState(false);
   const [editingRecord, setEditingRecord] = useState(null);
   const [isSyncing, setIsSyncing] = useState(false);
+  const [syncJob, setSyncJob] = useState(null);
     const [statistics, setStatistics] = useState(null);
     const [isLoadingStats, setIsLoadingStats] = useState(false);
   const [form] = Form.useForm();
@@ -107,10 +108,23 @@ function App() {
     setDisplayedRecordCount(searchableRecords.length);
   }, [searchableRecords]);
 
+  // 一覧APIはカーソルページングのため、X-Next-Cursor が返らなくなるまで続きを取得する
+  const fetchAllPages = async (path) => {
+    const items = [];
+    let cursor = null;
+    do {
+      const response = await axios.get(`${API_BASE}${path}`, {
+        params: { limit: 500, ...(cursor ? { cursor } : {}) },
+      });
+      items.push(...response.data);
+      cursor = response.headers['x-next-cursor'] || null;
+    } while (cursor);
+    return items;
+  };
+
   const loadMovies = async () => {
     try {
-      const response = await axios.get(`${API_BASE}/movies/`);
-      setMovies(response.data);
+      setMovies(await fetchAllPages('/movies/'));
     } catch (error) {
       console.error('映画読み込みエラー:', error);
       message.error('映画の読み込みに失敗しました');
@@ -119,8 +133,7 @@ function App() {
 
   const loadRecords = async () => {
     try {
-      const response = await axios.get(`${API_BASE}/records/`);
-      setRecords(response.data);
+      setRecords(await fetchAllPages('/records/'));
     } catch (error) {
       console.error('記録読み込みエラー:', error);
       message.error('記録の読み込みに失敗しました');
@@ -400,20 +413,59 @@ function App() {
     }
   };
 
+  // 同期はバックエンドの別プロセスでジョブとして実行されるため、終了まで状態をポーリングする
+  const waitForSyncJob = async (job) => {
+    let current = job;
+    while (['queued', 'running'].includes(current.status)) {
+      await new Promise((resolve) => setTimeout(resolve, 1500));
+      const response = await axios.get(`${API_BASE}/search/sync/jobs/${current.id}`);
+      current = response.data;
+      setSyncJob(current);
+    }
+    return current.result || {
+      success: false,
+      cancelled: current.status === 'cancelled',
+      message: current.message || '同期に失敗しました',
+      added: current.added,
+      existing: current.existing,
+      errors: current.errors,
+      can_fallback_to_interactive: false
+    };
+  };
+
+  const cancelSyncJob = async () => {
+    if (!syncJob) {
+      return;
+    }
+    try {
+      const response = await axios.post(`${API_BASE}/search/sync/jobs/${syncJob.id}/cancel`);
+      setSyncJob(response.data);
+      message.info('同期の中止を要求しました');
+    } catch (error) {
+      console.error('同期中止エラー:', error);
+      message.error('同期の中止に失敗しました');
+    }
+  };
+
   const executeSync = async (payload) => {
     setIsSyncing(true);
     try {
-      const response = await axios.post(`${API_BASE}/search/sync`, payload);
+      const started = await axios.post(`${API_BASE}/search/sync/jobs`, payload);
+      if (!started.data.created) {
+        message.info('同じアカウントの同期が実行中のため、その進捗を表示します');
+      }
+      setSyncJob(started.data);
+      const result = await waitForSyncJob(started.data);
 
-      if (response.data.success) {
-        message.success(`同期完了: 新規${response.data.added}件、既存${response.data.existing}件`);
+      if (result.success) {
+        message.success(`同期完了: 新規${result.added}件、既存${result.existing}件`);
         setIsSyncModalVisible(false);
         syncForm.resetFields();
         loadMovies();
         loadRecords();
-      } else if (response.data.cancelled) {
-        message.warning(response.data.message || 'ログインブラウザが閉じられたため、同期をキャンセルしました');
-      } else if (response.data.can_fallback_to_interactive) {
+      } else if (result.cancelled) {
+        message.warning(result.message || 'ログインブラウザが閉じられたため、同期をキャンセルしました');
+      } else if (result.can_fallback_to_interactive) {
         Modal.confirm({
           title: '保存済み資格情報でのログインに失敗しました',
           content: '対話ログインに切り替えて同期を続行しますか？',
@@ -424,18 +476,20 @@ function App() {
               email: null,
               password: null,
               save_credentials: false,
-              use_saved_credentials: false
+              use_saved_credentials: false,
+              incremental: Boolean(payload.incremental)
             });
           }
         });
       } else {
-        message.error(response.data.message);
+        message.error(result.message);
       }
     } catch (error) {
       console.error('同期エラー:', error);
       message.error('同期に失敗しました。ブラウザの操作確認をしてください。');
     } finally {
       setIsSyncing(false);
+      setSyncJob(null);
     }
   };
 
@@ -445,6 +499,7 @@ function App() {
     const password = values.password || null;
     const saveCredentials = Boolean(values.save_credentials);
     const useSavedCredentials = values.use_saved_credentials !== false;
+    const incremental = Boolean(values.incremental);
 
     if ((email && !password) || (!email && password)) {
       message.warning('メールアドレスとパスワードは両方入力してください');
@@ -459,7 +514,8 @@ function App() {
       email,
       password,
       save_credentials: saveCredentials,
-      use_saved_credentials: useSavedCredentials
+      use_saved_credentials: useSavedCredentials,
+      incremental
     });
   };
 
@@ -853,21 +909,31 @@ function App() {
         title="映画.comから同期"
         open={isSyncModalVisible}
         onCancel={() => {
+          if (isSyncing) {
+            cancelSyncJob();
+            return;
+          }
           setIsSyncModalVisible(false);
           syncForm.resetFields();
         }}
         okText="同期開始"
-        cancelText="キャンセル"
+        cancelText={isSyncing ? '同期を中止' : 'キャンセル'}
         onOk={handleSync}
         confirmLoading={isSyncing}
       >
-        <Spin spinning={isSyncing} tip="ブラウザを起動中...ログインしてください">
+        <Spin
+          spinning={isSyncing}
+          tip={syncJob?.status === 'running' && syncJob.page > 0
+            ? `同期中... ${syncJob.page}ページ目 / 取得${syncJob.fetched}件 / 反映${syncJob.processed}件（新規${syncJob.added}件）`
+            : 'ブラウザを起動中...ログインしてください'}
+        >
           <Form
             form={syncForm}
             layout="vertical"
             initialValues={{
               use_saved_credentials: true,
-              save_credentials: false
+              save_credentials: false,
+              incremental: false
             }}
           >
             <Form.Item name="use_saved_credentials" valuePropName="checked">
@@ -885,6 +951,10 @@ function App() {
             <Form.Item name="save_credentials" valuePropName="checked">
               <Checkbox>保存して次回自動ログイン</Checkbox>
             </Form.Item>
+
+            <Form.Item name="incremental" valuePropName="checked">
+              <Checkbox>差分同期（前回同期以降の新着のみ取得）</Checkbox>
+            </Form.Item>
           </Form>
 
           <div style={{ marginBottom: '12px' }}>
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+API の並列クライアント数に対するスループットを測るベンチマーク
+
+使い方:
+  python scripts/bench-api-concurrency.py [--movies 20000] [--records 100000] [--clients 1,2,4,8,16]
+                                          [--requests 400] [--db PATH] [--compare-async] [--sync-writer]
+
+一時 SQLite（既定: 一時ディレクトリ）へ movies/records を投入し、別プロセスで uvicorn を起動して
+  - GET /api/records/?limit=100        （キーセットページングの先頭ページ）
+  - GET /api/movies/search?q=...       （2文字語のため LIKE で movies を走査）
+  - POST /api/records/                 （4リクエストに1回）
+を並列リクエストし、クライアント数ごとの req/s と GET/POST の p50/p95 レイテンシを表示する。
+
+--compare-async を付けると、同じハンドラを async def で包んでイベントループ上で同期DB処理を行う
+（変更前の実装と同じ）構成も測定して並べる。
+--sync-writer を付けると、同期ジョブの代わりに別接続が書き込みロックを 200ms 保持しては解放する
+動作を並行させる（POST はロック待ちになる。GET が巻き込まれて止まるかを比較する）。
+
+CPU 処理（SQL 実行・シリアライズ）は GIL とコア数で頭打ちになるため、1コア環境では
+クライアント数を増やしても req/s は伸びない。差が出るのは待ち（ロック・I/O）を含む場合。
+"""
+import argparse
+import functools
+import os
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = PROJECT_ROOT / "backend"
+for path in (PROJECT_ROOT, BACKEND_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+PATHS = ["/api/records/?limit=100", "/api/movies/search?q=ie&limit=20", "/api/records/?limit=100"]
+METHODS = ["THEATER", "STREAMING", "TV", "DVD", "OTHER"]
+
+
+def seed(db_path: str, movies: int, records: int) -> None:
+    from app.db.engine import create_sqlite_engine
+    from app.db.movie_fts import ensure_movie_fts
+    from app.models.models import Base
+
+    engine = create_sqlite_engine(db_path)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO movies (id, title, director, synopsis) VALUES (?, ?, ?, ?)",
+            [(i, f"Movie {i}", f"Director {i % 500}", "あらすじ " * 20) for i in range(1, movies + 1)],
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO records (movie_id, viewed_date, viewing_method, rating) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    rng.randint(1, movies),
+                    (now - timedelta(days=rng.randint(0, 3650), seconds=i)).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                    rng.choice(METHODS),
+                    rng.choice([None, 3.0, 4.0, 5.0]),
+                )
+                for i in range(records)
+            ],
+        )
+        ensure_movie_fts(conn)
+    engine.dispose()
+
+
+def _as_blocking_async(endpoint):
+    """同期ハンドラを async def で包む（イベントループ上で実行される）。"""
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        return endpoint(*args, **kwargs)
+    return wrapper
+
+
+def build_app(db_path: str, blocking_async: bool):
+    from fastapi import APIRouter, FastAPI
+    from sqlalchemy.orm import sessionmaker
+
+    from app.api import movies, records
+    from app.db.database import get_db
+    from app.db.engine import create_sqlite_engine
+    from main import configure_threadpool
+
+    app = FastAPI()
+    for router, prefix in ((movies.router, "/api/movies"), (records.router, "/api/records")):
+        if blocking_async:
+            wrapped = APIRouter()
+            for route in router.routes:
+                wrapped.add_api_route(
+                    route.path, _as_blocking_async(route.endpoint), methods=list(route.methods),
+                    response_model=route.response_model, status_code=route.status_code,
+                )
+            router = wrapped
+        app.include_router(router, prefix=prefix)
+
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=create_sqlite_engine(db_path))
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.add_event_handler("startup", configure_threadpool)
+    return app
+
+
+def serve(db_path: str, port: int, blocking_async: bool) -> None:
+    import uvicorn
+
+    uvicorn.run(build_app(db_path, blocking_async), host="127.0.0.1", port=port, log_level="warning")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(base_url + PATHS[0], timeout=2.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("サーバーが起動しませんでした")
+
+
+def _percentiles(latencies):
+    if not latencies:
+        return 0.0, 0.0
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return statistics.median(latencies) * 1000, p95 * 1000
+
+
+def run_clients(base_url: str, clients: int, total: int):
+    import httpx
+
+    def worker(_client_index: int):
+        latencies = {"GET": [], "POST": [], "errors": 0}
+        rng = random.Random()
+        with httpx.Client(base_url=base_url, timeout=60.0) as client:
+            for i in range(max(1, total // clients)):
+                started = time.perf_counter()
+                kind = "POST" if i % 4 == 3 else "GET"
+                try:
+                    if kind == "POST":
+                        viewed = datetime(2000, 1, 1) + timedelta(microseconds=rng.randrange(10 ** 15))
+                        response = client.post("/api/records/", json={
+                            "movie_id": rng.randint(1, 1000), "viewed_date": viewed.isoformat(), "viewing_method": "other",
+                        })
+                    else:
+                        response = client.get(PATHS[i % len(PATHS)])
+                    failed = response.is_error
+                except httpx.TransportError:
+                    failed = True
+                latencies[kind].append(time.perf_counter() - started)
+                # ロック待ちが busy_timeout を超えた 500 や接続断は数えて続行する
+                if failed:
+                    latencies["errors"] += 1
+        return latencies
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(worker, range(clients)))
+    elapsed = time.perf_counter() - started
+    gets = [value for result in results for value in result["GET"]]
+    posts = [value for result in results for value in result["POST"]]
+    errors = sum(result["errors"] for result in results)
+    return ((len(gets) + len(posts)) / elapsed, *_percentiles(gets), *_percentiles(posts), errors)
+
+
+def _hold_write_lock(db_path: str, stop: threading.Event) -> None:
+    """同期ジョブの書き込みトランザクションの代わりに、書き込みロックを断続的に保持する。"""
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    try:
+        while not stop.is_set():
+            conn.execute("BEGIN IMMEDIATE")
+            stop.wait(0.2)
+            conn.execute("COMMIT")
+            stop.wait(0.05)
+    finally:
+        conn.close()
+
+
+def measure(db_path: str, client_counts, total: int, blocking_async: bool, sync_writer: bool, env) -> dict:
+    port = _free_port()
+    args = [sys.executable, __file__, "--serve", str(port), "--db", db_path]
+    if blocking_async:
+        args.append("--blocking-async")
+    server = subprocess.Popen(args, env=env)
+    stop = threading.Event()
+    writer = threading.Thread(target=_hold_write_lock, args=(db_path, stop), daemon=True)
+    results = {}
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        _wait_until_ready(base_url)
+        run_clients(base_url, 2, 20)  # ウォームアップ
+        if sync_writer:
+            writer.start()
+        for clients in client_counts:
+            results[clients] = run_clients(base_url, clients, total)
+    finally:
+        stop.set()
+        if writer.is_alive():
+            writer.join()
+        server.terminate()
+        server.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 並列スループットのベンチマーク")
+    parser.add_argument("--movies", type=int, default=20000)
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--clients", default="1,2,4,8,16")
+    parser.add_argument("--requests", type=int, default=400, help="クライアント数ごとの総リクエスト数")
+    parser.add_argument("--db", help="投入先 SQLite ファイル（既存なら投入を省略）")
+    parser.add_argument("--compare-async", action="store_true", help="async def でブロックする構成も測定する")
+    parser.add_argument("--sync-writer", action="store_true", help="書き込みロックを断続的に保持する同期の代役を並行させる")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--blocking-async", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.db, args.serve, args.blocking_async)
+        return
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="bench-api-"), "bench.db")
+    if not os.path.exists(db_path):
+        started = time.perf_counter()
+        seed(db_path, args.movies, args.records)
+        print(f"seeded {args.movies} movies / {args.records} records in {time.perf_counter() - started:.1f}s ({db_path})")
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(PROJECT_ROOT), str(BACKEND_DIR), env.get("PYTHONPATH", "")])
+    client_counts = [int(value) for value in args.clients.split(",") if value.strip()]
+    modes = [("def (threadpool)", False)]
+    if args.compare_async:
+        modes.append(("async (blocking)", True))
+
+    for label, blocking_async in modes:
+        results = measure(db_path, client_counts, args.requests, blocking_async, args.sync_writer, env)
+        print(f"\n[{label}{' + sync writer' if args.sync_writer else ''}]")
+        print(f"{'clients':>7s} {'req/s':>8s} {'GET p50':>9s} {'GET p95':>9s} {'POST p50':>9s} {'POST p95':>9s} {'errors':>7s}")
+        for clients, (rps, get_p50, get_p95, post_p50, post_p95, errors) in results.items():
+            print(f"{clients:7d} {rps:8.1f} {get_p50:9.2f} {get_p95:9.2f} {post_p50:9.2f} {post_p95:9.2f} {errors:7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+HTMLパーサーバックエンド（html.parser / lxml）の抽出速度を比較するベンチマーク
+
+使い方:
+  python scripts/bench-html-parser.py [--repeat 50]
+
+backend/tests/fixtures/eiga/ のページを各バックエンドで解析し、
+抽出結果が一致することを確認したうえで 1 ページあたりの処理時間を表示する。
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from agent.scrapers.detail_client import EigaDetailClient
+from agent.scrapers.eiga_scraper import MovieComScraper
+from agent.scrapers.html_parser import PARSER_BACKENDS, is_backend_available, parse_html
+from agent.scrapers.search_client import EigaSearchClient
+
+FIXTURES = PROJECT_ROOT / "backend" / "tests" / "fixtures" / "eiga"
+
+
+def extract_list(markup, backend):
+    soup = parse_html(markup, backend=backend)
+    movies = []
+    for div in soup.find_all("div", class_="list-my-data"):
+        data = MovieComScraper._parse_movie_div(div)
+        if data:
+            data.pop("viewed_date", None)  # 解析時刻なので比較対象外
+            movies.append(data)
+    return movies
+
+
+def extract_details(markup, backend):
+    return EigaDetailClient.parse_movie_details_page(markup, "https://eiga.com/movie/90001/", backend=backend)
+
+
+def extract_search(markup, backend):
+    return EigaSearchClient.parse_search_results(markup, 30, backend=backend)
+
+
+PAGES = [
+    ("watched_list.html", extract_list),
+    ("movie_detail.html", extract_details),
+    ("search.html", extract_search),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="1ページあたりの計測回数")
+    args = parser.parse_args()
+
+    backends = [b for b in PARSER_BACKENDS if is_backend_available(b)]
+    print(f"backends: {', '.join(backends)}")
+
+    for name, extract in PAGES:
+        markup = (FIXTURES / name).read_bytes()
+        outputs = {}
+        timings = {}
+        for backend in backends:
+            # 抽出処理の [DEBUG] 出力は計測対象外にする
+            with contextlib.redirect_stdout(io.StringIO()):
+                outputs[backend] = extract(markup, backend)
+                started = time.perf_counter()
+                for _ in range(args.repeat):
+                    extract(markup, backend)
+                timings[backend] = (time.perf_counter() - started) / args.repeat
+
+        baseline = outputs["html.parser"]
+        for backend, output in outputs.items():
+            if output != baseline:
+                print(f"[WARN] {name}: {backend} の抽出結果が html.parser と一致しません")
+
+        base_ms = timings["html.parser"] * 1000
+        summary = ", ".join(
+            f"{backend}={timings[backend] * 1000:.2f}ms (x{base_ms / (timings[backend] * 1000):.1f})"
+            for backend in backends
+        )
+        print(f"{name} ({len(markup) // 1024}KB): {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+統計概要（/api/statistics/overview）の集計方式を比較するベンチマーク
+
+使い方:
+  python scripts/bench-statistics.py [--records 1000000] [--movies 5000] [--repeat 5] [--db PATH]
+
+一時 SQLite（既定: 一時ディレクトリ）へ records/movies を投入し、
+  - legacy: 従来の個別クエリ（COUNT/AVG/90日COUNT/評価帯COUNT×5/GROUP BY×3）
+  - scan:   条件付き集計による統合クエリ（_compute_overview_scan）
+  - summary: 統計サマリー表からの読み出し（read_statistics_summary）
+の結果が一致することを確認したうえで、1回あたりの処理時間を表示する（いずれも直近記録一覧の取得を含む）。
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = PROJECT_ROOT / "backend"
+for path in (PROJECT_ROOT, BACKEND_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app.api.statistics import _compute_overview_scan, _recent_records
+from app.db.statistics_summary import read_statistics_summary, rebuild_statistics, recent_since
+from app.models.models import Base, Movie, Record
+
+GENRES = ["ドラマ", "アニメ", "SF", "アクション", "コメディ", "ホラー", "ドキュメンタリー", "恋愛"]
+MOODS = ["HAPPY", "SAD", "EXCITED", "RELAXED", "THOUGHTFUL", "SCARY", "ROMANTIC", None]
+METHODS = ["THEATER", "STREAMING", "TV", "DVD", "OTHER"]
+
+
+def seed(engine, records: int, movies: int) -> None:
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO movies (id, title, genre) VALUES (?, ?, ?)",
+            [(i, f"Movie {i}", rng.choice(GENRES + [None])) for i in range(1, movies + 1)],
+        )
+        batch = []
+        for i in range(1, records + 1):
+            rating = rng.choice([None, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0])
+            viewed = now - timedelta(days=rng.randint(0, 3650), seconds=rng.randint(0, 86399))
+            batch.append((i, rng.randint(1, movies), viewed.strftime("%Y-%m-%d %H:%M:%S.%f"),
+                          rng.choice(METHODS), rating, rng.choice(MOODS)))
+            if len(batch) >= 50000:
+                _insert_records(conn, batch)
+                batch = []
+        if batch:
+            _insert_records(conn, batch)
+
+
+def _insert_records(conn, rows) -> None:
+    conn.exec_driver_sql(
+        "INSERT INTO records (id, movie_id, viewed_date, viewing_method, rating, mood) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def legacy_overview(db):
+    """統合前の集計（クエリを個別に発行する）。比較用。"""
+    total_movies = db.query(func.count(Movie.id)).scalar() or 0
+    total_records = db.query(func.count(Record.id)).scalar() or 0
+    avg_rating = db.query(func.avg(Record.rating)).scalar() or 0.0
+    recent_90_days = db.query(func.count(Record.id)).filter(Record.viewed_date >= recent_since()).scalar() or 0
+
+    genre_stats = []
+    top_genre, top_genre_count = None, -1
+    rows = (
+        db.query(Movie.genre, func.count(Record.id), func.avg(Record.rating))
+        .join(Record, Movie.id == Record.movie_id)
+        .filter(Movie.genre.isnot(None))
+        .group_by(Movie.genre)
+        .all()
+    )
+    for genre, count, genre_avg in rows:
+        if not genre or count <= 0:
+            continue
+        genre_stats.append({"name": genre, "value": count, "average_rating": float(genre_avg) if genre_avg else 0.0})
+        if count > top_genre_count:
+            top_genre, top_genre_count = genre, count
+
+    mood_stats = [
+        {"name": mood.value, "value": count}
+        for mood, count in db.query(Record.mood, func.count(Record.id)).filter(Record.mood.isnot(None)).group_by(Record.mood)
+        if mood
+    ]
+    viewing_method_stats = [
+        {"name": method.value, "value": count}
+        for method, count in db.query(Record.viewing_method, func.count(Record.id)).group_by(Record.viewing_method)
+        if method
+    ]
+    rating_distribution = []
+    for i in range(5):
+        count = db.query(func.count(Record.id)).filter(Record.rating >= i + 1, Record.rating < i + 2).scalar() or 0
+        rating_distribution.append({"range": f"{i + 1}-{i + 2}", "count": count})
+
+    return {
+        "total_movies": total_movies,
+        "total_records": total_records,
+        "recent_90_days": recent_90_days,
+        "top_genre": top_genre,
+        "average_rating": float(avg_rating),
+        "genre_stats": genre_stats,
+        "mood_stats": mood_stats,
+        "viewing_method_stats": viewing_method_stats,
+        "rating_distribution": rating_distribution,
+        "recent_records": _recent_records(db),
+    }
+
+
+def measure(label, func_, repeat):
+    elapsed = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func_()
+        elapsed.append(time.perf_counter() - started)
+    best = min(elapsed) * 1000
+    avg = sum(elapsed) / len(elapsed) * 1000
+    print(f"{label:8s}: best {best:9.2f} ms / avg {avg:9.2f} ms")
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="統計概要の集計方式ベンチマーク")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--movies", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", help="投入先 SQLite ファイル（既存なら投入を省略）")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="bench-statistics-"), "bench.db")
+    fresh = not os.path.exists(db_path)
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        if fresh:
+            started = time.perf_counter()
+            seed(engine, args.records, args.movies)
+            rebuild_statistics(db)
+            db.commit()
+            print(f"seeded {args.records} records / {args.movies} movies in {time.perf_counter() - started:.1f}s ({db_path})")
+
+        def with_recent(result):
+            result["recent_records"] = _recent_records(db)
+            return result
+
+        legacy, legacy_ms = measure("legacy", lambda: legacy_overview(db), args.repeat)
+        scanned, scan_ms = measure("scan", lambda: _compute_overview_scan(db), args.repeat)
+        summary, summary_ms = measure("summary", lambda: with_recent(read_statistics_summary(db)), args.repeat)
+
+        assert legacy == scanned, "legacy と scan の結果が一致しません"
+        assert summary == scanned, "summary と scan の結果が一致しません"
+        print(f"scan は legacy の {legacy_ms / scan_ms:.2f} 倍速、summary は {legacy_ms / max(summary_ms, 1e-6):.0f} 倍速")
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+統計サマリー（statistics_buckets）を records/movies から再構築する
+
+使い方:
+  python scripts/rebuild-statistics.py [--check]
+
+通常はアプリの書き込み時に差分更新されるため不要。DB を直接編集した場合や
+集計のずれが疑われる場合に実行する。--check は再構築せず、サマリーと直接集計の差分のみ表示する。
+"""
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = PROJECT_ROOT / "backend"
+for path in (PROJECT_ROOT, BACKEND_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from app.api.statistics import _compute_overview_scan
+from app.db.database import SessionLocal, create_tables
+from app.db.statistics_summary import read_statistics_summary, rebuild_statistics
+
+
+def _diff(summary, scanned):
+    return {
+        key: (summary[key], scanned[key])
+        for key in summary
+        if summary[key] != scanned.get(key)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="再構築せず差分のみ表示する")
+    args = parser.parse_args()
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        if args.check:
+            diff = _diff(read_statistics_summary(db), _compute_overview_scan(db))
+            if not diff:
+                print("statistics summary: OK")
+                return 0
+            for key, (summary_value, scanned_value) in diff.items():
+                print(f"{key}: summary={summary_value} scan={scanned_value}")
+            return 1
+
+        rows = rebuild_statistics(db)
+        db.commit()
+        print(f"statistics summary rebuilt: {rows} rows")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())